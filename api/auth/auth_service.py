@@ -3,7 +3,7 @@
 from fastapi import HTTPException
 from google.oauth2 import id_token
 from google.auth.transport import requests
-import requests as req_lib
+from helpers.http_client import get_http_client
 from logger.logging_config import logger
 
 
@@ -28,7 +28,7 @@ class SecurityService:
             "redirect_uri": redirect_uri,
             "grant_type": "authorization_code",
         }
-        response = req_lib.post(token_url, data=payload)
+        response = get_http_client("google_oauth").post(token_url, data=payload)
         if response.status_code != 200:
             logger.error(f"Token exchange failed: {response.text}")
             raise HTTPException(
@@ -47,7 +47,7 @@ class SecurityService:
         try:
             idinfo = id_token.verify_oauth2_token(
                 id_token_str,
-                requests.Request(),
+                requests.Request(session=get_http_client("google_oauth").session),
                 audience=client_id,
                 clock_skew_in_seconds=10,
             )
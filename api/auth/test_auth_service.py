@@ -1,4 +1,5 @@
 import pytest
+from types import SimpleNamespace
 from fastapi import HTTPException
 
 import api.auth.auth_service as auth_service
@@ -25,7 +26,9 @@ def test_exchange_code_for_tokens_success(monkeypatch):
             status_code=200, json_payload={"access_token": "a", "id_token": "i"}
         )
 
-    monkeypatch.setattr(auth_service.req_lib, "post", fake_post)
+    monkeypatch.setattr(
+        auth_service, "get_http_client", lambda name: SimpleNamespace(post=fake_post)
+    )
 
     result = auth_service.SecurityService.exchange_code_for_tokens(
         code="the-code",
@@ -45,7 +48,9 @@ def test_exchange_code_for_tokens_failure(monkeypatch):
     def fake_post(url, data):
         return DummyResponse(status_code=400, text="bad request")
 
-    monkeypatch.setattr(auth_service.req_lib, "post", fake_post)
+    monkeypatch.setattr(
+        auth_service, "get_http_client", lambda name: SimpleNamespace(post=fake_post)
+    )
 
     with pytest.raises(HTTPException) as excinfo:
         auth_service.SecurityService.exchange_code_for_tokens("x", "cid", "cs", "r")
@@ -0,0 +1,104 @@
+"""Visibility heartbeat for in-flight SQS messages."""
+
+import threading
+
+from aws_handler.sqs import AwsHelper
+from logger.logging_config import logger
+
+
+class VisibilityHeartbeat:
+    """
+    Keeps in-flight messages invisible while they are being processed.
+
+    A background thread extends the visibility timeout of every tracked message
+    at a fraction of that timeout, so a batch taking longer than the timeout is
+    not redelivered and processed twice. Messages that can no longer be extended
+    (deleted or already expired) are dropped from the heartbeat.
+    """
+
+    def __init__(
+        self,
+        aws_helper: AwsHelper,
+        visibility_timeout: int = 30,
+        interval: float | None = None,
+    ):
+        """
+        Initialize a Visibility Heartbeat.
+
+        :param aws_helper: Helper of the queue the messages were received from.
+        :param visibility_timeout: Visibility timeout set on every beat, in seconds.
+        :param interval: Seconds between two beats, default a third of the timeout.
+        """
+        if visibility_timeout < 1:
+            raise ValueError("visibility_timeout must be greater than zero.")
+
+        self._aws_helper = aws_helper
+        self._visibility_timeout = visibility_timeout
+        self._interval = interval or visibility_timeout / 3
+
+        self._messages: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Starts beating in a background thread."""
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sqs-visibility-heartbeat", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops beating, tracked messages become visible once their timeout expires."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def track(self, messages: list[dict]) -> None:
+        """
+        Adds polled messages to the heartbeat.
+
+        :param messages: Messages as returned by receive_message.
+        """
+        with self._lock:
+            for message in messages:
+                if message.get("ReceiptHandle"):
+                    self._messages[message["ReceiptHandle"]] = message
+
+    def release(self, messages: list[dict]) -> None:
+        """
+        Removes processed messages from the heartbeat.
+
+        :param messages: Messages as returned by receive_message.
+        """
+        with self._lock:
+            for message in messages:
+                self._messages.pop(message.get("ReceiptHandle"), None)
+
+    def beat(self) -> None:
+        """Extends the visibility timeout of every tracked message once."""
+        with self._lock:
+            messages = list(self._messages.values())
+
+        if not messages:
+            return
+
+        failed = self._aws_helper.change_visibility_batch(
+            messages, self._visibility_timeout
+        )
+        self.release(failed)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.beat()
+            except Exception as e:
+                logger.warning(
+                    "Failed to extend visibility of sqs messages.",
+                    extra={"error": str(e)},
+                )
@@ -0,0 +1,62 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from aws_handler.heartbeat import VisibilityHeartbeat
+
+
+def test_beat_extends_tracked_messages():
+    aws_helper = MagicMock()
+    aws_helper.change_visibility_batch.return_value = []
+    heartbeat = VisibilityHeartbeat(aws_helper, visibility_timeout=60)
+    messages = [{"ReceiptHandle": "rh-1"}, {"ReceiptHandle": "rh-2"}, {"Body": "x"}]
+
+    heartbeat.track(messages)
+    heartbeat.beat()
+
+    aws_helper.change_visibility_batch.assert_called_once_with(messages[:2], 60)
+
+
+def test_beat_skips_released_and_failed_messages():
+    aws_helper = MagicMock()
+    first, second, third = (
+        {"ReceiptHandle": "rh-1"},
+        {"ReceiptHandle": "rh-2"},
+        {"ReceiptHandle": "rh-3"},
+    )
+    aws_helper.change_visibility_batch.side_effect = [[second], []]
+    heartbeat = VisibilityHeartbeat(aws_helper)
+
+    heartbeat.track([first, second, third])
+    heartbeat.release([first])
+    heartbeat.beat()
+    heartbeat.beat()
+
+    assert aws_helper.change_visibility_batch.call_args.args[0] == [third]
+
+
+def test_beat_without_messages_does_not_call_sqs():
+    aws_helper = MagicMock()
+    VisibilityHeartbeat(aws_helper).beat()
+    aws_helper.change_visibility_batch.assert_not_called()
+
+
+def test_heartbeat_beats_in_background_until_stopped():
+    aws_helper = MagicMock()
+    aws_helper.change_visibility_batch.return_value = []
+    heartbeat = VisibilityHeartbeat(aws_helper, visibility_timeout=30, interval=0.01)
+    heartbeat.track([{"ReceiptHandle": "rh-1"}])
+
+    heartbeat.start()
+    time.sleep(0.1)
+    heartbeat.stop()
+    calls = aws_helper.change_visibility_batch.call_count
+    time.sleep(0.05)
+
+    assert calls > 0
+    assert aws_helper.change_visibility_batch.call_count == calls
+
+
+def test_heartbeat_rejects_invalid_timeout():
+    with pytest.raises(ValueError):
+        VisibilityHeartbeat(MagicMock(), visibility_timeout=0)
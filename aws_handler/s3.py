@@ -1,7 +1,12 @@
 """AWS S3 Handler Module"""
 
 import boto3
+import hashlib
+import uuid
 from datetime import datetime
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
 from exceptions.s3 import S3BucketServiceError
@@ -12,18 +17,35 @@ from helpers.image_helper import ImageHelper
 class S3Handler:
     """Handler for AWS S3 operations."""
 
+    PAYLOAD_PREFIX = "sqs-payloads"
+    SHARED_THUMBNAIL_PREFIX = "thumbnails/shared"
+    # thumbnails are uploaded concurrently by the caller, not by the transfer manager
+    THUMBNAIL_TRANSFER_CONFIG = TransferConfig(use_threads=False)
+
     def __init__(
-        self, bucket_name: str, cdn_url: str, region_name: str = "us-east-2"
+        self,
+        bucket_name: str,
+        cdn_url: str,
+        region_name: str = "us-east-2",
+        max_pool_connections: int = 10,
     ) -> None:
         """
         Initialize the S3 client and specify the bucket name.
 
+        The client is thread safe and shared by every upload, its connection pool
+        should be at least as large as the number of uploading threads.
+
         :param bucket_name: Name of the S3 bucket.
         :param cdn_url: CDN URL for accessing the bucket content.
         :param region_name: AWS region where the bucket is located.
+        :param max_pool_connections: Size of the client's connection pool.
         """
         try:
-            self.s3 = boto3.client("s3", region_name=region_name)
+            self.s3 = boto3.client(
+                "s3",
+                region_name=region_name,
+                config=Config(max_pool_connections=max_pool_connections),
+            )
         except Exception as e:
             raise S3BucketServiceError(f"Error initializing S3 client: {e}")
         self.bucket_name = bucket_name
@@ -37,32 +59,164 @@ class S3Handler:
         :param image_url: URL of the image to upload.
         :param article_id: ID of the article associated with the image.
         """
+        file_extension = ImageHelper.get_file_extension(image_url)
+        s3_key = f"thumbnails/{datetime.now().strftime('%Y/%m/%d')}/{article_id}{file_extension}"
+        metadata = {
+            "article_id": str(article_id),
+            "original_url": image_url,
+            "uploaded_at": datetime.now().isoformat(),
+        }
+        return self._stream_thumbnail(image_url, s3_key, metadata)
+
+    @classmethod
+    def get_shared_thumbnail_key(cls, image_url: str) -> str:
+        """
+        Get the key of a thumbnail shared by every article using the same image.
+
+        :param image_url: URL of the image.
+        """
+        digest = hashlib.blake2b(image_url.strip().encode(), digest_size=16).hexdigest()
+        file_extension = ImageHelper.get_file_extension(image_url)
+        return f"{cls.SHARED_THUMBNAIL_PREFIX}/{digest[:2]}/{digest}{file_extension}"
+
+    def upload_shared_thumbnail(self, image_url: str) -> str:
+        """
+        Upload a thumbnail keyed by its source url, unless it is already stored.
+
+        An image reused by several articles or feeds is downloaded and uploaded once,
+        every later call only checks the object exists.
+
+        :param image_url: URL of the image to upload.
+        :return: CDN url of the thumbnail.
+        """
+        s3_key = self.get_shared_thumbnail_key(image_url)
+        if self._object_exists(s3_key):
+            return f"https://{self.cdn_url}/{s3_key}"
+
+        metadata = {
+            "original_url": image_url,
+            "uploaded_at": datetime.now().isoformat(),
+        }
+        return self._stream_thumbnail(image_url, s3_key, metadata)
+
+    def _object_exists(self, s3_key: str) -> bool:
+        """
+        Checks whether an object is stored in the bucket.
+
+        :param s3_key: Key of the object.
+        """
         try:
-            response = ImageHelper.download_image(image_url)
+            self.s3.head_object(Bucket=self.bucket_name, Key=s3_key)
+            return True
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise S3BucketServiceError(f"Client error during S3 lookup: {e}")
+        except BotoCoreError as e:
+            raise S3BucketServiceError(f"Error looking up S3 object: {e}")
 
-            file_extension = ImageHelper.get_file_extension(image_url)
-            s3_key = f"thumbnails/{datetime.now().strftime('%Y/%m/%d')}/{article_id}{file_extension}"
-            metadata = {
-                "article_id": str(article_id),
-                "original_url": image_url,
-                "uploaded_at": datetime.now().isoformat(),
-            }
+    def _stream_thumbnail(self, image_url: str, s3_key: str, metadata: dict) -> str:
+        """
+        Streams an image to the bucket as it is downloaded.
 
-            self.s3.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=response.content,
-                ContentType=response.headers.get("Content-Type", "image/jpeg"),
-                CacheControl="max-age=31536000",
-                Metadata=metadata,
+        :param image_url: URL of the image to upload.
+        :param s3_key: Key of the uploaded object.
+        :param metadata: Metadata stored with the object.
+        :return: CDN url of the uploaded object.
+        """
+        response = None
+        try:
+            response = ImageHelper.download_image(image_url, stream=True)
+
+            # the body is streamed to s3 as it is downloaded, never buffered whole
+            response.raw.decode_content = True
+            self.s3.upload_fileobj(
+                response.raw,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={
+                    "ContentType": response.headers.get("Content-Type", "image/jpeg"),
+                    "CacheControl": "max-age=31536000",
+                    "Metadata": metadata,
+                },
+                Config=self.THUMBNAIL_TRANSFER_CONFIG,
             )
 
             # Location in bucket
             return f"https://{self.cdn_url}/{s3_key}"
 
-        except BotoCoreError as e:
+        except (BotoCoreError, S3UploadFailedError) as e:
             raise S3BucketServiceError(f"Error uploading to S3: {e}")
         except ClientError as e:
             raise S3BucketServiceError(f"Client error during S3 upload: {e}")
         except (Exception, ImageDownloadError):
             raise
+        finally:
+            if response is not None:
+                response.close()
+
+    def put_payload(self, body: str) -> str:
+        """
+        Stores a message body too large for sqs, claim-check style.
+
+        The worker deletes a payload once its message is acknowledged. Payloads are
+        kept under their own prefix, so the ones whose message is never sent or
+        acknowledged can be found and expired.
+
+        :param body: Message body to store.
+        :return: Key of the stored payload.
+        """
+        s3_key = f"{self.PAYLOAD_PREFIX}/{datetime.now().strftime('%Y/%m/%d')}/{uuid.uuid4().hex}.json"
+        try:
+            self.s3.put_object(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Body=body.encode("utf-8"),
+                ContentType="application/json",
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise S3BucketServiceError(f"Error uploading payload to S3: {e}")
+
+        return s3_key
+
+    def get_payload(self, s3_key: str, bucket_name: str | None = None) -> str:
+        """
+        Reads a message body stored by put_payload.
+
+        :param s3_key: Key of the stored payload.
+        :param bucket_name: Bucket of the payload, default the handler's bucket.
+        """
+        try:
+            response = self.s3.get_object(
+                Bucket=bucket_name or self.bucket_name, Key=s3_key
+            )
+            return response["Body"].read().decode("utf-8")
+        except (BotoCoreError, ClientError) as e:
+            raise S3BucketServiceError(f"Error reading payload from S3: {e}")
+
+    def delete_payloads(
+        self, s3_keys: list[str], bucket_name: str | None = None
+    ) -> list[str]:
+        """
+        Deletes message bodies stored by put_payload, once their messages are acknowledged.
+
+        :param s3_keys: Keys of the stored payloads.
+        :param bucket_name: Bucket of the payloads, default the handler's bucket.
+        :return: Keys that could not be deleted.
+        """
+        failed = []
+        # delete_objects accepts at most 1000 keys per request
+        for start in range(0, len(s3_keys), 1000):
+            chunk = s3_keys[start : start + 1000]
+            try:
+                response = self.s3.delete_objects(
+                    Bucket=bucket_name or self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True},
+                )
+            except (BotoCoreError, ClientError) as e:
+                raise S3BucketServiceError(f"Error deleting payloads from S3: {e}")
+
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+
+        return failed
@@ -0,0 +1,79 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+
+from aws_handler.s3 import S3Handler
+from exceptions.s3 import S3BucketServiceError
+
+
+@pytest.fixture
+def s3_handler():
+    with patch("aws_handler.s3.boto3.client") as client:
+        handler = S3Handler("bucket", "cdn.example.com")
+    handler.s3 = client.return_value
+    return handler
+
+
+def client_error(code):
+    return ClientError({"Error": {"Code": code}}, "HeadObject")
+
+
+def test_shared_thumbnail_key_depends_on_source_url_only():
+    key = S3Handler.get_shared_thumbnail_key("http://img/a.jpg")
+
+    assert key.startswith("thumbnails/shared/")
+    assert key.endswith(".jpg")
+    assert key == S3Handler.get_shared_thumbnail_key(" http://img/a.jpg ")
+    assert key != S3Handler.get_shared_thumbnail_key("http://img/b.jpg")
+
+
+def test_stored_shared_thumbnail_is_not_downloaded(s3_handler):
+    with patch("aws_handler.s3.ImageHelper.download_image") as download_image:
+        cdn_url = s3_handler.upload_shared_thumbnail("http://img/a.jpg")
+
+    key = S3Handler.get_shared_thumbnail_key("http://img/a.jpg")
+    assert cdn_url == f"https://cdn.example.com/{key}"
+    s3_handler.s3.head_object.assert_called_once_with(Bucket="bucket", Key=key)
+    download_image.assert_not_called()
+    s3_handler.s3.upload_fileobj.assert_not_called()
+
+
+def test_missing_shared_thumbnail_is_uploaded(s3_handler):
+    s3_handler.s3.head_object.side_effect = client_error("404")
+    response = MagicMock(headers={"Content-Type": "image/png"})
+
+    with patch(
+        "aws_handler.s3.ImageHelper.download_image", return_value=response
+    ) as download_image:
+        cdn_url = s3_handler.upload_shared_thumbnail("http://img/a.jpg")
+
+    key = S3Handler.get_shared_thumbnail_key("http://img/a.jpg")
+    assert cdn_url == f"https://cdn.example.com/{key}"
+    download_image.assert_called_once_with("http://img/a.jpg", stream=True)
+    assert s3_handler.s3.upload_fileobj.call_args.args[:3] == (
+        response.raw,
+        "bucket",
+        key,
+    )
+    response.close.assert_called_once()
+
+
+def test_shared_thumbnail_lookup_errors_are_raised(s3_handler):
+    s3_handler.s3.head_object.side_effect = client_error("403")
+
+    with pytest.raises(S3BucketServiceError):
+        s3_handler.upload_shared_thumbnail("http://img/a.jpg")
+
+
+def test_delete_payloads_returns_the_keys_s3_refused(s3_handler):
+    s3_handler.s3.delete_objects.return_value = {
+        "Errors": [{"Key": "k2", "Code": "AccessDenied"}]
+    }
+
+    failed = s3_handler.delete_payloads(["k1", "k2"], "payloads")
+
+    assert failed == ["k2"]
+    s3_handler.s3.delete_objects.assert_called_once_with(
+        Bucket="payloads",
+        Delete={"Objects": [{"Key": "k1"}, {"Key": "k2"}], "Quiet": True},
+    )
@@ -1,7 +1,12 @@
 import boto3
 import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 from exceptions.sqs import NoSQSFoundException, SQSMessageBatchNotSent
+from aws_handler.s3 import S3Handler
 
 from logger.logging_config import logger
 
@@ -11,11 +16,16 @@ from logger.logging_config import logger
 class AwsHelper:
     """Publisher/helper class for SQS work and fallback handling."""
 
+    # sqs limit of a single message and of a whole batch
+    MAX_PAYLOAD_BYTES = 256 * 1024
+
     def __init__(
         self,
         queue_url: str,
         region_name: str = "us-east-2",
         fallback_queue_url: str = None,
+        max_in_flight: int = 1,
+        payload_store: S3Handler | None = None,
     ):
         """
         Initialize an SQS client.
@@ -23,11 +33,17 @@ class AwsHelper:
         :param queue_url: The full URL of the main SQS queue
         :param region_name: AWS region where the queue resides
         :param fallback_queue_url: The full URL of the fallback SQS queue (optional)
+        :param max_in_flight: Maximum number of batches send_batch sends concurrently, default 1.
+        :param payload_store: S3 handler storing messages larger than the sqs limit (optional).
         """
         if not queue_url:
             raise ValueError("queue_url is required")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be greater than zero.")
         self.queue_url = queue_url
         self.fallback_queue_url = fallback_queue_url
+        self._max_in_flight = max_in_flight
+        self._payload_store = payload_store
 
         try:
             self._SQS = self._get_service()
@@ -104,8 +120,18 @@ class AwsHelper:
         queue_url: str | None = None,
     ):
         """
-        Send messages in batches of 10\
-           
+        Send messages in batches of at most 10 messages and 256 KB.
+
+        Up to max_in_flight batches are sent concurrently, except for a message group
+        whose batches are sent in order. Sending stops at the first batch that still
+        fails after its retries: no later batch is started, batches already in flight
+        complete, and SQSMessageBatchNotSent is raised.
+
+        Messages larger than the sqs limit are stored in S3 and replaced by a pointer
+        when a payload store is configured, otherwise they are skipped and
+        SQSMessageBatchNotSent is raised once the other messages are sent. The stored
+        bodies of messages that could not be sent are deleted from S3.
+
         :param headline: list containing all headlines
         :param message_group_id: Parameter required for FIFO queues, default None.
         :param transform_function: Function to transform payload into message format.
@@ -122,49 +148,237 @@ class AwsHelper:
             def transform_function(item):
                 return str(item)
 
-        batch = []
+        entries = []
+        offloaded = {}
+        oversized = 0
         for i, message in enumerate(messages):
             item = {"Id": str(i), "MessageBody": transform_function(message)}
 
             if message_group_id:
                 item["MessageGroupId"] = message_group_id
 
-            batch.append(item)
+            if self._get_entry_size(item) > self.MAX_PAYLOAD_BYTES:
+                item = self._offload_entry(item)
+                if item is None:
+                    oversized += 1
+                    continue
+                offloaded[item["Id"]] = json.loads(item["MessageBody"])["s3_payload"]
+
+            entries.append(item)
+
+        batches = self._pack_batches(entries, max_batch_size)
+
+        # messages of a group must reach a fifo queue in order, one batch at a time
+        workers = 1 if message_group_id else min(self._max_in_flight, len(batches))
+        if workers <= 1:
+            unsent = self._send_batches_sequentially(queue_url, batches)
+        else:
+            unsent = self._send_batches_concurrently(queue_url, batches, workers)
+
+        if unsent:
+            logger.error(f"{len(unsent)} messages could not be sent.")
+            self._delete_offloaded(
+                [offloaded[entry["Id"]] for entry in unsent if entry["Id"] in offloaded]
+            )
+            raise SQSMessageBatchNotSent
+
+        if oversized:
+            logger.error(f"{oversized} messages exceed the sqs size limit, not sent.")
+            raise SQSMessageBatchNotSent
 
-            if len(batch) == max_batch_size:
-                try:
-                    self._send_batch_internal(queue_url, batch, i // max_batch_size)
-                except SQSMessageBatchNotSent:
-                    raise
+    def _send_batches_sequentially(
+        self, queue_url: str, batches: list[list]
+    ) -> list[dict]:
+        """
+        Sends batches one after the other, stopping at the first batch that fails.
+
+        :param queue_url: URL of the target queue.
+        :param batches: Batches to send.
+        :return: Entries not sent, those of the failed batch and of every later batch.
+        """
+        for number, batch in enumerate(batches):
+            unsent = self._send_batch_internal(queue_url, batch, number)
+            if unsent:
+                return unsent + [
+                    entry for later in batches[number + 1 :] for entry in later
+                ]
+
+        return []
+
+    def _send_batches_concurrently(
+        self, queue_url: str, batches: list[list], workers: int
+    ) -> list[dict]:
+        """
+        Sends batches on a pool of threads, no batch is started once one has failed.
+
+        Batches already in flight when a batch fails are still completed.
+
+        :param queue_url: URL of the target queue.
+        :param batches: Batches to send.
+        :param workers: Maximum number of batches in flight.
+        :return: Entries not sent, those of the failed batches and of the skipped ones.
+        """
+        failed = threading.Event()
+
+        def send(batch: list, number: int) -> list[dict]:
+            if failed.is_set():
+                return batch
+
+            unsent = self._send_batch_internal(queue_url, batch, number)
+            if unsent:
+                failed.set()
+            return unsent
+
+        # boto3 clients are thread safe, batches share the client's connection pool
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sqs"
+        ) as executor:
+            futures = [
+                executor.submit(send, batch, number)
+                for number, batch in enumerate(batches)
+            ]
+
+        return [entry for future in futures for entry in future.result()]
+
+    @staticmethod
+    def _get_entry_size(entry: dict) -> int:
+        """
+        Get the size sqs counts for an entry.
+
+        :param entry: Batch entry.
+        """
+        return len(entry["MessageBody"].encode("utf-8"))
+
+    def _pack_batches(self, entries: list[dict], max_batch_size: int) -> list[list]:
+        """
+        Groups entries in order into batches capped by count and total size.
+
+        :param entries: Entries, each within the size limit.
+        :param max_batch_size: Maximum number of entries per batch.
+        """
+        batches = []
+        batch = []
+        batch_bytes = 0
+        for entry in entries:
+            size = self._get_entry_size(entry)
+            if batch and (
+                len(batch) == max_batch_size
+                or batch_bytes + size > self.MAX_PAYLOAD_BYTES
+            ):
+                batches.append(batch)
                 batch = []
+                batch_bytes = 0
+
+            batch.append(entry)
+            batch_bytes += size
 
         if batch:
+            batches.append(batch)
+
+        return batches
+
+    def _offload_entry(self, entry: dict) -> dict | None:
+        """
+        Stores the body of an oversized entry in S3 and points the entry to it.
+
+        :param entry: Batch entry larger than the sqs limit.
+        :return: Entry carrying the pointer, None if the body could not be stored.
+        """
+        if not self._payload_store:
+            logger.error(f"Message {entry['Id']} exceeds the sqs size limit.")
+            return None
+
+        try:
+            s3_key = self._payload_store.put_payload(entry["MessageBody"])
+        except Exception as e:
+            logger.exception(f"Failed to offload message {entry['Id']}: {e}")
+            return None
+
+        pointer = {
+            "s3_payload": {"bucket": self._payload_store.bucket_name, "key": s3_key}
+        }
+        return {**entry, "MessageBody": json.dumps(pointer)}
+
+    def _delete_offloaded(self, pointers: list[dict]) -> None:
+        """
+        Deletes the stored bodies of offloaded entries that were not sent.
+
+        :param pointers: S3 pointers of the entries, with their bucket and key.
+        """
+        if not pointers:
+            return
+
+        keys_by_bucket = {}
+        for pointer in pointers:
+            keys_by_bucket.setdefault(pointer["bucket"], []).append(pointer["key"])
+
+        for bucket, keys in keys_by_bucket.items():
             try:
-                self._send_batch_internal(
-                    queue_url, batch, len(messages) // max_batch_size
+                failed = self._payload_store.delete_payloads(keys, bucket)
+            except Exception as e:
+                logger.exception(f"Failed to delete {len(keys)} unsent payloads: {e}")
+                continue
+
+            if failed:
+                logger.error(
+                    f"{len(failed)} unsent payloads could not be deleted.",
+                    extra={"keys": failed},
                 )
-            except SQSMessageBatchNotSent:
-                raise
 
     def _send_batch_internal(
-        self, queue_url: str, batch: list, batch_number: int, max_retries: int = 5
+        self,
+        queue_url: str,
+        batch: list,
+        batch_number: int,
+        max_retries: int = 5,
+        backoff_seconds: float = 0.1,
     ):
         """
         Internal helper to send entries to sqs.
 
+        Only the entries sqs reports as failed are resubmitted, after an exponential
+        backoff with full jitter so concurrent senders do not retry in lockstep.
+        Entries rejected because of their content are not retried.
+
         :param queue_url:  URL of the target queue.
         :param batch: The batch to be sent to the message queue.
         :param batch_number: The number identifying the batch within an operation with several batches.
         :param max_retries: Maximum number of retries when sending to SQS fails, default = 5.
+        :param backoff_seconds: Base of the exponential backoff between retries.
+        :return: Entries not sent after the retries, empty once the batch is sent.
         """
+        pending = batch
+        rejected = []
         for i in range(max_retries):
+            if i:
+                time.sleep(random.uniform(0, backoff_seconds * 2**i))
+
             try:
-                self._SQS.send_message_batch(QueueUrl=queue_url, Entries=batch)
-                break
+                resp = self._SQS.send_message_batch(QueueUrl=queue_url, Entries=pending)
             except Exception:
                 logger.error(f"Batch {batch_number} could not be sent.")
-        else:
-            raise SQSMessageBatchNotSent
+                continue
+
+            failed = {entry["Id"]: entry for entry in (resp or {}).get("Failed") or []}
+            if failed:
+                logger.warning(
+                    f"{len(failed)} entries of batch {batch_number} failed: "
+                    f"{list(failed.values())}"
+                )
+            rejected.extend(
+                e for e in pending if failed.get(e["Id"], {}).get("SenderFault")
+            )
+            pending = [
+                e
+                for e in pending
+                if e["Id"] in failed and not failed[e["Id"]].get("SenderFault")
+            ]
+            if not pending:
+                break
+
+        if pending or rejected:
+            logger.error(f"Batch {batch_number} could not be sent.")
+        return rejected + pending
 
     def poll_messages(
         self, max_messages: int = 10, wait_time: int = 10, visibility_timeout: int = 30
@@ -238,34 +452,127 @@ class AwsHelper:
         except (BotoCoreError, ClientError) as e:
             logger.exception(f"Error deleting SQS message: {e}")
 
-    def delete_messages_batch(self, messages: list, queue_url: str):
+    def delete_messages_batch(
+        self,
+        messages: list,
+        queue_url: str,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.2,
+    ) -> list[dict]:
         """
-        Delete a batch of messages from main SQS queue.
+        Delete a batch of messages from an SQS queue, in batches of 10.
+
+        Entries that fail on the SQS side, and batches whose call fails, are retried
+        with exponential backoff. Entries failing because of the request itself
+        (e.g. an expired receipt handle) are not retried.
 
         :param messages: List of messages as returned by receive_message
         :param queue_url: URL of the target queue.
+        :param max_retries: Maximum number of retries of the failed entries, default = 3.
+        :param backoff_seconds: Wait before the first retry, doubled on every retry.
+        :return: Messages that could not be deleted.
         """
         if not queue_url:
             raise ValueError("queue_url required")
 
         if not messages:
-            return
+            return []
+
+        failed = []
+        for start in range(0, len(messages), 10):
+            pending = messages[start : start + 10]
+            for attempt in range(max_retries + 1):
+                if attempt:
+                    time.sleep(backoff_seconds * 2 ** (attempt - 1))
+
+                pending, rejected = self._delete_messages_chunk(pending, queue_url)
+                failed.extend(rejected)
+                if not pending:
+                    break
+            else:
+                logger.error(f"Failed to delete {len(pending)} messages after retries.")
+                failed.extend(pending)
+
+        return failed
+
+    def _delete_messages_chunk(
+        self, messages: list, queue_url: str
+    ) -> tuple[list[dict], list[dict]]:
+        """
+        Deletes up to 10 messages in one call.
 
+        :param messages: List of messages as returned by receive_message
+        :param queue_url: URL of the target queue.
+        :return: Messages worth retrying and messages rejected for good.
+        """
         entries = [
             {
-                "Id": msg.get("Id") or msg.get("MessageId"),
+                "Id": msg.get("Id") or msg.get("MessageId") or str(i),
                 "ReceiptHandle": msg["ReceiptHandle"],
             }
-            for msg in messages
+            for i, msg in enumerate(messages)
         ]
+        by_id = {entry["Id"]: msg for entry, msg in zip(entries, messages)}
+
         try:
             resp = self._SQS.delete_message_batch(QueueUrl=queue_url, Entries=entries)
-            if "Failed" in resp and resp["Failed"]:
-                logger.warning("Failed to delete some messages: %s", resp["Failed"])
-            else:
-                logger.info("Deleted %d messages from SQS.", len(entries))
         except (BotoCoreError, ClientError) as e:
             logger.exception("Error in batch delete from SQS: %s", e)
+            return messages, []
+
+        retry, rejected = [], []
+        for entry in resp.get("Failed") or []:
+            if entry.get("SenderFault"):
+                rejected.append(by_id[entry["Id"]])
+            else:
+                retry.append(by_id[entry["Id"]])
+
+        if retry or rejected:
+            logger.warning("Failed to delete some messages: %s", resp["Failed"])
+        else:
+            logger.info("Deleted %d messages from SQS.", len(entries))
+
+        return retry, rejected
+
+    def change_visibility_batch(
+        self, messages: list, visibility_timeout: int, queue_url: str | None = None
+    ) -> list[dict]:
+        """
+        Extends the visibility timeout of in-flight messages, in batches of 10.
+
+        :param messages: List of messages as returned by receive_message
+        :param visibility_timeout: New visibility timeout in seconds, counted from now.
+        :param queue_url: URL of the queue the messages were received from, default main queue.
+        :return: Messages the queue refused to change, e.g. already deleted or expired.
+        """
+        queue_url = queue_url or self.queue_url
+        failed = []
+
+        for start in range(0, len(messages), 10):
+            chunk = messages[start : start + 10]
+            entries = [
+                {
+                    "Id": str(i),
+                    "ReceiptHandle": msg["ReceiptHandle"],
+                    "VisibilityTimeout": visibility_timeout,
+                }
+                for i, msg in enumerate(chunk)
+            ]
+            try:
+                resp = self._SQS.change_message_visibility_batch(
+                    QueueUrl=queue_url, Entries=entries
+                )
+            except (BotoCoreError, ClientError) as e:
+                logger.exception(f"Error changing visibility of SQS messages: {e}")
+                continue
+
+            for entry in resp.get("Failed", []):
+                logger.warning(
+                    f"Failed to change visibility of message: {entry.get('Message')}"
+                )
+                failed.append(chunk[int(entry["Id"])])
+
+        return failed
 
     def send_messages_to_fallback_queue(self, messages: list):
         """
@@ -1,3 +1,5 @@
+import threading
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -111,6 +113,168 @@ def test_send_batch_exception_prints_error(aws_helper, capsys, caplog):
     assert "Batch 0 could not be sent." in caplog.text
 
 
+def test_send_batch_resubmits_only_failed_entries(aws_helper):
+    aws = aws_helper
+    aws._SQS.send_message_batch.side_effect = [
+        {
+            "Failed": [
+                {"Id": "3", "SenderFault": False, "Code": "InternalError"},
+                {"Id": "7", "SenderFault": False, "Code": "InternalError"},
+            ]
+        },
+        {"Successful": [{"Id": "3"}, {"Id": "7"}]},
+    ]
+    with patch("aws_handler.sqs.time.sleep"):
+        aws.send_batch([f"headline {i}" for i in range(10)])
+
+    retried = aws._SQS.send_message_batch.call_args_list[1].kwargs["Entries"]
+    assert [entry["Id"] for entry in retried] == ["3", "7"]
+
+
+def test_send_batch_sender_fault_is_not_retried(aws_helper):
+    aws = aws_helper
+    aws._SQS.send_message_batch.return_value = {
+        "Failed": [{"Id": "0", "SenderFault": True, "Code": "InvalidMessageContents"}]
+    }
+    with pytest.raises(SQSMessageBatchNotSent):
+        aws.send_batch(["headline"])
+
+    assert aws._SQS.send_message_batch.call_count == 1
+
+
+def test_send_batch_sends_batches_concurrently(aws_helper):
+    aws = aws_helper
+    aws._max_in_flight = 3
+    aws._SQS.send_message_batch.return_value = {}
+
+    aws.send_batch([f"headline {i}" for i in range(25)])
+
+    sent = sorted(
+        int(entry["Id"])
+        for call in aws._SQS.send_message_batch.call_args_list
+        for entry in call.kwargs["Entries"]
+    )
+    assert sent == list(range(25))
+
+
+def test_send_batch_concurrent_failure_stops_starting_batches(aws_helper):
+    aws = aws_helper
+    aws._max_in_flight = 2
+
+    def send(QueueUrl, Entries):
+        if Entries[0]["Id"] == "0":
+            raise Exception("Batch error")
+        # the batch in flight completes after the first one failed
+        threading.Event().wait(0.3)
+        return {}
+
+    aws._SQS.send_message_batch.side_effect = send
+    with (
+        patch("aws_handler.sqs.time.sleep"),
+        pytest.raises(SQSMessageBatchNotSent),
+    ):
+        aws.send_batch([f"headline {i}" for i in range(40)])
+
+    first_ids = [
+        call.kwargs["Entries"][0]["Id"]
+        for call in aws._SQS.send_message_batch.call_args_list
+    ]
+    # batch 10 may have started before batch 0 failed, later ones never do
+    assert "0" in first_ids
+    assert set(first_ids) <= {"0", "10"}
+
+
+def test_send_batch_with_message_group_is_sent_in_order(aws_helper):
+    aws = aws_helper
+    aws._max_in_flight = 3
+    aws._SQS.send_message_batch.return_value = {}
+
+    with patch("aws_handler.sqs.ThreadPoolExecutor") as executor:
+        aws.send_batch([f"headline {i}" for i in range(25)], "headlines")
+
+    executor.assert_not_called()
+    first_ids = [
+        call.kwargs["Entries"][0]["Id"]
+        for call in aws._SQS.send_message_batch.call_args_list
+    ]
+    assert first_ids == ["0", "10", "20"]
+
+
+def test_send_batch_sequential_failure_stops_at_the_failed_batch(aws_helper):
+    aws = aws_helper
+    aws._SQS.send_message_batch.side_effect = Exception("Batch error")
+
+    with (
+        patch("aws_handler.sqs.time.sleep"),
+        pytest.raises(SQSMessageBatchNotSent),
+    ):
+        aws.send_batch([f"headline {i}" for i in range(25)])
+
+    assert aws._SQS.send_message_batch.call_count == 5
+
+
+def test_send_batch_caps_batches_by_size(aws_helper):
+    aws = aws_helper
+    aws._SQS.send_message_batch.return_value = {}
+    body = "x" * 100 * 1024
+
+    aws.send_batch([body] * 5)
+
+    sizes = [
+        len(call.kwargs["Entries"])
+        for call in aws._SQS.send_message_batch.call_args_list
+    ]
+    assert sizes == [2, 2, 1]
+
+
+def test_send_batch_offloads_oversized_message(aws_helper):
+    aws = aws_helper
+    aws._SQS.send_message_batch.return_value = {}
+    store = MagicMock()
+    store.bucket_name = "bucket"
+    store.put_payload.return_value = "sqs-payloads/key.json"
+    aws._payload_store = store
+    body = "x" * (AwsHelper.MAX_PAYLOAD_BYTES + 1)
+
+    aws.send_batch(["small", body])
+
+    store.put_payload.assert_called_once_with(body)
+    entries = aws._SQS.send_message_batch.call_args.kwargs["Entries"]
+    assert entries[0]["MessageBody"] == "small"
+    assert json.loads(entries[1]["MessageBody"]) == {
+        "s3_payload": {"bucket": "bucket", "key": "sqs-payloads/key.json"}
+    }
+
+
+def test_send_batch_deletes_payloads_of_unsent_messages(aws_helper):
+    aws = aws_helper
+    aws._SQS.send_message_batch.side_effect = Exception("unavailable")
+    store = MagicMock()
+    store.bucket_name = "bucket"
+    store.put_payload.return_value = "sqs-payloads/key.json"
+    store.delete_payloads.return_value = []
+    aws._payload_store = store
+
+    with (
+        patch("aws_handler.sqs.time.sleep"),
+        pytest.raises(SQSMessageBatchNotSent),
+    ):
+        aws.send_batch(["small", "x" * (AwsHelper.MAX_PAYLOAD_BYTES + 1)])
+
+    store.delete_payloads.assert_called_once_with(["sqs-payloads/key.json"], "bucket")
+
+
+def test_send_batch_oversized_without_store_sends_the_rest(aws_helper):
+    aws = aws_helper
+    aws._SQS.send_message_batch.return_value = {}
+
+    with pytest.raises(SQSMessageBatchNotSent):
+        aws.send_batch(["small", "x" * (AwsHelper.MAX_PAYLOAD_BYTES + 1)])
+
+    entries = aws._SQS.send_message_batch.call_args.kwargs["Entries"]
+    assert [entry["MessageBody"] for entry in entries] == ["small"]
+
+
 def test_delete_message_success(aws_helper):
     aws_helper._SQS = MagicMock()
     aws_helper.delete_message_main_queue("abc123", 1)
@@ -135,6 +299,41 @@ def test_delete_messages_batch_success(aws_helper):
     assert entries[0]["Id"] == "1"
 
 
+def test_delete_messages_batch_retries_failed_entries(aws_helper):
+    aws_helper._SQS = MagicMock()
+    aws_helper._SQS.delete_message_batch.side_effect = [
+        {
+            "Failed": [
+                {"Id": "2", "SenderFault": False, "Code": "InternalError"},
+                {"Id": "3", "SenderFault": True, "Code": "ReceiptHandleIsInvalid"},
+            ]
+        },
+        {"Successful": [{"Id": "2"}]},
+    ]
+    msgs = [{"MessageId": str(i), "ReceiptHandle": f"rh{i}"} for i in range(1, 4)]
+
+    failed = aws_helper.delete_messages_batch(
+        msgs, aws_helper.queue_url, backoff_seconds=0
+    )
+
+    retried = aws_helper._SQS.delete_message_batch.call_args_list[1][1]["Entries"]
+    assert retried == [{"Id": "2", "ReceiptHandle": "rh2"}]
+    assert failed == [msgs[2]]
+
+
+def test_delete_messages_batch_chunks_by_ten(aws_helper):
+    aws_helper._SQS = MagicMock()
+    aws_helper._SQS.delete_message_batch.return_value = {}
+    msgs = [{"MessageId": str(i), "ReceiptHandle": f"rh{i}"} for i in range(23)]
+
+    assert aws_helper.delete_messages_batch(msgs, aws_helper.queue_url) == []
+    sizes = [
+        len(c[1]["Entries"])
+        for c in aws_helper._SQS.delete_message_batch.call_args_list
+    ]
+    assert sizes == [10, 10, 3]
+
+
 def test_delete_messages_batch_no_messages(aws_helper):
     # Should do nothing
     aws_helper._SQS = MagicMock()
@@ -164,3 +363,22 @@ def test_send_to_fallback_batch_handling(aws_helper):
     msgs = [{"Body": f"msg{i}", "ReceiptHandle": "r1"} for i in range(15)]
     aws_helper.send_messages_to_fallback_queue(msgs)
     assert aws_helper._SQS.send_message_batch.call_count == 2
+
+
+def test_change_visibility_batch_chunks_and_returns_failed(aws_helper):
+    messages = [{"ReceiptHandle": f"rh-{i}"} for i in range(12)]
+    aws_helper._SQS.change_message_visibility_batch.side_effect = [
+        {"Failed": [{"Id": "3", "Message": "Message does not exist"}]},
+        {"Successful": [{"Id": "0"}, {"Id": "1"}]},
+    ]
+
+    failed = aws_helper.change_visibility_batch(messages, 60)
+
+    calls = aws_helper._SQS.change_message_visibility_batch.call_args_list
+    assert [len(c.kwargs["Entries"]) for c in calls] == [10, 2]
+    assert calls[1].kwargs["Entries"][0] == {
+        "Id": "0",
+        "ReceiptHandle": "rh-10",
+        "VisibilityTimeout": 60,
+    }
+    assert failed == [{"ReceiptHandle": "rh-3"}]
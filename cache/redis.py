@@ -65,6 +65,33 @@ class RedisService:
         """
         return self._redis_client.get(name=key)
 
+    def get_values(self, keys: list[str]) -> list[str | None]:
+        """
+        Get several values from the Redis cache in a single round trip.
+
+        :param keys: Keys whose values are to be retrieved.
+        :return: One value per key in the same order, None for missing keys.
+        """
+        if not keys:
+            return []
+
+        return self._redis_client.mget(keys)
+
+    def set_values(self, mapping: dict[str, str], expire_seconds: int = 86400) -> None:
+        """
+        Set several values in the Redis cache in a single round trip.
+
+        :param mapping: Keys and values to store.
+        :param expire_seconds: Expiration time in seconds for every key.
+        """
+        if not mapping:
+            return
+
+        pipeline = self._redis_client.pipeline()
+        for key, value in mapping.items():
+            pipeline.set(name=key, value=value, ex=expire_seconds)
+        pipeline.execute()
+
     def delete_value(self, key: str) -> None:
         """
         Delete a value from the Redis cache.
@@ -73,9 +100,76 @@ class RedisService:
         """
         self._redis_client.delete(key)
 
-    def _get_cache_key(self, key: str, date: datetime) -> str:
+    def get_hash(self, key: str) -> dict[str, str]:
         """
-        Get the full cache key with prefix.
+        Get every field of a hash stored in the Redis cache.
+
+        :param key: Key of the hash.
+        :return: Mapping of fields to values, empty if the key does not exist.
+        """
+        return self._redis_client.hgetall(name=key)
+
+    def set_hash(
+        self, key: str, mapping: dict[str, str], expire_seconds: int = 86400
+    ) -> None:
+        """
+        Set several fields of a hash in a single round trip and refresh its expiration.
+
+        :param key: Key of the hash.
+        :param mapping: Fields and values to store.
+        :param expire_seconds: Expiration time in seconds for the whole hash.
+        """
+        if not mapping:
+            return
+
+        pipeline = self._redis_client.pipeline()
+        pipeline.hset(name=key, mapping=mapping)
+        pipeline.expire(name=key, time=expire_seconds)
+        pipeline.execute()
+
+    def add_to_set(
+        self, key: str, members: list[str], expire_seconds: int = 86400
+    ) -> None:
+        """
+        Add members to a set in a single round trip and refresh its expiration.
+
+        :param key: Key of the set.
+        :param members: Members to add.
+        :param expire_seconds: Expiration time in seconds for the whole set.
+        """
+        if not members:
+            return
+
+        pipeline = self._redis_client.pipeline()
+        pipeline.sadd(key, *members)
+        pipeline.expire(name=key, time=expire_seconds)
+        pipeline.execute()
+
+    def are_members(self, key: str, members: list[str]) -> list[bool]:
+        """
+        Check the membership of several values of a set in a single round trip.
+
+        :param key: Key of the set.
+        :param members: Values to check.
+        :return: One boolean per value, in the same order.
+        """
+        if not members:
+            return []
+
+        return [bool(found) for found in self._redis_client.smismember(key, members)]
+
+    def get_prefixed_key(self, key: str) -> str:
+        """
+        Get the full cache key with prefix, for keys that are not date based.
+
+        :param key: The original key.
+        :return: The full cache key with prefix.
+        """
+        return f"{self._cache_prefix}:{key}"
+
+    def get_dated_key(self, key: str, date: datetime) -> str:
+        """
+        Get the full cache key with prefix, for keys bucketed by day.
 
         :param key: The original key.
         :param date: The date to append to the key.
@@ -84,6 +178,16 @@ class RedisService:
         date = date.strftime("%Y-%m-%d")
         return f"{self._cache_prefix}:{key}:{date}"
 
+    def _get_cache_key(self, key: str, date: datetime) -> str:
+        """
+        Get the full cache key with prefix.
+
+        :param key: The original key.
+        :param date: The date to append to the key.
+        :return: The full cache key with prefix.
+        """
+        return self.get_dated_key(key, date)
+
     def set_cached_data(
         self,
         key: str,
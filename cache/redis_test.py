@@ -87,12 +87,100 @@ class TestRedisService:
         assert result == "test_value"
         mock_redis_client.get.assert_called_once_with(name="test_key")
 
+    def test_get_values(self, redis_service, mock_redis_client):
+        """Test getting several values in one round trip."""
+        mock_redis_client.mget.return_value = ["a", None]
+
+        result = redis_service.get_values(["k1", "k2"])
+
+        assert result == ["a", None]
+        mock_redis_client.mget.assert_called_once_with(["k1", "k2"])
+
+    def test_get_values_empty(self, redis_service, mock_redis_client):
+        """Test that an empty lookup does not reach Redis."""
+        assert redis_service.get_values([]) == []
+        mock_redis_client.mget.assert_not_called()
+
+    def test_set_values(self, redis_service, mock_redis_client):
+        """Test setting several values with an expiration in one pipeline."""
+        pipeline = mock_redis_client.pipeline.return_value
+
+        redis_service.set_values({"k1": "a", "k2": "b"}, expire_seconds=60)
+
+        assert pipeline.set.call_count == 2
+        pipeline.set.assert_any_call(name="k1", value="a", ex=60)
+        pipeline.execute.assert_called_once()
+
     def test_delete_value(self, redis_service, mock_redis_client):
         """Test deleting a value from Redis."""
         redis_service.delete_value("test_key")
 
         mock_redis_client.delete.assert_called_once_with("test_key")
 
+    def test_get_hash(self, redis_service, mock_redis_client):
+        """Test getting every field of a hash."""
+        mock_redis_client.hgetall.return_value = {"field": "value"}
+
+        result = redis_service.get_hash("test_key")
+
+        assert result == {"field": "value"}
+        mock_redis_client.hgetall.assert_called_once_with(name="test_key")
+
+    def test_set_hash(self, redis_service, mock_redis_client):
+        """Test setting hash fields and refreshing the expiration in one pipeline."""
+        pipeline = mock_redis_client.pipeline.return_value
+
+        redis_service.set_hash("test_key", {"field": "value"}, expire_seconds=60)
+
+        pipeline.hset.assert_called_once_with(
+            name="test_key", mapping={"field": "value"}
+        )
+        pipeline.expire.assert_called_once_with(name="test_key", time=60)
+        pipeline.execute.assert_called_once()
+
+    def test_set_hash_empty_mapping(self, redis_service, mock_redis_client):
+        """Test that an empty mapping does not reach Redis."""
+        redis_service.set_hash("test_key", {})
+
+        mock_redis_client.pipeline.assert_not_called()
+
+    def test_add_to_set(self, redis_service, mock_redis_client):
+        """Test adding members to a set and refreshing its expiration."""
+        pipeline = mock_redis_client.pipeline.return_value
+
+        redis_service.add_to_set("test_key", ["a", "b"], expire_seconds=60)
+
+        pipeline.sadd.assert_called_once_with("test_key", "a", "b")
+        pipeline.expire.assert_called_once_with(name="test_key", time=60)
+        pipeline.execute.assert_called_once()
+
+    def test_are_members(self, redis_service, mock_redis_client):
+        """Test checking several members of a set at once."""
+        mock_redis_client.smismember.return_value = [1, 0]
+
+        result = redis_service.are_members("test_key", ["a", "b"])
+
+        assert result == [True, False]
+        mock_redis_client.smismember.assert_called_once_with("test_key", ["a", "b"])
+
+    def test_are_members_empty(self, redis_service, mock_redis_client):
+        """Test that an empty membership check does not reach Redis."""
+        assert redis_service.are_members("test_key", []) == []
+        mock_redis_client.smismember.assert_not_called()
+
+    def test_get_prefixed_key(self, redis_service):
+        """Test prefixed key generation."""
+        assert redis_service.get_prefixed_key("test_key") == "news_tracker:test_key"
+
+    def test_get_dated_key(self, redis_service):
+        """Test day bucketed key generation."""
+        date = datetime(2025, 10, 20)
+
+        assert (
+            redis_service.get_dated_key("test_key", date)
+            == "news_tracker:test_key:2025-10-20"
+        )
+
     def test_get_cache_key(self, redis_service):
         """Test cache key generation."""
         date = datetime(2025, 10, 20)
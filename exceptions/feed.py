@@ -0,0 +1,7 @@
+"""Custom exceptions for rss feed errors."""
+
+
+class FeedParseError(Exception):
+    """Exception raised when an rss feed can not be parsed."""
+
+    pass
@@ -1,7 +1,10 @@
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func, text
+from sqlalchemy import func, text, cast, column, values
 from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from collections.abc import Iterator
+from contextlib import contextmanager
 from logging import Logger
 from typing import Callable
 
@@ -31,10 +34,8 @@ class DataBaseHelper:
         """
         try:
             with session_factory() as session:
-                stmt = (
-                    insert(object_type)
-                    .values(objects_to_write)
-                    .on_conflict_do_nothing()
+                stmt = DataBaseHelper.build_insert_statement(
+                    object_type, objects_to_write, ignore_conflicts=True
                 )
                 result = session.execute(stmt)
                 session.commit()
@@ -66,20 +67,9 @@ class DataBaseHelper:
         """
         try:
             with session_factory() as session:
-                stmt = insert(object_type).values(objects_to_write)
-
-                if conflict_index:
-                    # Update is undesired, but returning is still needed for repeated rows
-                    dummy_col = list(object_type.__table__.primary_key.columns)[0].name
-                    stmt = stmt.on_conflict_do_update(
-                        index_elements=conflict_index,
-                        set_={
-                            dummy_col: getattr(object_type.__table__.c, dummy_col)
-                        },  # does not update
-                    )
-
-                if return_columns:
-                    stmt = stmt.returning(*return_columns)
+                stmt = DataBaseHelper.build_insert_statement(
+                    object_type, objects_to_write, return_columns, conflict_index
+                )
 
                 result = session.execute(stmt)
                 session.commit()
@@ -101,6 +91,63 @@ class DataBaseHelper:
             logger.error("Failed to commit objects to database.", extra={"error": e})
             raise
 
+    @staticmethod
+    def build_insert_statement(
+        object_type,
+        objects_to_write: list[object],
+        return_columns: list = None,
+        conflict_index: list = None,
+        ignore_conflicts: bool = False,
+    ):
+        """
+        Builds the insert statement of the batch writing methods.
+
+        :param object_type: The class which is mapped to the data base table
+        :param objects_to_write: List of objects to be written.
+        :param return_columns: List of columns to return.
+        :param conflict_index: List of index elements that make conflicts, conflicting rows are still returned.
+        :param ignore_conflicts: Skip conflicting rows, used when no conflict index is given.
+        """
+        stmt = insert(object_type).values(objects_to_write)
+
+        if ignore_conflicts and not conflict_index:
+            stmt = stmt.on_conflict_do_nothing()
+
+        if conflict_index:
+            # Update is undesired, but returning is still needed for repeated rows
+            dummy_col = list(object_type.__table__.primary_key.columns)[0].name
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_index,
+                set_={
+                    dummy_col: getattr(object_type.__table__.c, dummy_col)
+                },  # does not update
+            )
+
+        if return_columns:
+            stmt = stmt.returning(*return_columns)
+
+        return stmt
+
+    @staticmethod
+    @contextmanager
+    def unit_of_work(session_factory: Callable, logger) -> Iterator[Session]:
+        """
+        Yields a session whose statements are committed together when the block ends.
+
+        Nothing is committed if the block raises, the transaction is rolled back.
+
+        :param session_factory: Factory function to create a data base session.
+        :param logger: Logger object to handle logging logic.
+        """
+        with session_factory() as session:
+            try:
+                yield session
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.exception("Unit of work rolled back.", extra={"error": str(e)})
+                raise
+
     @staticmethod
     def write_orm_objects(objects_to_write: list | object, session_factory, logger):
         """
@@ -323,3 +370,103 @@ class DataBaseHelper:
         except Exception as e:
             logger.exception("Unexpected error occurred", extra={"error": str(e)})
             raise
+
+    @staticmethod
+    def build_bulk_update_statement(
+        object_type, unique_field: str, objects_to_update: list[dict]
+    ):
+        """
+        Builds a single UPDATE ... FROM (VALUES ...) statement applying many rows at once.
+
+        Every object must hold the same keys, the unique field included.
+
+        :param object_type: The class which is mapped to the data base table
+        :param unique_field: The field name identifying the rows to update.
+        :param objects_to_update: Objects holding the unique field and the new values.
+        """
+        fields = list(objects_to_update[0])
+        if unique_field not in fields:
+            raise ValueError(f"Objects to update must include {unique_field}.")
+
+        table = object_type.__table__
+        data = values(*[column(field) for field in fields], name="data").data(
+            [tuple(obj[field] for field in fields) for obj in objects_to_update]
+        )
+
+        # values are sent untyped, cast them to the column types
+        return (
+            update(object_type)
+            .where(
+                table.c[unique_field]
+                == cast(data.c[unique_field], table.c[unique_field].type)
+            )
+            .values(
+                {
+                    field: cast(data.c[field], table.c[field].type)
+                    for field in fields
+                    if field != unique_field
+                }
+            )
+        )
+
+    @staticmethod
+    def bulk_update_from_dicts(
+        object_type,
+        unique_field: str,
+        objects_to_update: list[dict],
+        session_factory: Callable,
+        logger,
+    ) -> int:
+        """
+        Updates many rows based on the unique field in a single statement and commit.
+
+        :param object_type: The class which is mapped to the data base table
+        :param unique_field: The field name that is unique in the table.
+        :param objects_to_update: Objects holding the unique field and the new values.
+        :param session_factory: Factory function to create a data base session.
+        :param logger: Logger object to handle logging logic.
+        :return: Number of updated rows.
+        """
+        if not objects_to_update:
+            return 0
+
+        try:
+            with session_factory() as session:
+                stmt = DataBaseHelper.build_bulk_update_statement(
+                    object_type, unique_field, objects_to_update
+                )
+                result = session.execute(stmt)
+                session.commit()
+                if result.rowcount != len(objects_to_update):
+                    logger.warning(
+                        f"Updated {result.rowcount} of {len(objects_to_update)} rows of {object_type.__tablename__}"
+                    )
+                return result.rowcount
+
+        except SQLAlchemyError as e:
+            logger.exception("Failed to update objects in db", extra={"error": str(e)})
+            raise
+        except Exception as e:
+            logger.exception("Unexpected error occurred", extra={"error": str(e)})
+            raise
+
+    @staticmethod
+    def bulk_update_by_primary_key(
+        object_type,
+        objects_to_update: list[dict],
+        session_factory: Callable,
+        logger,
+    ) -> int:
+        """
+        Updates many rows by primary key in a single statement and commit.
+
+        :param object_type: The class which is mapped to the data base table
+        :param objects_to_update: Objects holding the primary key and the new values.
+        :param session_factory: Factory function to create a data base session.
+        :param logger: Logger object to handle logging logic.
+        :return: Number of updated rows.
+        """
+        primary_key = list(object_type.__table__.primary_key.columns)[0].name
+        return DataBaseHelper.bulk_update_from_dicts(
+            object_type, primary_key, objects_to_update, session_factory, logger
+        )
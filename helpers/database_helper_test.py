@@ -0,0 +1,115 @@
+import logging
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+
+from database.models import News
+from helpers.database_helper import DataBaseHelper
+
+logger = logging.getLogger(__name__)
+
+
+def compile_sql(stmt) -> str:
+    return str(
+        stmt.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_build_bulk_update_statement_uses_a_single_values_list():
+    stmt = DataBaseHelper.build_bulk_update_statement(
+        News, "id", [{"id": 1, "keywords_id": 5}, {"id": 2, "keywords_id": 6}]
+    )
+
+    sql = compile_sql(stmt)
+    assert "FROM (VALUES (1, 5), (2, 6)) AS data (id, keywords_id)" in sql
+    assert "SET keywords_id=CAST(data.keywords_id AS INTEGER)" in sql
+    assert "news_schema.news.id = CAST(data.id AS INTEGER)" in sql
+
+
+def test_build_bulk_update_statement_requires_unique_field():
+    with pytest.raises(ValueError):
+        DataBaseHelper.build_bulk_update_statement(News, "id", [{"keywords_id": 5}])
+
+
+def test_bulk_update_by_primary_key_executes_once():
+    session = MagicMock()
+    session.execute.return_value.rowcount = 2
+    session_factory = MagicMock()
+    session_factory.return_value.__enter__.return_value = session
+
+    updated = DataBaseHelper.bulk_update_by_primary_key(
+        News,
+        [{"id": 1, "keywords_id": 5}, {"id": 2, "keywords_id": 6}],
+        session_factory,
+        logger,
+    )
+
+    assert updated == 2
+    session.execute.assert_called_once()
+    session.commit.assert_called_once()
+
+
+def test_bulk_update_by_primary_key_without_objects_skips_db():
+    session_factory = MagicMock()
+
+    assert (
+        DataBaseHelper.bulk_update_by_primary_key(News, [], session_factory, logger)
+        == 0
+    )
+    session_factory.assert_not_called()
+
+
+def test_unit_of_work_commits_once():
+    session = MagicMock()
+    session_factory = MagicMock()
+    session_factory.return_value.__enter__.return_value = session
+
+    with DataBaseHelper.unit_of_work(session_factory, logger) as uow_session:
+        uow_session.execute("first")
+        uow_session.execute("second")
+
+    session.commit.assert_called_once()
+    session.rollback.assert_not_called()
+
+
+def test_unit_of_work_rolls_back_on_error():
+    session = MagicMock()
+    session_factory = MagicMock()
+    session_factory.return_value.__enter__.return_value = session
+
+    with pytest.raises(RuntimeError):
+        with DataBaseHelper.unit_of_work(session_factory, logger):
+            raise RuntimeError("write failed")
+
+    session.commit.assert_not_called()
+    session.rollback.assert_called_once()
+
+
+def test_build_insert_statement_ignores_conflicts():
+    stmt = DataBaseHelper.build_insert_statement(
+        News, [{"id": 1, "headline": "h"}], ignore_conflicts=True
+    )
+
+    assert compile_sql(stmt).endswith("ON CONFLICT DO NOTHING")
+
+
+def test_bulk_update_from_dicts_by_unique_field():
+    session = MagicMock()
+    session.execute.return_value.rowcount = 1
+    session_factory = MagicMock()
+    session_factory.return_value.__enter__.return_value = session
+
+    updated = DataBaseHelper.bulk_update_from_dicts(
+        News,
+        "url",
+        [{"url": "http://a", "thumbnail": "cdn/a"}],
+        session_factory,
+        logger,
+    )
+
+    assert updated == 1
+    sql = compile_sql(session.execute.call_args.args[0])
+    assert "SET thumbnail=CAST(data.thumbnail AS VARCHAR)" in sql
+    assert "news_schema.news.url = CAST(data.url AS VARCHAR)" in sql
@@ -0,0 +1,122 @@
+"""Shared HTTP client with keep-alive connection pools, retries and timeouts."""
+
+import threading
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpClient:
+    """
+    Wrapper around a requests Session used by every outbound caller.
+
+    Connections are kept alive per host, so repeated calls skip the TCP and TLS
+    handshakes. Idempotent requests are retried with exponential backoff on
+    connection errors and on throttling or server error responses, and every
+    request gets a default timeout.
+    """
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        timeout: float | tuple[float, float] = (3, 10),
+    ):
+        """
+        Initialize an Http Client.
+
+        :param pool_maxsize: Maximum number of kept alive connections per host, should
+            match the number of threads calling the same host.
+        :param max_retries: Number of retries for GET and HEAD requests, 0 disables them.
+        :param backoff_factor: Base of the exponential backoff between retries, in seconds.
+        :param timeout: Default (connect, read) timeout in seconds, used when a
+            request does not set its own.
+        """
+        if pool_maxsize < 1:
+            raise ValueError("pool_maxsize must be greater than zero.")
+
+        self._timeout = timeout
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=self.RETRY_METHODS,
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retry)
+
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @property
+    def session(self) -> requests.Session:
+        """The underlying session, for libraries that take one (e.g. google-auth)."""
+        return self._session
+
+    def get(self, url: str, **kwargs) -> Response:
+        """
+        Sends a GET request through the pooled session.
+
+        :param url: Url to request.
+        :param kwargs: Any requests.get argument.
+        """
+        kwargs.setdefault("timeout", self._timeout)
+        return self._session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Response:
+        """
+        Sends a POST request through the pooled session, POST requests are never retried.
+
+        :param url: Url to request.
+        :param kwargs: Any requests.post argument.
+        """
+        kwargs.setdefault("timeout", self._timeout)
+        return self._session.post(url, **kwargs)
+
+    def close(self) -> None:
+        """Closes every pooled connection."""
+        self._session.close()
+
+
+_clients: dict[str, HttpClient] = {}
+_client_options: dict[str, dict] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(name: str = "default", **options) -> HttpClient:
+    """
+    Returns the process wide client registered under a name, creating it on first use.
+
+    Reusing the client across calls, and across warm Lambda invocations, is what
+    keeps the connections alive.
+
+    :param name: Name of the client, callers with different policies use different names.
+    :param options: HttpClient arguments, every caller of a name must pass the same ones.
+    :raises ValueError: If the client already exists with different options.
+    """
+    with _clients_lock:
+        if name not in _clients:
+            _clients[name] = HttpClient(**options)
+            _client_options[name] = options
+        elif _client_options[name] != options:
+            raise ValueError(
+                f"Http client {name} already exists with options {_client_options[name]}."
+            )
+        return _clients[name]
+
+
+def close_http_clients() -> None:
+    """Closes and forgets every registered client, e.g. in a freshly forked process."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _client_options.clear()
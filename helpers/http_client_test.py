@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+
+from helpers import http_client
+from helpers.http_client import HttpClient, get_http_client, close_http_clients
+
+
+def test_get_applies_default_timeout():
+    client = HttpClient(timeout=5)
+
+    with patch.object(client.session, "get") as mock_get:
+        client.get("https://example.com", params={"q": "x"})
+
+    mock_get.assert_called_once_with(
+        "https://example.com", params={"q": "x"}, timeout=5
+    )
+
+
+def test_explicit_timeout_wins():
+    client = HttpClient(timeout=5)
+
+    with patch.object(client.session, "post") as mock_post:
+        client.post("https://example.com", data={}, timeout=1)
+
+    assert mock_post.call_args.kwargs["timeout"] == 1
+
+
+def test_adapter_pool_and_retry_policy():
+    client = HttpClient(pool_maxsize=4, max_retries=3)
+
+    adapter = client.session.get_adapter("https://example.com")
+
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 3
+    assert 503 in adapter.max_retries.status_forcelist
+    assert "POST" not in adapter.max_retries.allowed_methods
+
+
+def test_get_http_client_reuses_named_clients():
+    try:
+        first = get_http_client("test-client", pool_maxsize=2)
+        assert get_http_client("test-client", pool_maxsize=2) is first
+        assert get_http_client("other-test-client") is not first
+    finally:
+        close_http_clients()
+
+    assert http_client._clients == {}
+
+
+def test_get_http_client_rejects_different_options():
+    try:
+        get_http_client("test-client", max_retries=0)
+        with pytest.raises(ValueError):
+            get_http_client("test-client")
+    finally:
+        close_http_clients()
@@ -1,29 +1,34 @@
 """Helper functions for image processing and uploading to S3."""
 
-import requests
 from urllib.parse import urlparse
 from requests import Response, RequestException
 
 from exceptions.image import ImageDownloadError
+from helpers.http_client import get_http_client
 
 
 class ImageHelper:
     """Helper class for image processing and uploading to S3."""
 
     @staticmethod
-    def download_image(image_url: str, max_retries: int = 3) -> Response:
+    def download_image(
+        image_url: str, max_retries: int = 3, stream: bool = False
+    ) -> Response:
         """
         Download an image from a given URL.
 
         :param image_url: URL of the image to download.
         :param max_retries: Number of retries for downloading the image.
+        :param stream: Leave the body unread, the caller reads response.raw and closes the response.
         :return: Image content in bytes.
         :raises ImageDownloadError: If the image cannot be downloaded.
         """
+        # Retries are owned by the loop below, the pooled client only reuses connections.
+        client = get_http_client("images", max_retries=0, timeout=10)
         error = str()
         for _ in range(max_retries):
             try:
-                response = requests.get(image_url, timeout=10)
+                response = client.get(image_url, stream=stream)
                 response.raise_for_status()
                 return response
             except RequestException as e:
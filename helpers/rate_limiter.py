@@ -0,0 +1,40 @@
+"""Thread-safe rate limiting helpers shared by outbound clients."""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Enforces a minimum interval between consecutive acquisitions across threads."""
+
+    def __init__(self, min_interval: float = 0.0):
+        """
+        Initialize a rate limiter.
+
+        :param min_interval: Minimum number of seconds between two acquisitions.
+        """
+        if min_interval < 0:
+            raise ValueError("min_interval must be a non negative number.")
+
+        self._min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        """
+        Blocks the calling thread until its slot is due.
+
+        Slots are reserved under the lock and waited for outside of it, so
+        concurrent callers are spaced out without serializing their sleeps.
+        """
+        if not self._min_interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,156 @@
+"""Persisted registry of the discovered BBC navbar links and rss feeds."""
+
+import json
+import threading
+import time
+from collections.abc import Callable
+
+from cache.redis import RedisService
+from logger.logging_config import logger
+
+
+class FeedRegistry:
+    """TTL-bound registry so feed discovery does not crawl the navbar pages every run."""
+
+    CACHE_KEY = "feed_registry"
+
+    def __init__(
+        self,
+        redis_service: RedisService | None = None,
+        ttl_seconds: int = 604800,
+        revalidate_after_seconds: int = 86400,
+    ):
+        """
+        Initialize the feed registry.
+
+        :param redis_service: Redis service used to persist the registry (optional).
+            Without it feeds are discovered on every call.
+        :param ttl_seconds: Age after which a stored registry is discarded, default 7 days.
+        :param revalidate_after_seconds: Age after which a stored registry is still used
+            but rediscovered in the background, default 1 day.
+        """
+        if revalidate_after_seconds > ttl_seconds:
+            raise ValueError("revalidate_after_seconds must not exceed ttl_seconds.")
+
+        self._redis_service = redis_service
+        self._ttl_seconds = ttl_seconds
+        self._revalidate_after_seconds = revalidate_after_seconds
+        self._revalidation: threading.Thread | None = None
+
+    def _get_key(self) -> str:
+        """Get the redis key holding the registry."""
+        return self._redis_service.get_prefixed_key(self.CACHE_KEY)
+
+    def _load(self) -> dict | None:
+        """Loads the stored registry, None if it is missing or unreadable."""
+        try:
+            raw = self._redis_service.get_value(self._get_key())
+        except Exception as e:
+            logger.warning("Failed to load feed registry.", extra={"error": str(e)})
+            return None
+
+        if not raw:
+            return None
+
+        try:
+            entry = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning("Discarding malformed feed registry.")
+            return None
+
+        if not entry.get("rss_feeds") or "discovered_at" not in entry:
+            return None
+
+        return entry
+
+    def _store(self, navbar_links: list[str], rss_feeds: list[str]) -> None:
+        """
+        Stores a freshly discovered registry, empty discoveries are never stored.
+
+        :param navbar_links: Discovered navbar links.
+        :param rss_feeds: Discovered rss feeds.
+        """
+        if not rss_feeds:
+            logger.warning("Feed discovery returned no feeds, registry not updated.")
+            return
+
+        entry = {
+            "navbar_links": navbar_links,
+            "rss_feeds": rss_feeds,
+            "discovered_at": time.time(),
+        }
+        try:
+            self._redis_service.set_value(
+                self._get_key(), json.dumps(entry), expire_seconds=self._ttl_seconds
+            )
+            logger.info(f"Feed registry stored with {len(rss_feeds)} feeds.")
+        except Exception as e:
+            logger.warning("Failed to store feed registry.", extra={"error": str(e)})
+
+    def _discover_and_store(
+        self, discover: Callable[[], tuple[list[str], list[str]]]
+    ) -> tuple[list[str], list[str]]:
+        """
+        Runs feed discovery and stores its result.
+
+        :param discover: Function returning the navbar links and rss feeds.
+        """
+        navbar_links, rss_feeds = discover()
+        self._store(navbar_links, rss_feeds)
+        return navbar_links, rss_feeds
+
+    def _revalidate(self, discover: Callable[[], tuple[list[str], list[str]]]) -> None:
+        """Background target, discovery errors must not escape the thread."""
+        try:
+            self._discover_and_store(discover)
+        except Exception:
+            logger.exception("Background feed registry revalidation failed.")
+
+    def get_feeds(
+        self,
+        discover: Callable[[], tuple[list[str], list[str]]],
+        force_refresh: bool = False,
+    ) -> tuple[list[str], list[str]]:
+        """
+        Returns the navbar links and rss feeds, discovering them only when needed.
+
+        A missing or expired registry is discovered synchronously. A registry older
+        than revalidate_after_seconds is returned as is while a background thread
+        rediscovers it for the next run.
+
+        :param discover: Function returning the navbar links and rss feeds.
+        :param force_refresh: Ignore the stored registry and discover again.
+        """
+        if not self._redis_service:
+            return discover()
+
+        entry = None if force_refresh else self._load()
+        age = time.time() - entry["discovered_at"] if entry else None
+
+        if entry is None or age >= self._ttl_seconds:
+            logger.info("Discovering rss feeds.")
+            return self._discover_and_store(discover)
+
+        if age >= self._revalidate_after_seconds and not self._revalidation:
+            logger.info("Feed registry is stale, revalidating in background.")
+            self._revalidation = threading.Thread(
+                target=self._revalidate,
+                args=(discover,),
+                name="feed-registry-revalidation",
+                daemon=True,
+            )
+            self._revalidation.start()
+
+        return entry.get("navbar_links", []), entry["rss_feeds"]
+
+    def wait_for_revalidation(self, timeout: float | None = None) -> None:
+        """
+        Waits for a running background revalidation.
+
+        Lambda freezes the environment once the handler returns, so the job must
+        call this before exiting for the revalidated registry to be stored.
+
+        :param timeout: Maximum number of seconds to wait.
+        """
+        if self._revalidation:
+            self._revalidation.join(timeout)
@@ -0,0 +1,106 @@
+import json
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from jobs.bbc.feed_registry import FeedRegistry
+
+
+NAVBAR = ["https://bbc.co.uk/news"]
+FEEDS = ["https://feeds.bbci.co.uk/news/rss.xml"]
+
+
+def make_redis(entry=None):
+    redis_service = MagicMock()
+    redis_service.get_prefixed_key.side_effect = lambda key: f"news_tracker:{key}"
+    redis_service.get_value.return_value = json.dumps(entry) if entry else None
+    return redis_service
+
+
+def stored_entry(age_seconds):
+    return {
+        "navbar_links": ["https://bbc.co.uk/old"],
+        "rss_feeds": ["https://feeds.bbci.co.uk/old/rss.xml"],
+        "discovered_at": time.time() - age_seconds,
+    }
+
+
+def test_without_redis_always_discovers():
+    discover = MagicMock(return_value=(NAVBAR, FEEDS))
+    registry = FeedRegistry()
+
+    assert registry.get_feeds(discover) == (NAVBAR, FEEDS)
+    discover.assert_called_once()
+
+
+def test_missing_registry_is_discovered_and_stored():
+    redis_service = make_redis()
+    discover = MagicMock(return_value=(NAVBAR, FEEDS))
+    registry = FeedRegistry(redis_service, ttl_seconds=100, revalidate_after_seconds=50)
+
+    assert registry.get_feeds(discover) == (NAVBAR, FEEDS)
+
+    key, raw = redis_service.set_value.call_args.args
+    assert key == "news_tracker:feed_registry"
+    assert json.loads(raw)["rss_feeds"] == FEEDS
+    assert redis_service.set_value.call_args.kwargs["expire_seconds"] == 100
+
+
+def test_fresh_registry_skips_discovery():
+    entry = stored_entry(age_seconds=10)
+    discover = MagicMock()
+    registry = FeedRegistry(
+        make_redis(entry), ttl_seconds=1000, revalidate_after_seconds=500
+    )
+
+    assert registry.get_feeds(discover) == (entry["navbar_links"], entry["rss_feeds"])
+    registry.wait_for_revalidation()
+    discover.assert_not_called()
+
+
+def test_stale_registry_is_served_and_revalidated_in_background():
+    entry = stored_entry(age_seconds=600)
+    redis_service = make_redis(entry)
+    discover = MagicMock(return_value=(NAVBAR, FEEDS))
+    registry = FeedRegistry(
+        redis_service, ttl_seconds=1000, revalidate_after_seconds=500
+    )
+
+    assert registry.get_feeds(discover) == (entry["navbar_links"], entry["rss_feeds"])
+    registry.wait_for_revalidation(timeout=5)
+
+    discover.assert_called_once()
+    assert json.loads(redis_service.set_value.call_args.args[1])["rss_feeds"] == FEEDS
+
+
+def test_expired_registry_is_discovered_synchronously():
+    discover = MagicMock(return_value=(NAVBAR, FEEDS))
+    registry = FeedRegistry(
+        make_redis(stored_entry(age_seconds=2000)),
+        ttl_seconds=1000,
+        revalidate_after_seconds=500,
+    )
+
+    assert registry.get_feeds(discover) == (NAVBAR, FEEDS)
+
+
+def test_force_refresh_ignores_stored_registry():
+    redis_service = make_redis(stored_entry(age_seconds=10))
+    discover = MagicMock(return_value=(NAVBAR, FEEDS))
+    registry = FeedRegistry(redis_service)
+
+    assert registry.get_feeds(discover, force_refresh=True) == (NAVBAR, FEEDS)
+    redis_service.get_value.assert_not_called()
+
+
+def test_empty_discovery_is_not_stored():
+    redis_service = make_redis()
+    registry = FeedRegistry(redis_service)
+
+    assert registry.get_feeds(lambda: ([], [])) == ([], [])
+    redis_service.set_value.assert_not_called()
+
+
+def test_invalid_revalidation_window_raises():
+    with pytest.raises(ValueError):
+        FeedRegistry(ttl_seconds=10, revalidate_after_seconds=20)
@@ -0,0 +1,111 @@
+"""Per-feed state persisted in a redis hash keyed by feed url."""
+
+from abc import ABC, abstractmethod
+
+from cache.redis import RedisService
+from logger.logging_config import logger
+
+
+class FeedStateStore(ABC):
+    """
+    Base of the per-feed stores, one value per feed url in a single redis hash.
+
+    Values are loaded in a single round trip, recorded values are only written on
+    save. Subclasses define the redis key and how a value is encoded.
+    """
+
+    CACHE_KEY: str
+    STATE_NAME: str
+
+    def __init__(
+        self,
+        redis_service: RedisService | None = None,
+        expire_seconds: int = 604800,
+    ):
+        """
+        Initialize the store.
+
+        :param redis_service: Redis service used to persist the state across runs (optional).
+            Without it the state only lives for the lifetime of this instance.
+        :param expire_seconds: TTL of the persisted state, default 7 days.
+        """
+        self._redis_service = redis_service
+        self._expire_seconds = expire_seconds
+        self._values: dict = {}
+        self._pending: dict = {}
+
+    @abstractmethod
+    def _encode(self, value) -> str:
+        """Encodes a value for the redis hash."""
+
+    @abstractmethod
+    def _decode(self, raw: str):
+        """Decodes a stored value, raising ValueError if it is malformed."""
+
+    def _get_key(self) -> str:
+        """Get the redis key holding the hash."""
+        return self._redis_service.get_prefixed_key(self.CACHE_KEY)
+
+    def load(self) -> None:
+        """Loads the state of every feed in a single round trip."""
+        if not self._redis_service:
+            return
+
+        try:
+            stored = self._redis_service.get_hash(self._get_key())
+        except Exception as e:
+            logger.warning(
+                f"Failed to load feed {self.STATE_NAME}.", extra={"error": str(e)}
+            )
+            return
+
+        for url, raw in stored.items():
+            try:
+                self._values[url] = self._decode(raw)
+            except ValueError:
+                logger.warning(f"Discarding malformed {self.STATE_NAME} for {url}")
+
+    def get(self, url: str):
+        """
+        Returns the state of a feed, None if it has none.
+
+        :param url: Url of the feed.
+        """
+        return self._values.get(url)
+
+    def _stage(self, url: str, value) -> None:
+        """
+        Records the state of a feed, it is persisted on save.
+
+        :param url: Url of the feed.
+        :param value: New state of the feed.
+        """
+        self._pending[url] = value
+
+    def save(self) -> None:
+        """
+        Persists the recorded state.
+
+        Call only once the feeds' items have been stored, otherwise the next run
+        would skip items that were never written.
+        """
+        if not self._pending:
+            return
+
+        self._values.update(self._pending)
+
+        if self._redis_service:
+            try:
+                self._redis_service.set_hash(
+                    self._get_key(),
+                    {url: self._encode(v) for url, v in self._pending.items()},
+                    expire_seconds=self._expire_seconds,
+                )
+                logger.info(f"Saved {self.STATE_NAME} for {len(self._pending)} feeds.")
+            except Exception as e:
+                logger.warning(
+                    f"Failed to save feed {self.STATE_NAME}.", extra={"error": str(e)}
+                )
+                return
+
+        self._pending = {}
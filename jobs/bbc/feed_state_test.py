@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import MagicMock
+
+from jobs.bbc.feed_state import FeedStateStore
+
+
+FEED_URL = "https://feeds.bbci.co.uk/news/rss.xml"
+
+
+class CountStore(FeedStateStore):
+    CACHE_KEY = "feed_counts"
+    STATE_NAME = "counts"
+
+    def _encode(self, value: int) -> str:
+        return str(value)
+
+    def _decode(self, raw: str) -> int:
+        return int(raw)
+
+    def record(self, url: str, value: int) -> None:
+        self._stage(url, value)
+
+
+def make_redis(stored=None):
+    redis_service = MagicMock()
+    redis_service.get_prefixed_key.side_effect = lambda key: f"news_tracker:{key}"
+    redis_service.get_hash.return_value = stored or {}
+    return redis_service
+
+
+def test_load_decodes_stored_values_and_discards_malformed_ones():
+    redis_service = make_redis({FEED_URL: "3", "https://bad": "three"})
+    store = CountStore(redis_service)
+
+    store.load()
+
+    assert store.get(FEED_URL) == 3
+    assert store.get("https://bad") is None
+    redis_service.get_hash.assert_called_once_with("news_tracker:feed_counts")
+
+
+def test_load_failure_is_not_fatal():
+    redis_service = make_redis()
+    redis_service.get_hash.side_effect = Exception("redis down")
+    store = CountStore(redis_service)
+
+    store.load()
+
+    assert store.get(FEED_URL) is None
+
+
+def test_recorded_values_are_persisted_only_on_save():
+    redis_service = make_redis()
+    store = CountStore(redis_service, expire_seconds=60)
+
+    store.record(FEED_URL, 4)
+    redis_service.set_hash.assert_not_called()
+    store.save()
+    store.save()
+
+    redis_service.set_hash.assert_called_once_with(
+        "news_tracker:feed_counts", {FEED_URL: "4"}, expire_seconds=60
+    )
+    assert store.get(FEED_URL) == 4
+
+
+def test_failed_save_is_retried_on_next_save():
+    redis_service = make_redis()
+    redis_service.set_hash.side_effect = [Exception("redis down"), None]
+    store = CountStore(redis_service)
+
+    store.record(FEED_URL, 4)
+    store.save()
+    store.save()
+
+    assert redis_service.set_hash.call_count == 2
+
+
+def test_works_without_redis():
+    store = CountStore()
+    store.load()
+    store.record(FEED_URL, 4)
+    store.save()
+
+    assert store.get(FEED_URL) == 4
+
+
+def test_incomplete_store_can_not_be_instantiated():
+    class NoEncodingStore(FeedStateStore):
+        CACHE_KEY = "feed_nothing"
+        STATE_NAME = "nothing"
+
+    with pytest.raises(TypeError):
+        NoEncodingStore()
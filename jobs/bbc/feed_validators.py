@@ -0,0 +1,56 @@
+"""Conditional GET support for rss feeds, persists ETag / Last-Modified validators per feed url."""
+
+import json
+from requests import Response
+
+from jobs.bbc.feed_state import FeedStateStore
+
+
+class FeedValidatorCache(FeedStateStore):
+    """Stores the validators returned by each feed so unchanged feeds answer 304."""
+
+    CACHE_KEY = "feed_validators"
+    STATE_NAME = "validators"
+
+    def _encode(self, value: dict) -> str:
+        return json.dumps(value)
+
+    def _decode(self, raw: str) -> dict:
+        return json.loads(raw)
+
+    def get_request_headers(self, url: str) -> dict[str, str]:
+        """
+        Builds the conditional request headers for a feed.
+
+        :param url: Url of the feed.
+        """
+        validators = self.get(url)
+        if not validators:
+            return {}
+
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        return headers
+
+    def record(self, url: str, response: Response) -> None:
+        """
+        Records the validators of a successfully processed feed, they are persisted on save.
+
+        :param url: Url of the feed.
+        :param response: Response whose headers carry the validators.
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not isinstance(etag, str):
+            etag = None
+        if not isinstance(last_modified, str):
+            last_modified = None
+
+        if not etag and not last_modified:
+            return
+
+        self._stage(url, {"etag": etag, "last_modified": last_modified})
@@ -0,0 +1,59 @@
+import json
+from unittest.mock import MagicMock
+
+from jobs.bbc.feed_validators import FeedValidatorCache
+
+
+FEED_URL = "https://feeds.bbci.co.uk/news/rss.xml"
+
+
+def make_response(headers):
+    response = MagicMock()
+    response.headers = headers
+    return response
+
+
+def test_request_headers_from_recorded_validators():
+    cache = FeedValidatorCache()
+    cache.record(
+        FEED_URL,
+        make_response(
+            {"ETag": '"abc"', "Last-Modified": "Tue, 26 Aug 2025 12:38:21 GMT"}
+        ),
+    )
+    cache.save()
+
+    assert cache.get_request_headers(FEED_URL) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Tue, 26 Aug 2025 12:38:21 GMT",
+    }
+
+
+def test_unknown_feed_has_no_conditional_headers():
+    assert FeedValidatorCache().get_request_headers(FEED_URL) == {}
+
+
+def test_validators_round_trip_as_json():
+    cache = FeedValidatorCache()
+    validators = {"etag": '"v2"', "last_modified": None}
+
+    assert json.loads(cache._encode(validators)) == validators
+    assert cache._decode(cache._encode(validators)) == validators
+
+
+def test_response_without_validators_is_not_recorded():
+    cache = FeedValidatorCache()
+
+    cache.record(FEED_URL, make_response({}))
+
+    assert cache._pending == {}
+
+
+def test_validators_apply_only_once_saved():
+    cache = FeedValidatorCache()
+
+    cache.record(FEED_URL, make_response({"Last-Modified": "yesterday"}))
+    assert cache.get_request_headers(FEED_URL) == {}
+
+    cache.save()
+    assert cache.get_request_headers(FEED_URL) == {"If-Modified-Since": "yesterday"}
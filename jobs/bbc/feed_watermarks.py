@@ -0,0 +1,30 @@
+"""Per-feed high-water marks for incremental feed parsing."""
+
+from datetime import datetime
+
+from jobs.bbc.feed_state import FeedStateStore
+
+
+class FeedWatermarks(FeedStateStore):
+    """Stores the newest pubDate processed per feed so later runs can stop reading early."""
+
+    CACHE_KEY = "feed_watermarks"
+    STATE_NAME = "watermarks"
+
+    def _encode(self, value: datetime) -> str:
+        return value.isoformat()
+
+    def _decode(self, raw: str) -> datetime:
+        return datetime.fromisoformat(raw)
+
+    def record(self, url: str, newest: datetime) -> None:
+        """
+        Records the newest pubDate of a processed feed, it is persisted on save.
+
+        :param url: Url of the feed.
+        :param newest: Newest pubDate read from the feed in this run.
+        """
+        current = self._pending.get(url) or self._values.get(url)
+        if current and current >= newest:
+            return
+        self._stage(url, newest)
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from jobs.bbc.feed_watermarks import FeedWatermarks
+
+
+FEED_URL = "https://feeds.bbci.co.uk/news/rss.xml"
+
+
+def test_watermarks_round_trip_as_iso_dates():
+    watermarks = FeedWatermarks()
+
+    assert watermarks._decode("2025-08-26T12:38:21") == datetime(
+        2025, 8, 26, 12, 38, 21
+    )
+    assert (
+        watermarks._encode(datetime(2025, 8, 26, 12, 38, 21)) == "2025-08-26T12:38:21"
+    )
+
+
+def test_record_only_moves_forward():
+    watermarks = FeedWatermarks()
+    watermarks.record(FEED_URL, datetime(2025, 8, 26, 12, 0, 0))
+    watermarks.save()
+
+    watermarks.record(FEED_URL, datetime(2025, 8, 26, 11, 0, 0))
+    assert watermarks._pending == {}
+
+    watermarks.record(FEED_URL, datetime(2025, 8, 26, 13, 0, 0))
+    watermarks.save()
+
+    assert watermarks.get(FEED_URL) == datetime(2025, 8, 26, 13, 0, 0)
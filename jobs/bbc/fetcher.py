@@ -0,0 +1,116 @@
+"""Concurrent fetch engine for the BBC scraper."""
+
+import threading
+import requests
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from helpers.http_client import HttpClient, get_http_client
+from helpers.rate_limiter import RateLimiter
+from logger.logging_config import logger
+
+
+class FeedFetcher:
+    """Fetches pages and feeds in parallel with per-host concurrency and rate limits."""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        per_host_concurrency: int = 4,
+        per_host_interval: float = 0.2,
+        timeout: int = 10,
+        client: HttpClient | None = None,
+    ):
+        """
+        Initialize a Feed Fetcher.
+
+        :param max_workers: Maximum number of requests in flight across all hosts.
+        :param per_host_concurrency: Maximum number of requests in flight per host.
+        :param per_host_interval: Minimum seconds between two requests to the same host.
+        :param timeout: Timeout in seconds for every request.
+        :param client: Http client to send requests with, defaults to the shared
+            "bbc" client sized for the per host concurrency and timeout.
+        """
+        if max_workers < 1 or per_host_concurrency < 1:
+            raise ValueError("Concurrency limits must be greater than zero.")
+
+        self._max_workers = max_workers
+        self._per_host_concurrency = per_host_concurrency
+        self._per_host_interval = per_host_interval
+        self._timeout = timeout
+        # fetchers with the same limits share a client, and its kept alive connections
+        self._client = client or get_http_client(
+            f"bbc:{per_host_concurrency}:{timeout}",
+            pool_maxsize=per_host_concurrency,
+            timeout=timeout,
+        )
+
+        self._hosts: dict[str, tuple[threading.Semaphore, RateLimiter]] = {}
+        self._hosts_lock = threading.Lock()
+
+    def _get_host_limits(self, url: str) -> tuple[threading.Semaphore, RateLimiter]:
+        """
+        Returns the semaphore and rate limiter shared by every request to the url's host.
+
+        :param url: Url whose host limits are requested.
+        """
+        host = urlparse(url).netloc.lower()
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    threading.Semaphore(self._per_host_concurrency),
+                    RateLimiter(self._per_host_interval),
+                )
+            return self._hosts[host]
+
+    def fetch(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> requests.Response | None:
+        """
+        Fetches a single url honoring the limits of its host.
+
+        :param url: Url to fetch.
+        :param headers: Extra request headers, e.g. conditional GET validators.
+        :return: The response (which may be a 304), or None if the request failed.
+        """
+        semaphore, limiter = self._get_host_limits(url)
+        with semaphore:
+            limiter.acquire()
+            try:
+                response = self._client.get(
+                    url, headers=headers or {}, timeout=self._timeout
+                )
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logger.warning(f"Failed to fetch {url}: {e}")
+                return None
+
+        return response
+
+    def fetch_all(
+        self,
+        urls: Iterable[str],
+        headers_for: Callable[[str], dict[str, str]] | None = None,
+    ) -> Iterator[tuple[str, requests.Response | None]]:
+        """
+        Fetches every url concurrently, yielding results in input order.
+
+        Results are yielded as soon as they are available, so callers can parse
+        early responses while the remaining requests are still in flight.
+
+        :param urls: Urls to fetch.
+        :param headers_for: Function returning the extra headers for a given url (optional).
+        """
+        urls = list(urls)
+        if not urls:
+            return
+
+        def fetch_one(url: str) -> requests.Response | None:
+            return self.fetch(url, headers_for(url) if headers_for else None)
+
+        workers = min(self._max_workers, len(urls))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="feed-fetcher"
+        ) as executor:
+            yield from zip(urls, executor.map(fetch_one, urls))
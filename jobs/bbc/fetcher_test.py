@@ -0,0 +1,92 @@
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+
+from jobs.bbc.fetcher import FeedFetcher
+
+
+def make_response(text):
+    response = MagicMock()
+    response.text = text
+    response.raise_for_status = lambda: None
+    return response
+
+
+@patch("helpers.http_client.HttpClient.get")
+def test_fetch_all_preserves_input_order(mock_get):
+    def fake_get(url, headers, timeout):
+        # later urls answer first
+        time.sleep(0.05 if url.endswith("/1") else 0)
+        return make_response(url)
+
+    mock_get.side_effect = fake_get
+    urls = [f"https://host{i}.example/{i}" for i in range(1, 5)]
+
+    fetcher = FeedFetcher(max_workers=4, per_host_interval=0)
+    results = list(fetcher.fetch_all(urls))
+
+    assert [url for url, _ in results] == urls
+    assert [response.text for _, response in results] == urls
+
+
+@patch("helpers.http_client.HttpClient.get")
+def test_fetch_returns_none_on_request_error(mock_get):
+    mock_get.side_effect = requests.RequestException("boom")
+
+    fetcher = FeedFetcher(per_host_interval=0)
+    results = list(fetcher.fetch_all(["https://feeds.example/rss.xml"]))
+
+    assert results == [("https://feeds.example/rss.xml", None)]
+
+
+@patch("helpers.http_client.HttpClient.get")
+def test_fetch_all_respects_per_host_concurrency(mock_get):
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def fake_get(url, headers, timeout):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return make_response(url)
+
+    mock_get.side_effect = fake_get
+    urls = [f"https://feeds.example/{i}/rss.xml" for i in range(8)]
+
+    fetcher = FeedFetcher(max_workers=8, per_host_concurrency=2, per_host_interval=0)
+    list(fetcher.fetch_all(urls))
+
+    assert max_in_flight <= 2
+    assert mock_get.call_count == 8
+
+
+@patch("helpers.http_client.HttpClient.get")
+def test_fetch_all_sends_headers_per_url(mock_get):
+    mock_get.return_value = make_response("")
+    fetcher = FeedFetcher(per_host_interval=0)
+
+    list(
+        fetcher.fetch_all(
+            ["https://feeds.example/rss.xml"],
+            headers_for=lambda url: {"If-None-Match": '"abc"'},
+        )
+    )
+
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+
+def test_fetch_all_empty_list():
+    fetcher = FeedFetcher()
+    assert list(fetcher.fetch_all([])) == []
+
+
+def test_invalid_limits_raise():
+    with pytest.raises(ValueError):
+        FeedFetcher(max_workers=0)
@@ -0,0 +1,101 @@
+"""Cross-run index of already ingested articles."""
+
+import hashlib
+from datetime import datetime, timedelta
+
+from cache.redis import RedisService
+from logger.logging_config import logger
+
+
+class ArticleFingerprintIndex:
+    """
+    Remembers the (url, headline) pairs already written and queued.
+
+    Fingerprints live in one Redis set per day, so the index never grows past
+    the retention window and lookups only check the most recent buckets.
+    """
+
+    CACHE_KEY = "ingested_articles"
+
+    def __init__(self, redis_service: RedisService, retention_days: int = 2):
+        """
+        Initialize the fingerprint index.
+
+        :param redis_service: Redis service storing the fingerprints.
+        :param retention_days: Number of daily buckets checked and kept, must cover
+            the feeds' freshness window.
+        """
+        if retention_days < 1:
+            raise ValueError("retention_days must be greater than zero.")
+
+        self._redis_service = redis_service
+        self._retention_days = retention_days
+
+    @staticmethod
+    def fingerprint(url: str, headline: str) -> str:
+        """
+        Builds the fingerprint of an article.
+
+        :param url: Url of the article.
+        :param headline: Headline of the article.
+        """
+        return hashlib.blake2b(
+            f"{url}\n{headline}".encode(), digest_size=16
+        ).hexdigest()
+
+    def _get_bucket_key(self, day: datetime) -> str:
+        """
+        Get the redis key of a daily bucket.
+
+        :param day: Day of the bucket.
+        """
+        return self._redis_service.get_dated_key(self.CACHE_KEY, day)
+
+    def find_known(self, articles: list[tuple[str, str]]) -> set[tuple[str, str]]:
+        """
+        Returns the articles that were already ingested by a previous run.
+
+        Lookup errors are logged and treated as a miss, the data base unique
+        index still rejects duplicates in that case.
+
+        :param articles: (url, headline) pairs to check.
+        """
+        if not articles:
+            return set()
+
+        fingerprints = [self.fingerprint(url, headline) for url, headline in articles]
+        found = [False] * len(articles)
+        today = datetime.now()
+
+        try:
+            for offset in range(self._retention_days):
+                bucket = self._get_bucket_key(today - timedelta(days=offset))
+                in_bucket = self._redis_service.are_members(bucket, fingerprints)
+                found = [a or b for a, b in zip(found, in_bucket)]
+        except Exception as e:
+            logger.warning(
+                "Failed to check article fingerprints.", extra={"error": str(e)}
+            )
+            return set()
+
+        return {article for article, known in zip(articles, found) if known}
+
+    def add(self, articles: list[tuple[str, str]]) -> None:
+        """
+        Adds ingested articles to today's bucket.
+
+        :param articles: (url, headline) pairs that were written and queued.
+        """
+        if not articles:
+            return
+
+        try:
+            self._redis_service.add_to_set(
+                self._get_bucket_key(datetime.now()),
+                [self.fingerprint(url, headline) for url, headline in articles],
+                expire_seconds=self._retention_days * 86400,
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to store article fingerprints.", extra={"error": str(e)}
+            )
@@ -0,0 +1,73 @@
+import pytest
+from unittest.mock import MagicMock
+
+from jobs.bbc.fingerprints import ArticleFingerprintIndex
+
+
+ARTICLE_1 = ("https://bbc.co.uk/news/article-1", "Headline 1")
+ARTICLE_2 = ("https://bbc.co.uk/news/article-2", "Headline 2")
+
+
+def make_redis():
+    redis_service = MagicMock()
+    redis_service.get_dated_key.side_effect = lambda key, day: (
+        f"news_tracker:{key}:{day.strftime('%Y-%m-%d')}"
+    )
+    return redis_service
+
+
+def test_fingerprint_is_stable_and_distinguishes_headlines():
+    url = ARTICLE_1[0]
+    assert ArticleFingerprintIndex.fingerprint(
+        url, "A"
+    ) == ArticleFingerprintIndex.fingerprint(url, "A")
+    assert ArticleFingerprintIndex.fingerprint(
+        url, "A"
+    ) != ArticleFingerprintIndex.fingerprint(url, "B")
+
+
+def test_find_known_checks_every_retained_bucket():
+    redis_service = make_redis()
+    # article 1 found in today's bucket, article 2 in yesterday's
+    redis_service.are_members.side_effect = [[True, False], [False, True]]
+    index = ArticleFingerprintIndex(redis_service, retention_days=2)
+
+    known = index.find_known([ARTICLE_1, ARTICLE_2])
+
+    assert known == {ARTICLE_1, ARTICLE_2}
+    assert redis_service.are_members.call_count == 2
+    buckets = {call.args[0] for call in redis_service.are_members.call_args_list}
+    assert len(buckets) == 2
+
+
+def test_find_known_treats_errors_as_miss():
+    redis_service = make_redis()
+    redis_service.are_members.side_effect = Exception("redis down")
+    index = ArticleFingerprintIndex(redis_service)
+
+    assert index.find_known([ARTICLE_1]) == set()
+
+
+def test_find_known_empty_list_skips_redis():
+    redis_service = make_redis()
+    index = ArticleFingerprintIndex(redis_service)
+
+    assert index.find_known([]) == set()
+    redis_service.are_members.assert_not_called()
+
+
+def test_add_stores_fingerprints_in_todays_bucket():
+    redis_service = make_redis()
+    index = ArticleFingerprintIndex(redis_service, retention_days=3)
+
+    index.add([ARTICLE_1])
+
+    key, members = redis_service.add_to_set.call_args.args
+    assert key.startswith("news_tracker:ingested_articles:")
+    assert members == [ArticleFingerprintIndex.fingerprint(*ARTICLE_1)]
+    assert redis_service.add_to_set.call_args.kwargs["expire_seconds"] == 3 * 86400
+
+
+def test_invalid_retention_raises():
+    with pytest.raises(ValueError):
+        ArticleFingerprintIndex(MagicMock(), retention_days=0)
@@ -4,6 +4,10 @@ from jobs.bbc.scraper import run_scraping_job
 
 
 def lambda_handler(event, context):
-    run_scraping_job()
+    # {"refresh_feeds": true} in the event forces feed rediscovery
+    force_feed_refresh = bool(event and event.get("refresh_feeds"))
+    # {"streaming": true} runs the asyncio pipeline
+    streaming = bool(event and event.get("streaming"))
+    run_scraping_job(force_feed_refresh=force_feed_refresh, streaming=streaming)
 
     return {"statusCode": 200, "message": "Script run successfully"}
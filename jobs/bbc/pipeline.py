@@ -0,0 +1,163 @@
+"""Asyncio streaming pipeline for the BBC scraper."""
+
+import asyncio
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from aws_handler.sqs import AwsHelper
+from database.models import News
+from helpers.database_helper import DataBaseHelper
+from logger.logging_config import logger
+
+if TYPE_CHECKING:
+    from jobs.bbc.scraper import Scraper
+
+
+class ScrapingPipeline:
+    """
+    Streams scraped articles through bounded queues.
+
+    Feeds are read one at a time, their articles are written to the data base in
+    micro-batches and every written batch is sent to sqs right away, so the worker
+    starts on the first feed instead of waiting for the whole scrape. Bounded queues
+    keep a slow data base or queue from piling up parsed articles in memory.
+    """
+
+    def __init__(
+        self,
+        scraper: "Scraper",
+        aws_helper: AwsHelper,
+        session_factory: Callable,
+        transform_function: Callable | None = None,
+        batch_size: int = 25,
+        queue_size: int = 100,
+    ):
+        """
+        Initialize a Scraping Pipeline.
+
+        :param scraper: Scraper whose feeds are streamed, feeds must not be processed yet.
+        :param aws_helper: Helper used to publish to sqs.
+        :param session_factory: Function to create a data base session.
+        :param transform_function: Function building the sqs message of a stored row.
+        :param batch_size: Maximum number of articles per data base write.
+        :param queue_size: Maximum number of items waiting between two stages.
+        """
+        if batch_size < 1 or queue_size < 1:
+            raise ValueError("batch_size and queue_size must be greater than zero.")
+
+        self._scraper = scraper
+        self._aws_helper = aws_helper
+        self._session_factory = session_factory
+        self._transform_function = transform_function
+        self._batch_size = batch_size
+        self._queue_size = queue_size
+
+        self._published: list[dict] = []
+        self._failed = False
+
+    async def run(self) -> int:
+        """
+        Runs every stage concurrently until the feeds are exhausted.
+
+        Feed state is saved only if every batch was stored and queued, otherwise only
+        the articles that reached the queue are remembered.
+
+        :return: Number of articles sent to the queue.
+        """
+        articles: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._read(articles))
+            group.create_task(self._write(articles, batches))
+            group.create_task(self._publish(batches))
+
+        if self._failed:
+            logger.error(
+                "Some headlines were not stored or queued, feed state not saved."
+            )
+            self._scraper.remember_ingested(self._published)
+        else:
+            if not self._published:
+                logger.info("No new headlines found.")
+            self._scraper.save_feed_state()
+
+        logger.info(f"Headlines queued: {len(self._published)}")
+        return len(self._published)
+
+    async def _read(self, articles: asyncio.Queue) -> None:
+        """
+        Reads the feeds, putting every new article on the queue.
+
+        Feeds are advanced one at a time in a worker thread, the fetcher keeps
+        downloading the next ones in the background meanwhile.
+
+        :param articles: Queue of parsed articles, None marks the end.
+        """
+        feeds = self._scraper.iter_news()
+        while (news := await asyncio.to_thread(next, feeds, None)) is not None:
+            for article in news:
+                await articles.put(article)
+
+        await articles.put(None)
+
+    async def _write(self, articles: asyncio.Queue, batches: asyncio.Queue) -> None:
+        """
+        Writes the queued articles in micro-batches of whatever is waiting, up to batch_size.
+
+        :param articles: Queue of parsed articles, None marks the end.
+        :param batches: Queue of (articles, written rows) pairs, None marks the end.
+        """
+        done = False
+        while not done:
+            batch = [await articles.get()]
+            while len(batch) < self._batch_size and not articles.empty():
+                batch.append(articles.get_nowait())
+
+            if batch[-1] is None:
+                batch.pop()
+                done = True
+            if not batch:
+                continue
+
+            try:
+                # If duplicate is found the function will not update.
+                rows = await asyncio.to_thread(
+                    DataBaseHelper.write_batch_of_objects_and_return,
+                    News,
+                    self._session_factory,
+                    batch,
+                    logger,
+                    [News.id, News.headline, News.url],
+                    ["url", "headline"],
+                )
+            except Exception as e:
+                logger.exception("Failed to write messages to db", extra={"error": e})
+                self._failed = True
+                continue
+
+            await batches.put((batch, rows))
+
+        await batches.put(None)
+
+    async def _publish(self, batches: asyncio.Queue) -> None:
+        """
+        Sends every written batch to the main queue.
+
+        :param batches: Queue of (articles, written rows) pairs, None marks the end.
+        """
+        while (written := await batches.get()) is not None:
+            batch, rows = written
+            try:
+                await asyncio.to_thread(
+                    self._aws_helper.send_batch,
+                    rows,
+                    "headlines",
+                    transform_function=self._transform_function,
+                )
+            except Exception as e:
+                logger.exception("Failed to send headlines to sqs", extra={"error": e})
+                self._failed = True
+                continue
+
+            self._published.extend(batch)
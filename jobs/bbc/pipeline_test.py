@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from jobs.bbc.pipeline import ScrapingPipeline
+
+
+def make_news(count, start=0):
+    return [
+        {"url": f"https://bbc.co.uk/news/{i}", "headline": f"Headline {i}"}
+        for i in range(start, start + count)
+    ]
+
+
+def make_scraper(feeds):
+    scraper = MagicMock()
+    scraper.iter_news.return_value = iter(feeds)
+    return scraper
+
+
+def echo_rows(object_type, session_factory, batch, *args):
+    return [{"id": i, **news} for i, news in enumerate(batch)]
+
+
+@patch("jobs.bbc.pipeline.DataBaseHelper.write_batch_of_objects_and_return")
+def test_run_writes_and_sends_micro_batches(mock_write):
+    mock_write.side_effect = echo_rows
+    feeds = [make_news(3), make_news(2, start=3)]
+    scraper = make_scraper(feeds)
+    aws_helper = MagicMock()
+
+    pipeline = ScrapingPipeline(scraper, aws_helper, MagicMock(), batch_size=2)
+    queued = asyncio.run(pipeline.run())
+
+    assert queued == 5
+    written = [call.args[2] for call in mock_write.call_args_list]
+    assert all(len(batch) <= 2 for batch in written)
+    assert [news for batch in written for news in batch] == feeds[0] + feeds[1]
+    assert aws_helper.send_batch.call_count == len(written)
+    scraper.save_feed_state.assert_called_once()
+    scraper.remember_ingested.assert_not_called()
+
+
+@patch("jobs.bbc.pipeline.DataBaseHelper.write_batch_of_objects_and_return")
+def test_run_without_news_still_saves_feed_state(mock_write):
+    scraper = make_scraper([])
+    aws_helper = MagicMock()
+
+    queued = asyncio.run(ScrapingPipeline(scraper, aws_helper, MagicMock()).run())
+
+    assert queued == 0
+    mock_write.assert_not_called()
+    aws_helper.send_batch.assert_not_called()
+    scraper.save_feed_state.assert_called_once()
+
+
+@patch("jobs.bbc.pipeline.DataBaseHelper.write_batch_of_objects_and_return")
+def test_run_failed_write_only_remembers_published_articles(mock_write):
+    first, second = make_news(2), make_news(2, start=2)
+    mock_write.side_effect = [echo_rows(None, None, first), Exception("db down")]
+    scraper = make_scraper([first, second])
+    aws_helper = MagicMock()
+
+    pipeline = ScrapingPipeline(scraper, aws_helper, MagicMock(), batch_size=2)
+    queued = asyncio.run(pipeline.run())
+
+    assert queued == 2
+    aws_helper.send_batch.assert_called_once()
+    scraper.save_feed_state.assert_not_called()
+    scraper.remember_ingested.assert_called_once_with(first)
+
+
+@patch("jobs.bbc.pipeline.DataBaseHelper.write_batch_of_objects_and_return")
+def test_run_failed_send_does_not_remember_batch(mock_write):
+    mock_write.side_effect = echo_rows
+    scraper = make_scraper([make_news(2)])
+    aws_helper = MagicMock()
+    aws_helper.send_batch.side_effect = Exception("sqs down")
+
+    queued = asyncio.run(ScrapingPipeline(scraper, aws_helper, MagicMock()).run())
+
+    assert queued == 0
+    scraper.save_feed_state.assert_not_called()
+    scraper.remember_ingested.assert_called_once_with([])
+
+
+def test_invalid_sizes_raise():
+    with pytest.raises(ValueError):
+        ScrapingPipeline(MagicMock(), MagicMock(), MagicMock(), batch_size=0)
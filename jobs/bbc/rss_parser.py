@@ -0,0 +1,164 @@
+"""Streaming rss parser built on lxml's iterparse."""
+
+import re
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from io import BytesIO
+from lxml import etree
+
+from exceptions.feed import FeedParseError
+from logger.logging_config import logger
+
+
+IMAGE_URL_RE = re.compile(
+    r"https?://[^\s'\"<>]+?\.(?:jpg|jpeg|png|gif|webp)(?:\?[^\s'\"<>]*)?",
+    re.IGNORECASE,
+)
+
+
+def parse_date(date_string: str) -> datetime:
+    if not date_string or date_string == "":
+        return None
+
+    try:
+        parsed_date = datetime.strptime(date_string, "%a, %d %b %Y %H:%M:%S %Z")
+    except ValueError as e:
+        logger.error(f"Failed to parse date for {date_string}: {e}")
+        return None
+
+    return parsed_date
+
+
+def _local_name(name) -> str:
+    """
+    Returns the lower cased local name of a tag or attribute.
+
+    Handles both resolved namespaces ({uri}thumbnail) and the undeclared
+    prefixes kept verbatim by the recovering parser (media:thumbnail).
+    Comments and processing instructions have no name and return "".
+    """
+    if not isinstance(name, str):
+        return ""
+    return name.rsplit("}", 1)[-1].rsplit(":", 1)[-1].lower()
+
+
+def _child_text(element, name: str) -> str | None:
+    """
+    Returns the stripped text of the first direct child with the given local name.
+
+    :param element: Parent element.
+    :param name: Lower cased local name of the child.
+    """
+    for child in element:
+        if _local_name(child.tag) == name:
+            return (child.text or "").strip()
+    return None
+
+
+def extract_thumbnail(item) -> str | None:
+    """Extract the thumbnail URL from an RSS <item> element.
+
+    Fast-path: handle tags like
+      <media:thumbnail width="240" height="134" url="https://...jpg"/>
+
+    The function checks for namespaced 'thumbnail' tags, reading their
+    'url' attribute (namespaced or not). Falls back to the first image url
+    found in any attribute or text of the item.
+    """
+    for element in item.iter():
+        if _local_name(element.tag) != "thumbnail":
+            continue
+        for key, value in element.attrib.items():
+            if _local_name(key) in ("url", "href", "src") and value.strip():
+                return value.strip()
+
+    for element in item.iter():
+        if not isinstance(element.tag, str):
+            continue
+        for value in (*element.attrib.values(), element.text):
+            if not value:
+                continue
+            match = IMAGE_URL_RE.search(value)
+            if match:
+                return match.group(0)
+
+    return None
+
+
+def iter_feed_items(
+    content: bytes,
+    published_after: datetime | None = None,
+    high_water_mark: datetime | None = None,
+    stop_after: int | None = None,
+    slack: timedelta = timedelta(0),
+    min_items: int = 0,
+) -> Iterator[dict]:
+    """
+    Streams the items of an rss feed as dicts, without building the whole document tree.
+
+    Each item's pubDate is checked before any other field is read, so items
+    outside the window are dropped without being materialized. Items without
+    a valid pubDate are skipped, they can not be stored.
+
+    The high-water mark never drops an item, feeds are ordered by editors and an
+    item added since the last run may carry an older pubDate. It only ends the
+    read early once enough consecutive items fall below it, duplicates are left
+    to the fingerprint index.
+
+    :param content: Raw feed body.
+    :param published_after: Drop items published before this date (optional).
+    :param high_water_mark: Newest pubDate seen for this feed on a previous run (optional).
+    :param stop_after: Stop reading the feed after this many consecutive items
+        published before the high-water mark minus the slack (optional).
+    :param slack: Margin below the high-water mark before an item counts towards stop_after.
+    :param min_items: Number of items always read before the feed may be stopped.
+    :raises FeedParseError: If the feed is not valid xml, after the items read so far.
+    """
+    context = etree.iterparse(
+        BytesIO(content),
+        events=("end",),
+        tag="{*}item",
+        recover=True,
+        resolve_entities=False,
+        no_network=True,
+    )
+
+    stop_below = high_water_mark - slack if high_water_mark and stop_after else None
+    read = 0
+    consecutive_old = 0
+    try:
+        for _, item in context:
+            try:
+                published_at = parse_date(_child_text(item, "pubdate"))
+                if published_at is None:
+                    logger.debug("Skipping rss item without a valid pubDate.")
+                    continue
+
+                read += 1
+                if stop_below and published_at <= stop_below:
+                    consecutive_old += 1
+                    if consecutive_old >= stop_after and read >= min_items:
+                        logger.debug(
+                            f"Stopped reading feed after {consecutive_old} consecutive old items."
+                        )
+                        return
+                else:
+                    consecutive_old = 0
+
+                if published_after and published_at < published_after:
+                    continue
+
+                yield {
+                    "headline": _child_text(item, "title") or "",
+                    "url": _child_text(item, "link") or "",
+                    "summary": _child_text(item, "description") or "",
+                    "published_at": published_at,
+                    "thumbnail": extract_thumbnail(item),
+                }
+            finally:
+                # free the processed item and every already processed sibling
+                item.clear(keep_tail=True)
+                while item.getprevious() is not None:
+                    del item.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        raise FeedParseError(f"Failed to parse rss feed: {e}") from e
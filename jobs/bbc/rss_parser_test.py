@@ -0,0 +1,215 @@
+import pytest
+from datetime import datetime, timedelta
+from lxml import etree
+
+from exceptions.feed import FeedParseError
+from jobs.bbc.rss_parser import parse_date, extract_thumbnail, iter_feed_items
+
+
+def make_item(item_xml):
+    return etree.fromstring(item_xml, parser=etree.XMLParser(recover=True))
+
+
+def rss_date(value: datetime) -> str:
+    return value.strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+
+@pytest.mark.parametrize(
+    "date_str, expected",
+    [
+        ("Tue, 26 Aug 2025 12:38:21 GMT", datetime(2025, 8, 26, 12, 38, 21)),
+        ("Wed, 01 Jan 2020 00:00:01 GMT", datetime(2020, 1, 1, 0, 0, 1)),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_date(date_str, expected):
+    result = parse_date(date_str)
+    assert (result == expected) or (result is None and expected is None)
+
+
+def test_extract_thumbnail_media_thumbnail():
+    item = make_item(
+        """
+    <item>
+      <title>With Thumb</title>
+      <link>https://bbc.co.uk/news/article-1</link>
+      <media:thumbnail width="240" height="134" url="https://ichef.bbci.co.uk/ace/standard/240/cpsprodpb/sample.jpg"/>
+    </item>
+    """
+    )
+    thumb = extract_thumbnail(item)
+    assert thumb == "https://ichef.bbci.co.uk/ace/standard/240/cpsprodpb/sample.jpg"
+
+
+def test_extract_thumbnail_declared_namespace():
+    item = make_item(
+        '<item xmlns:media="http://search.yahoo.com/mrss/">'
+        '<media:thumbnail url="https://example.com/ns.jpg"/></item>'
+    )
+    assert extract_thumbnail(item) == "https://example.com/ns.jpg"
+
+
+def test_extract_thumbnail_fallback():
+    # No thumbnail tag, but an image url appears somewhere in the item
+    item = make_item(
+        '<item><title>X</title><description><img url="https://example.com/img.jpg" /></description></item>'
+    )
+    assert extract_thumbnail(item) == "https://example.com/img.jpg"
+
+
+def test_extract_thumbnail_malformed_returns_none():
+    # Thumbnail tag present but no url attribute -> should return None
+    item = make_item('<item><media:thumbnail width="240" height="134" /></item>')
+    assert extract_thumbnail(item) is None
+
+
+def test_iter_feed_items_yields_item_dicts():
+    now = datetime.now().replace(microsecond=0)
+    content = f"""
+    <rss>
+      <channel>
+        <item>
+          <title> Headline 1 </title>
+          <link>https://bbc.co.uk/news/article-1</link>
+          <pubDate>{rss_date(now)}</pubDate>
+          <description>Summary 1</description>
+          <media:thumbnail url="https://example.com/1.jpg"/>
+        </item>
+      </channel>
+    </rss>
+    """.encode()
+
+    items = list(iter_feed_items(content))
+
+    assert items == [
+        {
+            "headline": "Headline 1",
+            "url": "https://bbc.co.uk/news/article-1",
+            "summary": "Summary 1",
+            "published_at": now,
+            "thumbnail": "https://example.com/1.jpg",
+        }
+    ]
+
+
+def test_iter_feed_items_drops_old_and_undated_items():
+    now = datetime.now()
+    content = f"""
+    <rss><channel>
+      <item><title>New</title><pubDate>{rss_date(now)}</pubDate></item>
+      <item><title>Old</title><pubDate>{rss_date(now - timedelta(hours=9))}</pubDate></item>
+      <item><title>Undated</title></item>
+      <item><title>Bad date</title><pubDate>yesterday</pubDate></item>
+    </channel></rss>
+    """.encode()
+
+    items = list(iter_feed_items(content, published_after=now - timedelta(hours=8)))
+
+    assert [item["headline"] for item in items] == ["New"]
+
+
+def test_iter_feed_items_malformed_feed_raises():
+    with pytest.raises(FeedParseError):
+        list(iter_feed_items(b""))
+
+
+def test_iter_feed_items_keeps_items_at_or_before_high_water_mark():
+    now = datetime.now().replace(microsecond=0)
+    content = f"""
+    <rss><channel>
+      <item><title>Newer</title><pubDate>{rss_date(now)}</pubDate></item>
+      <item><title>Seen</title><pubDate>{rss_date(now - timedelta(hours=1))}</pubDate></item>
+      <item><title>Late newer</title><pubDate>{rss_date(now - timedelta(minutes=1))}</pubDate></item>
+    </channel></rss>
+    """.encode()
+
+    items = list(iter_feed_items(content, high_water_mark=now - timedelta(hours=1)))
+
+    assert [item["headline"] for item in items] == ["Newer", "Seen", "Late newer"]
+
+
+def test_iter_feed_items_stops_after_consecutive_old_items():
+    now = datetime.now().replace(microsecond=0)
+    mark = now - timedelta(hours=1)
+    old = rss_date(mark - timedelta(minutes=5))
+    content = f"""
+    <rss><channel>
+      <item><title>New</title><pubDate>{rss_date(now)}</pubDate></item>
+      <item><title>Old 1</title><pubDate>{old}</pubDate></item>
+      <item><title>Old 2</title><pubDate>{old}</pubDate></item>
+      <item><title>Never read</title><pubDate>{rss_date(now)}</pubDate></item>
+    </channel></rss>
+    """.encode()
+
+    items = list(iter_feed_items(content, high_water_mark=mark, stop_after=2))
+
+    assert [item["headline"] for item in items] == ["New", "Old 1"]
+
+
+def test_iter_feed_items_only_counts_items_beyond_the_slack():
+    now = datetime.now().replace(microsecond=0)
+    mark = now - timedelta(hours=1)
+    recent = rss_date(mark - timedelta(minutes=5))
+    content = f"""
+    <rss><channel>
+      <item><title>Old 1</title><pubDate>{recent}</pubDate></item>
+      <item><title>Old 2</title><pubDate>{recent}</pubDate></item>
+      <item><title>New</title><pubDate>{rss_date(now)}</pubDate></item>
+    </channel></rss>
+    """.encode()
+
+    items = list(
+        iter_feed_items(
+            content, high_water_mark=mark, stop_after=2, slack=timedelta(minutes=30)
+        )
+    )
+
+    assert [item["headline"] for item in items] == ["Old 1", "Old 2", "New"]
+
+
+def test_iter_feed_items_reads_min_items_before_stopping():
+    now = datetime.now().replace(microsecond=0)
+    mark = now - timedelta(hours=1)
+    old = rss_date(mark - timedelta(hours=2))
+    stale = "".join(
+        f"<item><title>Stale {i}</title><pubDate>{old}</pubDate></item>"
+        for i in range(5)
+    )
+    content = f"""
+    <rss><channel>
+      <item><title>Fresh 1</title><pubDate>{rss_date(now)}</pubDate></item>
+      {stale}
+      <item><title>Fresh 2</title><pubDate>{rss_date(now)}</pubDate></item>
+    </channel></rss>
+    """.encode()
+
+    items = list(
+        iter_feed_items(
+            content,
+            published_after=now - timedelta(hours=2),
+            high_water_mark=mark,
+            stop_after=5,
+            min_items=20,
+        )
+    )
+
+    assert [item["headline"] for item in items] == ["Fresh 1", "Fresh 2"]
+
+
+def test_iter_feed_items_cutoff_does_not_stop_the_read():
+    now = datetime.now().replace(microsecond=0)
+    old = rss_date(now - timedelta(hours=9))
+    content = f"""
+    <rss><channel>
+      <item><title>Old 1</title><pubDate>{old}</pubDate></item>
+      <item><title>Old 2</title><pubDate>{old}</pubDate></item>
+      <item><title>New</title><pubDate>{rss_date(now)}</pubDate></item>
+    </channel></rss>
+    """.encode()
+
+    items = list(
+        iter_feed_items(content, published_after=now - timedelta(hours=8), stop_after=1)
+    )
+
+    assert [item["headline"] for item in items] == ["New"]
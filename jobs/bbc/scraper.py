@@ -1,29 +1,83 @@
+import asyncio
 import json
-import requests
-import re
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-import time
+from collections.abc import Iterator
 from datetime import datetime, timedelta
+from functools import partial
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from dotenv import load_dotenv
 from os import getenv
 
 from database.models import News
+from exceptions.feed import FeedParseError
 from database.data_base import engine
 from aws_handler.sqs import AwsHelper
+from aws_handler.s3 import S3Handler
+from cache.redis import RedisService
 from helpers.database_helper import DataBaseHelper
+from jobs.bbc.fetcher import FeedFetcher
+from jobs.bbc.feed_registry import FeedRegistry
+from jobs.bbc.feed_validators import FeedValidatorCache
+from jobs.bbc.feed_watermarks import FeedWatermarks
+from jobs.bbc.fingerprints import ArticleFingerprintIndex
+from jobs.bbc.pipeline import ScrapingPipeline
+from jobs.bbc.rss_parser import iter_feed_items
 from logger.logging_config import logger
 
 
 class Scraper:
     """Scraper object to extract bbc news"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        fetcher: FeedFetcher | None = None,
+        validator_cache: FeedValidatorCache | None = None,
+        feed_registry: FeedRegistry | None = None,
+        force_feed_refresh: bool = False,
+        watermarks: FeedWatermarks | None = None,
+        stop_after: int = 5,
+        watermark_slack: timedelta = timedelta(hours=1),
+        min_items: int = 20,
+        fingerprint_index: ArticleFingerprintIndex | None = None,
+    ):
+        """
+        Initialize the Scraper and load the available rss feeds.
+
+        :param fetcher: Fetch engine used for pages and feeds, a default one is built if omitted.
+        :param validator_cache: Cache of ETag / Last-Modified validators to make feed
+            requests conditional (optional).
+        :param feed_registry: Registry of previously discovered feeds (optional),
+            feeds are discovered by crawling the navbar pages when omitted.
+        :param force_feed_refresh: Ignore the registry and discover the feeds again.
+        :param watermarks: Per-feed high-water marks, enables incremental parsing (optional).
+        :param stop_after: In incremental mode, stop reading a feed after this many
+            consecutive items older than its high-water mark minus watermark_slack.
+        :param watermark_slack: Margin below the high-water mark before an item
+            counts towards stop_after.
+        :param min_items: In incremental mode, number of items always read from a feed.
+        :param fingerprint_index: Index of articles ingested by previous runs, known
+            articles are dropped before reaching the data base (optional).
+        """
         self._request_URL = "https://bbc.co.uk/news"
-        self._navbar_links: list[str] = self._extract_navbar_links()
-        self._rss_feeds: list[str] = self._extract_rss_feeds()
+        self._fetcher = fetcher if fetcher else FeedFetcher()
+        self._validator_cache = validator_cache
+        self._watermarks = watermarks
+        self._stop_after = stop_after
+        self._watermark_slack = watermark_slack
+        self._min_items = min_items
+        self._fingerprint_index = fingerprint_index
+
+        self._navbar_links: list[str]
+        self._rss_feeds: list[str]
+        if feed_registry:
+            self._navbar_links, self._rss_feeds = feed_registry.get_feeds(
+                self._discover_feeds, force_refresh=force_feed_refresh
+            )
+        else:
+            self._navbar_links, self._rss_feeds = self._discover_feeds()
+
         self._news: list[dict] = []
         self._headlines: list[str] = []
         # keep thumbnails separate; do not write them to DB at this stage
@@ -44,17 +98,19 @@ class Scraper:
     def get_thumbnails(self) -> dict:
         return self._thumbnails
 
-    def _extract_rss_feeds(self) -> list:
-        if len(self._navbar_links) == 0:
+    def _discover_feeds(self) -> tuple[list[str], list[str]]:
+        """Crawls the homepage and every navbar page to discover the rss feeds."""
+        navbar_links = self._extract_navbar_links()
+        return navbar_links, self._extract_rss_feeds(navbar_links)
+
+    def _extract_rss_feeds(self, navbar_links: list[str]) -> list:
+        if len(navbar_links) == 0:
             return []
 
         rss_links = set()
-        for url in self._navbar_links:
-            try:
-                response = requests.get(url)
-            except requests.RequestException as e:
-                print(f"Failed to fetch {url}: {e}")
-                return []
+        for url, response in self._fetcher.fetch_all(navbar_links):
+            if response is None:
+                continue
 
             soup = BeautifulSoup(response.text, "html.parser")
 
@@ -73,16 +129,11 @@ class Scraper:
                     full_url = urljoin(url, href)
                     rss_links.add(full_url)
 
-            time.sleep(1)
-
         return list(rss_links)
 
     def _extract_navbar_links(self) -> list:
-        try:
-            response = requests.get(self._request_URL, timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            print(f"Failed to fetch {self._request_URL}: {e}")
+        response = self._fetcher.fetch(self._request_URL)
+        if response is None:
             return []
 
         soup = BeautifulSoup(response.text, "html.parser")
@@ -106,73 +157,157 @@ class Scraper:
 
         return list(links)
 
-    def process_feeds(self) -> list:
-        if len(self._rss_feeds) == 0:
-            return
+    def _read_feeds(self) -> Iterator[list[tuple[tuple[str, str], str, dict]]]:
+        """
+        Fetches and parses the rss feeds, yielding the candidate articles of each feed
+        as soon as it is parsed.
+
+        Candidates are (key, news_section, item) tuples unique by their (url, headline)
+        key across feeds. Validators and high-water marks of the successfully parsed
+        feeds are recorded, they are only persisted by save_feed_state.
+        """
+        headers_for = (
+            self._validator_cache.get_request_headers if self._validator_cache else None
+        )
 
-        seen = set()
-        for feed_url in self._rss_feeds:
-            try:
-                response = requests.get(feed_url)
-                response.raise_for_status()
-            except requests.RequestException as e:
-                print(f"Failed to fetch {feed_url} : {e}")
-                return
+        # datetime uses UTC timezone, same timezone as rss feeds
+        cutoff = datetime.now() - timedelta(hours=8)
 
-            soup = BeautifulSoup(response.text, features="xml")
+        seen: set[tuple[str, str]] = set()
+        not_modified = 0
+        for feed_url, response in self._fetcher.fetch_all(
+            self._rss_feeds, headers_for=headers_for
+        ):
+            if response is None:
+                continue
 
-            items = soup.find_all("item")
-            for item in items:
-                published_date = item.find("pubDate")
-                if published_date:
-                    published_date = published_date.get_text().strip()
-                    published_date = parse_date(published_date)
+            # feed unchanged since the last stored run, nothing to parse
+            if response.status_code == 304:
+                not_modified += 1
+                continue
 
-                # datetime uses UTC timezone, same timezone as rss feeds
-                if published_date < datetime.now() - timedelta(hours=8):
-                    continue
+            news_section = extract_section_from_url(feed_url)
+            items = iter_feed_items(
+                response.content,
+                published_after=cutoff,
+                high_water_mark=(
+                    self._watermarks.get(feed_url) if self._watermarks else None
+                ),
+                stop_after=self._stop_after if self._watermarks else None,
+                slack=self._watermark_slack,
+                min_items=self._min_items,
+            )
 
-                news_section = extract_section_from_url(feed_url)
+            candidates = []
+            newest = None
+            try:
+                for item in items:
+                    if not newest or item["published_at"] > newest:
+                        newest = item["published_at"]
+
+                    key = (item["url"], item["headline"])
+                    if key not in seen:
+                        seen.add(key)
+                        candidates.append((key, news_section, item))
+            except FeedParseError as e:
+                # without validators the next run downloads and parses the feed again
+                logger.warning(str(e), extra={"feed_url": feed_url})
+                yield candidates
+                continue
 
-                headline = item.find("title").get_text()
-                url = item.find("link").get_text().strip()
+            if self._validator_cache:
+                self._validator_cache.record(feed_url, response)
+            if self._watermarks and newest:
+                self._watermarks.record(feed_url, newest)
+
+            yield candidates
+
+        if not_modified:
+            logger.info(f"{not_modified} feeds not modified since last run.")
+
+    def _filter_known(self, candidates: list) -> list:
+        """
+        Drops the candidates already ingested by a previous run.
+
+        :param candidates: Candidates yielded by _read_feeds.
+        """
+        if not self._fingerprint_index or not candidates:
+            return candidates
+
+        known = self._fingerprint_index.find_known([key for key, _, _ in candidates])
+        if known:
+            logger.info(f"{len(known)} articles already ingested, skipping.")
+
+        return [candidate for candidate in candidates if candidate[0] not in known]
+
+    def _add_news(self, candidates: list) -> list[dict]:
+        """
+        Collects the candidates as news, returning the news added.
+
+        :param candidates: Candidates yielded by _read_feeds.
+        """
+        added = []
+        for (url, headline), news_section, item in candidates:
+            news = {
+                "headline": headline,
+                "url": url,
+                "news_section": news_section,
+                "published_at": item["published_at"],
+                "summary": item["summary"],
+            }
+            self._headlines.append(headline)
+            # store thumbnail separately (may be None)
+            self._thumbnails[url] = item["thumbnail"]
+            self._news.append(news)
+            added.append(news)
+
+        return added
 
-                summary = item.find("description").get_text().strip()
+    def process_feeds(self) -> list:
+        if len(self._rss_feeds) == 0:
+            return
 
-                # extract thumbnail if present
-                thumbnail = _extract_thumbnail_from_item(item)
+        candidates = [candidate for feed in self._read_feeds() for candidate in feed]
+        self._add_news(self._filter_known(candidates))
 
-                key = (url, headline)
-                if key in seen:
-                    continue
+    def iter_news(self) -> Iterator[list[dict]]:
+        """
+        Streaming variant of process_feeds, yields the new articles of each feed as
+        soon as the feed is parsed.
 
-                seen.add(key)
-                news = {
-                    "headline": headline,
-                    "url": url,
-                    "news_section": news_section,
-                    "published_at": published_date,
-                    "summary": summary,
-                }
-                self._headlines.append(headline)
-                # store thumbnail separately (may be None)
-                self._thumbnails[url] = thumbnail
-                self._news.append(news)
+        Yielded articles are collected like in process_feeds.
+        """
+        if len(self._rss_feeds) == 0:
+            return
 
-            time.sleep(1)
+        for candidates in self._read_feeds():
+            news = self._add_news(self._filter_known(candidates))
+            if news:
+                yield news
 
+    def remember_ingested(self, news: list[dict]) -> None:
+        """
+        Adds stored and queued news to the fingerprint index.
 
-def parse_date(date_string: str) -> datetime:
-    if not date_string or date_string == "":
-        return None
+        :param news: News that reached the queue.
+        """
+        if self._fingerprint_index:
+            self._fingerprint_index.add(
+                [(item["url"], item["headline"]) for item in news]
+            )
 
-    try:
-        parsed_date = datetime.strptime(date_string, "%a, %d %b %Y %H:%M:%S %Z")
-    except ValueError as e:
-        logger.error(f"Failed to parse date for {date_string}: {e}")
-        return None
+    def save_feed_state(self) -> None:
+        """
+        Persists the feed validators, high-water marks and article fingerprints
+        recorded while reading the feeds.
 
-    return parsed_date
+        Call only once every scraped headline is stored and queued.
+        """
+        if self._validator_cache:
+            self._validator_cache.save()
+        if self._watermarks:
+            self._watermarks.save()
+        self.remember_ingested(self._news)
 
 
 def extract_section_from_url(url: str) -> str:
@@ -201,69 +336,79 @@ def extract_section_from_url(url: str) -> str:
     return parts[-2]
 
 
-def _extract_thumbnail_from_item(item) -> str | None:
-    """Extract the thumbnail URL from an RSS <item> element.
+def sqs_payload(item, thumbnails: dict[str, str | None]) -> str:
+    """
+    Builds the sqs message of a stored headline, including its thumbnail.
+
+    :param item: Stored headline row.
+    :param thumbnails: Thumbnails by article url.
+    """
+    try:
+        url = item.get("url") if isinstance(item, dict) else getattr(item, "url", None)
+        thumbnail = thumbnails.get(url)
+    except Exception:
+        thumbnail = None
+    # create a shallow copy and add thumbnail if available
+    payload = dict(item) if isinstance(item, dict) else item.__dict__
+    if thumbnail:
+        payload["thumbnail"] = thumbnail
+    return json.dumps(payload)
 
-    Fast-path: handle tags like
-      <media:thumbnail width="240" height="134" url="https://...jpg"/>
 
-    The function checks for namespaced 'thumbnail' tags then looks for
-    an attribute named 'url' (or ending with ':url'). Falls back to an
-    XML-aware regex that searches for a thumbnail tag with a url attr.
+def publish_headlines(scraper: Scraper, aws_helper: AwsHelper):
     """
+    Writes the scraped headlines to the data base and sends them to the main queue.
 
+    :param scraper: Scraper whose feeds have already been processed.
+    :param aws_helper: Helper used to publish to sqs.
+    """
+    if not scraper.get_news():
+        logger.info("No new headlines found.")
+        scraper.save_feed_state()
+        return
+
+    def session_factory():
+        return Session(engine)
+
+    results = []
     try:
-        # Fast path: find tags named 'media:thumbnail' or any tag ending with ':thumbnail' or 'thumbnail'
-        for tag in item.find_all():
-            name = getattr(tag, "name", "")
-            if not isinstance(name, str):
-                continue
-            lname = name.lower()
-            if "thumbnail" in lname:
-                # Prefer explicit 'url' attribute, but accept namespaced attr keys like 'media:url' too
-                # Check common attribute keys first
-                for key in ("url", "href", "src"):
-                    val = tag.get(key)
-                    if val and isinstance(val, str) and val.strip():
-                        return val.strip()
-
-                # Check any attribute whose local name ends with 'url' (handles namespaced attributes)
-                for k, v in tag.attrs.items():
-                    if (
-                        isinstance(k, str)
-                        and k.lower().endswith(":url")
-                        or (
-                            isinstance(k, str)
-                            and k.lower().endswith("url")
-                            and k.lower() != "url"
-                        )
-                    ):
-                        if isinstance(v, str) and v.strip():
-                            return v.strip()
-
-        # Fallback: first attempt to find a thumbnail tag with a url attribute
-        raw = str(item)
-        m = re.search(
-            r"<[^>]*thumbnail[^>]*\surl\s*=\s*\"([^\"]+)\"", raw, re.IGNORECASE
+        # If duplicate is found the function will not update.
+        results = DataBaseHelper.write_batch_of_objects_and_return(
+            News,
+            session_factory,
+            scraper.get_news(),
+            logger,
+            [News.id, News.headline, News.url],
+            ["url", "headline"],
         )
-        if m:
-            return m.group(1)
+    except Exception as e:
+        logger.exception("Failed to write messages to db", extra={"error": e})
 
-        # If not found, look anywhere in the item for an image URL (jpg/png/etc.)
-        img_re = re.compile(
-            r"https?://[^\s'\"]+?\.(?:jpg|jpeg|png|gif|webp)(?:\?[^\s'\"]*)?",
-            re.IGNORECASE,
-        )
-        m2 = img_re.search(raw)
-        if m2:
-            return m2.group(0)
-    except Exception:
-        logger.debug("Failed to extract thumbnail from item", exc_info=True)
+    if not results:
+        logger.error("Failed to write objects to db.")
+        return
 
-    return None
+    # send to sqs queue — include thumbnail in the SQS payload but don't write it to DB
+    aws_helper.send_batch(
+        results,
+        "headlines",
+        transform_function=partial(sqs_payload, thumbnails=scraper.get_thumbnails()),
+    )
+
+    # headlines are stored and queued, the next run may skip what was read here
+    scraper.save_feed_state()
+    logger.info(f"Thumbnails count: {len(scraper.get_thumbnails())}")
+    logger.info(f"Headlines count: {len(scraper.get_headlines())}")
 
 
-def run_scraping_job():
+def run_scraping_job(force_feed_refresh: bool = False, streaming: bool = False):
+    """
+    Scrapes every bbc rss feed, stores the new headlines and queues them for the worker.
+
+    :param force_feed_refresh: Rediscover the rss feeds instead of using the feed registry.
+    :param streaming: Stream articles through the asyncio pipeline, storing and queueing
+        each feed as soon as it is parsed instead of after the whole scrape.
+    """
     load_dotenv()
 
     try:
@@ -284,58 +429,91 @@ def run_scraping_job():
     # test sqs connection
     try:
         aws_helper = AwsHelper(
-            queue_url=queue_url, fallback_queue_url=fallback_queue_url
+            queue_url=queue_url,
+            fallback_queue_url=fallback_queue_url,
+            max_in_flight=int(getenv("SQS_MAX_IN_FLIGHT", "4")),
+            payload_store=(
+                S3Handler(getenv("S3_BUCKET_NAME"), getenv("CDN_DOMAIN_NAME"))
+                if getenv("S3_BUCKET_NAME")
+                else None
+            ),
         )
         logger.info("SQS Connection Successful!")
     except Exception as e:
         logger.error("SQS Connection Failed!", extra={"error": e})
         return
 
+    redis_service = None
+    redis_host = getenv("REDIS_HOST")
+    if redis_host:
+        redis_service = RedisService(
+            host=redis_host, password=getenv("REDIS_PASSWORD") or None, logger=logger
+        )
+
+    validator_cache = FeedValidatorCache(redis_service)
+    validator_cache.load()
+
+    watermarks = None
+    if getenv("SCRAPER_INCREMENTAL", "false").lower() == "true":
+        watermarks = FeedWatermarks(redis_service)
+        watermarks.load()
+
     # extract headlines
-    scraper = Scraper()
-    scraper.process_feeds()
+    fetcher = FeedFetcher(
+        max_workers=int(getenv("SCRAPER_MAX_WORKERS", "8")),
+        per_host_concurrency=int(getenv("SCRAPER_PER_HOST_CONCURRENCY", "4")),
+        per_host_interval=float(getenv("SCRAPER_PER_HOST_INTERVAL", "0.2")),
+    )
+    feed_registry = FeedRegistry(
+        redis_service,
+        ttl_seconds=int(getenv("FEED_REGISTRY_TTL_SECONDS", "604800")),
+        revalidate_after_seconds=int(
+            getenv("FEED_REGISTRY_REVALIDATE_SECONDS", "86400")
+        ),
+    )
+    force_feed_refresh = (
+        force_feed_refresh or getenv("FORCE_FEED_REFRESH", "").lower() == "true"
+    )
+
+    scraper = Scraper(
+        fetcher=fetcher,
+        validator_cache=validator_cache,
+        feed_registry=feed_registry,
+        force_feed_refresh=force_feed_refresh,
+        watermarks=watermarks,
+        stop_after=int(getenv("SCRAPER_STOP_AFTER", "5")),
+        watermark_slack=timedelta(
+            minutes=int(getenv("SCRAPER_WATERMARK_SLACK_MINUTES", "60"))
+        ),
+        min_items=int(getenv("SCRAPER_MIN_ITEMS", "20")),
+        fingerprint_index=(
+            ArticleFingerprintIndex(redis_service) if redis_service else None
+        ),
+    )
+    streaming = streaming or getenv("SCRAPER_STREAMING", "").lower() == "true"
 
     def session_factory():
         return Session(engine)
 
-    results = []
     try:
-        # If duplicate is found the function will not update.
-        results = DataBaseHelper.write_batch_of_objects_and_return(
-            News,
-            session_factory,
-            scraper.get_news(),
-            logger,
-            [News.id, News.headline, News.url],
-            ["url", "headline"],
-        )
-    except Exception as e:
-        logger.exception("Failed to write messages to db", extra={"error": e})
-
-    if not results:
-        logger.error("Failed to write objects to db.")
-        return
-
-    # send to sqs queue — include thumbnail in the SQS payload but don't write it to DB
-    def sqs_payload(item):
-        try:
-            url = (
-                item.get("url")
-                if isinstance(item, dict)
-                else getattr(item, "url", None)
+        if streaming:
+            pipeline = ScrapingPipeline(
+                scraper,
+                aws_helper,
+                session_factory,
+                transform_function=partial(
+                    sqs_payload, thumbnails=scraper.get_thumbnails()
+                ),
+                batch_size=int(getenv("SCRAPER_BATCH_SIZE", "25")),
+                queue_size=int(getenv("SCRAPER_QUEUE_SIZE", "100")),
             )
-            thumbnail = scraper._thumbnails.get(url)
-        except Exception:
-            thumbnail = None
-        # create a shallow copy and add thumbnail if available
-        payload = dict(item) if isinstance(item, dict) else item.__dict__
-        if thumbnail:
-            payload["thumbnail"] = thumbnail
-        return json.dumps(payload)
-
-    aws_helper.send_batch(results, "headlines", transform_function=sqs_payload)
-    logger.info(f"Thumbnails count: {len(scraper.get_thumbnails())}")
-    logger.info(f"Headlines count: {len(scraper.get_headlines())}")
+            asyncio.run(pipeline.run())
+        else:
+            scraper.process_feeds()
+            publish_headlines(scraper, aws_helper)
+    finally:
+        # lambda freezes once the handler returns, let a background revalidation finish
+        feed_registry.wait_for_revalidation()
 
 
 if __name__ == "__main__":
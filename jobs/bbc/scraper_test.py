@@ -2,27 +2,11 @@ import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, UTC
 
-from jobs.bbc.scraper import Scraper, parse_date, extract_section_from_url
-from jobs.bbc.scraper import _extract_thumbnail_from_item
-from bs4 import BeautifulSoup
+from jobs.bbc.scraper import Scraper, extract_section_from_url
 
 # ------------ UNIT TESTS FOR UTILITY FUNCTIONS ------------
 
 
-@pytest.mark.parametrize(
-    "date_str, expected",
-    [
-        ("Tue, 26 Aug 2025 12:38:21 GMT", datetime(2025, 8, 26, 12, 38, 21)),
-        ("Wed, 01 Jan 2020 00:00:01 GMT", datetime(2020, 1, 1, 0, 0, 1)),
-        ("", None),
-        (None, None),
-    ],
-)
-def test_parse_date(date_str, expected):
-    result = parse_date(date_str)
-    assert (result == expected) or (result is None and expected is None)
-
-
 @pytest.mark.parametrize(
     "url, expected_section",
     [
@@ -109,7 +93,7 @@ def news_class_mock():
     return News
 
 
-@patch("jobs.bbc.scraper.requests.get")
+@patch("helpers.http_client.HttpClient.get")
 @patch("jobs.bbc.scraper.News")
 def test_scraper_process_feeds(
     mock_news,
@@ -130,7 +114,7 @@ def test_scraper_process_feeds(
 
     # Mock RSS feed
     mock_response_rss = MagicMock()
-    mock_response_rss.text = fake_rss_html
+    mock_response_rss.content = fake_rss_html.encode()
     mock_response_rss.raise_for_status = lambda: None
 
     # requests.get must return navbar first, then RSS feed three times
@@ -155,45 +139,14 @@ def test_scraper_process_feeds(
         "https://bbc.co.uk/sport",
     }
 
-    # temporarily patch sleep to speed up tests
-    with patch("jobs.bbc.scraper.time.sleep"):
-        scraper.process_feeds()
+    scraper.process_feeds()
     news = scraper.get_news()
     assert isinstance(news, list)
     assert len(news) == 2  # Does not store duplicates
     assert all("headline" in n.keys() for n in news)
 
 
-def test_extract_thumbnail_from_item_media_thumbnail():
-    item_xml = """
-    <item>
-      <title>With Thumb</title>
-      <link>https://bbc.co.uk/news/article-1</link>
-      <media:thumbnail width="240" height="134" url="https://ichef.bbci.co.uk/ace/standard/240/cpsprodpb/sample.jpg"/>
-    </item>
-    """
-    item = BeautifulSoup(item_xml, "xml").find("item")
-    thumb = _extract_thumbnail_from_item(item)
-    assert thumb == "https://ichef.bbci.co.uk/ace/standard/240/cpsprodpb/sample.jpg"
-
-
-def test_extract_thumbnail_from_item_regex_fallback():
-    # No thumbnail tag, but raw xml contains url="..." somewhere
-    item_xml = '<item><title>X</title><description><img url="https://example.com/img.jpg" /></description></item>'
-    item = BeautifulSoup(item_xml, "xml").find("item")
-    thumb = _extract_thumbnail_from_item(item)
-    assert thumb == "https://example.com/img.jpg"
-
-
-def test_extract_thumbnail_from_item_malformed_returns_none():
-    # Thumbnail tag present but no url attribute -> should return None
-    item_xml = '<item><media:thumbnail width="240" height="134" /></item>'
-    item = BeautifulSoup(item_xml, "xml").find("item")
-    thumb = _extract_thumbnail_from_item(item)
-    assert thumb is None
-
-
-@patch("jobs.bbc.scraper.requests.get")
+@patch("helpers.http_client.HttpClient.get")
 @patch("jobs.bbc.scraper.News")
 def test_scraper_process_feeds_includes_thumbnail(
     mock_news, mock_requests, fake_navbar_html, news_class_mock, fake_section_html
@@ -224,7 +177,7 @@ def test_scraper_process_feeds_includes_thumbnail(
     mock_response_section.raise_for_status = lambda: None
 
     mock_response_rss = MagicMock()
-    mock_response_rss.text = fake_rss_with_thumb
+    mock_response_rss.content = fake_rss_with_thumb.encode()
     mock_response_rss.raise_for_status = lambda: None
 
     # requests.get order: navbar, section x3, rss x3 (as code expects)
@@ -241,8 +194,7 @@ def test_scraper_process_feeds_includes_thumbnail(
     mock_news.side_effect = news_class_mock
 
     scraper = Scraper()
-    with patch("jobs.bbc.scraper.time.sleep"):
-        scraper.process_feeds()
+    scraper.process_feeds()
 
     news = scraper.get_news()
     assert len(news) >= 1
@@ -273,3 +225,175 @@ def test_scraper_process_feeds_includes_thumbnail(
         payload.get("thumbnail")
         == "https://ichef.bbci.co.uk/ace/standard/240/cpsprodpb/thumb.jpg"
     )
+
+
+@patch("helpers.http_client.HttpClient.get")
+def test_scraper_process_feeds_skips_not_modified_feeds(
+    mock_requests, fake_navbar_html, fake_section_html, fake_rss_html
+):
+    mock_response_nav = MagicMock()
+    mock_response_nav.text = fake_navbar_html
+    mock_response_nav.raise_for_status = lambda: None
+
+    mock_response_section = MagicMock()
+    mock_response_section.text = fake_section_html
+    mock_response_section.raise_for_status = lambda: None
+
+    mock_response_not_modified = MagicMock()
+    mock_response_not_modified.status_code = 304
+    mock_response_not_modified.content = fake_rss_html.encode()
+    mock_response_not_modified.raise_for_status = lambda: None
+
+    mock_requests.side_effect = [mock_response_nav] + [mock_response_section] * 3
+    validator_cache = MagicMock()
+    validator_cache.get_request_headers.return_value = {"If-None-Match": '"abc"'}
+
+    scraper = Scraper(validator_cache=validator_cache)
+    mock_requests.reset_mock()
+    mock_requests.side_effect = [mock_response_not_modified] * 3
+    scraper.process_feeds()
+
+    assert scraper.get_news() == []
+    validator_cache.record.assert_not_called()
+    assert mock_requests.call_count == 3
+    for call in mock_requests.call_args_list:
+        assert call.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+
+@patch("helpers.http_client.HttpClient.get")
+def test_scraper_does_not_record_validators_of_unparsable_feeds(
+    mock_requests, fake_navbar_html, fake_section_html, fake_rss_html
+):
+    mock_response_nav = MagicMock()
+    mock_response_nav.text = fake_navbar_html
+    mock_response_nav.raise_for_status = lambda: None
+
+    mock_response_section = MagicMock()
+    mock_response_section.text = fake_section_html
+    mock_response_section.raise_for_status = lambda: None
+
+    mock_response_broken = MagicMock()
+    mock_response_broken.status_code = 200
+    mock_response_broken.content = b""
+    mock_response_broken.headers = {"ETag": '"abc"'}
+
+    mock_response_rss = MagicMock()
+    mock_response_rss.status_code = 200
+    mock_response_rss.content = fake_rss_html.encode()
+    mock_response_rss.headers = {"ETag": '"def"'}
+
+    mock_requests.side_effect = [mock_response_nav] + [mock_response_section] * 3
+    validator_cache = MagicMock()
+    validator_cache.get_request_headers.return_value = {}
+    watermarks = MagicMock()
+    watermarks.get.return_value = None
+
+    scraper = Scraper(validator_cache=validator_cache, watermarks=watermarks)
+    mock_requests.side_effect = [mock_response_broken] * 2 + [mock_response_rss]
+    scraper.process_feeds()
+
+    assert len(scraper.get_news()) == 2
+    assert [call.args[1] for call in validator_cache.record.call_args_list] == [
+        mock_response_rss
+    ]
+    assert watermarks.record.call_count == 1
+
+
+@patch("helpers.http_client.HttpClient.get")
+def test_scraper_incremental_mode_uses_and_records_watermarks(
+    mock_requests, fake_navbar_html, fake_section_html, fake_rss_html
+):
+    mock_response_nav = MagicMock()
+    mock_response_nav.text = fake_navbar_html
+    mock_response_nav.raise_for_status = lambda: None
+
+    mock_response_section = MagicMock()
+    mock_response_section.text = fake_section_html
+    mock_response_section.raise_for_status = lambda: None
+
+    mock_response_rss = MagicMock()
+    mock_response_rss.content = fake_rss_html.encode()
+    mock_response_rss.raise_for_status = lambda: None
+
+    mock_requests.side_effect = [mock_response_nav] + [mock_response_section] * 3
+    watermarks = MagicMock()
+    watermarks.get.return_value = None
+
+    scraper = Scraper(watermarks=watermarks)
+    mock_requests.side_effect = [mock_response_rss] * 3
+    scraper.process_feeds()
+
+    assert len(scraper.get_news()) == 2
+    assert watermarks.get.call_count == 3
+    assert watermarks.record.call_count == 3
+    newest = max(n["published_at"] for n in scraper.get_news())
+    assert all(call.args[1] == newest for call in watermarks.record.call_args_list)
+
+    watermarks.save.assert_not_called()
+    scraper.save_feed_state()
+    watermarks.save.assert_called_once()
+
+
+@patch("helpers.http_client.HttpClient.get")
+def test_scraper_skips_articles_known_to_fingerprint_index(
+    mock_requests, fake_navbar_html, fake_section_html, fake_rss_html
+):
+    mock_response_nav = MagicMock()
+    mock_response_nav.text = fake_navbar_html
+    mock_response_nav.raise_for_status = lambda: None
+
+    mock_response_section = MagicMock()
+    mock_response_section.text = fake_section_html
+    mock_response_section.raise_for_status = lambda: None
+
+    mock_response_rss = MagicMock()
+    mock_response_rss.content = fake_rss_html.encode()
+    mock_response_rss.raise_for_status = lambda: None
+
+    mock_requests.side_effect = [mock_response_nav] + [mock_response_section] * 3
+    fingerprint_index = MagicMock()
+    fingerprint_index.find_known.return_value = {
+        ("https://bbc.co.uk/news/article-1", "Headline 1")
+    }
+
+    scraper = Scraper(fingerprint_index=fingerprint_index)
+    mock_requests.side_effect = [mock_response_rss] * 3
+    scraper.process_feeds()
+
+    # a single lookup covers every candidate of every feed
+    fingerprint_index.find_known.assert_called_once()
+    assert len(fingerprint_index.find_known.call_args.args[0]) == 2
+    assert [n["headline"] for n in scraper.get_news()] == ["Headline 2"]
+
+    scraper.save_feed_state()
+    fingerprint_index.add.assert_called_once_with(
+        [("https://bbc.co.uk/news/article-2", "Headline 2")]
+    )
+
+
+@patch("helpers.http_client.HttpClient.get")
+def test_scraper_iter_news_yields_new_articles_per_feed(
+    mock_requests, fake_navbar_html, fake_section_html, fake_rss_html
+):
+    mock_response_nav = MagicMock()
+    mock_response_nav.text = fake_navbar_html
+    mock_response_nav.raise_for_status = lambda: None
+
+    mock_response_section = MagicMock()
+    mock_response_section.text = fake_section_html
+    mock_response_section.raise_for_status = lambda: None
+
+    mock_response_rss = MagicMock()
+    mock_response_rss.content = fake_rss_html.encode()
+    mock_response_rss.raise_for_status = lambda: None
+
+    mock_requests.side_effect = [mock_response_nav] + [mock_response_section] * 3
+    scraper = Scraper()
+    mock_requests.side_effect = [mock_response_rss] * 3
+
+    feeds = list(scraper.iter_news())
+
+    # every feed serves the same items, only the first one yields them
+    assert len(feeds) == 1
+    assert [n["headline"] for n in feeds[0]] == ["Headline 1", "Headline 2"]
+    assert scraper.get_news() == feeds[0]
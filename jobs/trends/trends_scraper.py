@@ -8,19 +8,24 @@ from sqlalchemy.dialects.postgresql import insert
 
 from database.models import DailyTrends
 from database.data_base import engine
+from helpers.http_client import get_http_client
 from logger.logging_config import logger
 
 
 class TrendsAPI:
     """API handler for Google Trends"""
 
-    def __init__(self, base_url, api_key):
+    def __init__(self, base_url, api_key, client=None):
         self._url = base_url
         self._key = api_key
+        # a timed out search may already be billed, serpapi requests are never retried
+        self._client = client or get_http_client("serpapi", max_retries=0)
 
     def fetch(self):
         try:
-            r = requests.get(self._url, params={"api_key": self._key}, timeout=(3, 10))
+            r = self._client.get(
+                self._url, params={"api_key": self._key}, timeout=(3, 10)
+            )
             r.raise_for_status()
             return r.json()
         except (requests.RequestException, ValueError) as e:
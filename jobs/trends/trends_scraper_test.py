@@ -20,30 +20,32 @@ def set_env_vars(monkeypatch):
     monkeypatch.setenv("SERP_API_KEY", "fake_api_key")
 
 
-def test_fetch_success(monkeypatch):
+def test_fetch_success():
     """Test TrendsAPI.fetch returns JSON on success."""
     fake_json = {"status": "ok"}
     mock_response = MagicMock()
     mock_response.json.return_value = fake_json
     mock_response.raise_for_status.return_value = None
 
-    monkeypatch.setattr(scraper_mod.requests, "get", lambda *a, **kw: mock_response)
+    client = MagicMock()
+    client.get.return_value = mock_response
 
-    api = scraper_mod.TrendsAPI("http://fake", "key")
+    api = scraper_mod.TrendsAPI("http://fake", "key", client=client)
     result = api.fetch()
 
     assert result == fake_json
 
 
-def test_fetch_failure(monkeypatch, caplog):
+def test_fetch_failure(caplog):
     """Test TrendsAPI.fetch logs exception and returns None."""
 
     def fake_get(*args, **kwargs):
         raise scraper_mod.requests.RequestException("Network error")
 
-    monkeypatch.setattr(scraper_mod.requests, "get", fake_get)
+    client = MagicMock()
+    client.get.side_effect = fake_get
 
-    api = scraper_mod.TrendsAPI("http://fake", "key")
+    api = scraper_mod.TrendsAPI("http://fake", "key", client=client)
     with caplog.at_level(logger_mod.logging.ERROR):
         result = api.fetch()
 
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from cache.redis import RedisService
+
+"""Keyword extraction cache, memoizes extraction results by normalized headline"""
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordCache:
+    """
+    Two tier cache of keyword extraction results.
+
+    Results are kept in an in-process LRU and, when a redis service is given, in
+    redis so they are shared by every worker. Keys include the model version, so
+    results produced by another model or extraction logic are never returned.
+    """
+
+    CACHE_KEY = "headline_keywords"
+
+    def __init__(
+        self,
+        model_version: str,
+        redis_service: RedisService | None = None,
+        max_size: int = 10000,
+        expire_seconds: int = 604800,
+    ):
+        """
+        Initialize a Keyword Cache
+
+        :param model_version: Version of the model and extraction logic producing the results.
+        :param redis_service: Redis service used as shared second tier (optional).
+        :param max_size: Maximum number of results kept in process.
+        :param expire_seconds: TTL of the results stored in redis, default 7 days.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be greater than zero.")
+
+        self._model_version = model_version
+        self._redis_service = redis_service
+        self._max_size = max_size
+        self._expire_seconds = expire_seconds
+
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(headline: str) -> str:
+        """
+        Normalizes a headline so near-identical copies share a cache entry.
+
+        Unicode forms, whitespace and trailing punctuation are unified, case is kept
+        since it changes how spacy tags the tokens.
+
+        :param headline: Headline to normalize.
+        """
+        text = unicodedata.normalize("NFKC", headline)
+        return " ".join(text.split()).rstrip(".!?:;, ")
+
+    def _get_key(self, headline: str) -> str:
+        """
+        Get the cache key of a headline.
+
+        :param headline: Headline whose key is requested.
+        """
+        digest = hashlib.blake2b(
+            self.normalize(headline).encode(), digest_size=16
+        ).hexdigest()
+        return f"{self.CACHE_KEY}:{self._model_version}:{digest}"
+
+    def _remember(self, key: str, value: dict) -> None:
+        """
+        Stores a result in the in-process tier, evicting the least recently used.
+
+        :param key: Cache key of the result.
+        :param value: Extraction result.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def get_many(self, headlines: list[str]) -> list[dict | None]:
+        """
+        Looks up the extraction results of several headlines.
+
+        :param headlines: Headlines to look up.
+        :return: One result per headline in the same order, None on a miss.
+        """
+        keys = [self._get_key(headline) for headline in headlines]
+
+        results: list[dict | None] = []
+        with self._lock:
+            for key in keys:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                results.append(dict(value) if value is not None else None)
+
+        misses = [i for i, value in enumerate(results) if value is None]
+        if not misses or not self._redis_service:
+            return results
+
+        try:
+            stored = self._redis_service.get_values(
+                [self._redis_service.get_prefixed_key(keys[i]) for i in misses]
+            )
+        except Exception as e:
+            logger.warning("Failed to read keyword cache.", extra={"error": str(e)})
+            return results
+
+        for i, raw in zip(misses, stored):
+            if not raw:
+                continue
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                continue
+            self._remember(keys[i], value)
+            results[i] = dict(value)
+
+        return results
+
+    def set_many(self, headlines: list[str], results: list[dict | None]) -> None:
+        """
+        Stores the extraction results of several headlines, failed extractions are skipped.
+
+        :param headlines: Processed headlines.
+        :param results: Extraction result of each headline, None where it failed.
+        """
+        entries = {
+            self._get_key(headline): result
+            for headline, result in zip(headlines, results)
+            if result
+        }
+        if not entries:
+            return
+
+        for key, value in entries.items():
+            self._remember(key, dict(value))
+
+        if not self._redis_service:
+            return
+
+        try:
+            self._redis_service.set_values(
+                {
+                    self._redis_service.get_prefixed_key(key): json.dumps(value)
+                    for key, value in entries.items()
+                },
+                expire_seconds=self._expire_seconds,
+            )
+        except Exception as e:
+            logger.warning("Failed to write keyword cache.", extra={"error": str(e)})
@@ -0,0 +1,88 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+
+from jobs.worker.keyword_cache import KeywordCache
+
+RESULT = {"keyword_1": "Apple", "principal_keyword": "Apple"}
+
+
+def make_redis(stored=None):
+    redis_service = MagicMock()
+    redis_service.get_prefixed_key.side_effect = lambda key: f"news_tracker:{key}"
+    redis_service.get_values.side_effect = lambda keys: [
+        (stored or {}).get(key) for key in keys
+    ]
+    return redis_service
+
+
+def test_normalize_unifies_near_identical_headlines():
+    assert KeywordCache.normalize("  Apple  unveils phone. ") == ("Apple unveils phone")
+    assert KeywordCache.normalize("Apple unveils phone") != KeywordCache.normalize(
+        "apple unveils phone"
+    )
+
+
+def test_in_process_hit_skips_redis():
+    redis_service = make_redis()
+    cache = KeywordCache("v1", redis_service)
+
+    cache.set_many(["Apple unveils phone"], [RESULT])
+    redis_service.get_values.reset_mock()
+
+    assert cache.get_many(["Apple unveils phone.", "Other"]) == [RESULT, None]
+    # only the miss reaches redis
+    assert len(redis_service.get_values.call_args.args[0]) == 1
+
+
+def test_redis_tier_fills_in_process_tier():
+    writer = KeywordCache("v1", make_redis())
+    key = f"news_tracker:{writer._get_key('Apple unveils phone')}"
+    redis_service = make_redis({key: json.dumps(RESULT)})
+    cache = KeywordCache("v1", redis_service)
+
+    assert cache.get_many(["Apple unveils phone"]) == [RESULT]
+    redis_service.get_values.reset_mock()
+    assert cache.get_many(["Apple unveils phone"]) == [RESULT]
+    redis_service.get_values.assert_not_called()
+
+
+def test_model_version_is_part_of_the_key():
+    assert KeywordCache("v1")._get_key("Headline") != KeywordCache("v2")._get_key(
+        "Headline"
+    )
+
+
+def test_set_many_skips_failed_results_and_writes_redis():
+    redis_service = make_redis()
+    cache = KeywordCache("v1", redis_service, expire_seconds=60)
+
+    cache.set_many(["A", "B"], [RESULT, None])
+
+    mapping = redis_service.set_values.call_args.args[0]
+    assert list(mapping.values()) == [json.dumps(RESULT)]
+    assert redis_service.set_values.call_args.kwargs["expire_seconds"] == 60
+    assert cache.get_many(["B"]) == [None]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = KeywordCache("v1", max_size=2)
+    cache.set_many(["A", "B"], [{"keyword_1": "A"}, {"keyword_1": "B"}])
+    cache.get_many(["A"])
+
+    cache.set_many(["C"], [{"keyword_1": "C"}])
+
+    assert cache.get_many(["A", "B", "C"])[1] is None
+
+
+def test_redis_errors_are_a_miss():
+    redis_service = make_redis()
+    redis_service.get_values.side_effect = Exception("down")
+    cache = KeywordCache("v1", redis_service)
+
+    assert cache.get_many(["A"]) == [None]
+
+
+def test_invalid_size_raises():
+    with pytest.raises(ValueError):
+        KeywordCache("v1", max_size=0)
@@ -1,5 +1,8 @@
 import spacy
 
+from cache.redis import RedisService
+from jobs.worker.keyword_cache import KeywordCache
+
 
 class HeadlineProcessService:
     """Handles bussiness logic for natural language processing"""
@@ -8,14 +11,44 @@ class HeadlineProcessService:
 
     LABEL_WEIGHTS = {"PERSON": 2.0, "GPE": 1.5, "ORG": 1.0}
 
-    def __init__(self, model="en_core_web_sm"):
+    # bump whenever the extraction logic changes, invalidates cached results
+    EXTRACTION_VERSION = "2"
+
+    def __init__(
+        self,
+        model="en_core_web_sm",
+        batch_size: int = 64,
+        n_process: int = 1,
+        cache_size: int = 10000,
+        redis_service: RedisService | None = None,
+    ):
         """
         Initialize a Headline Processing Service instance
 
         :param aws_handler: Instance of Aws handler class to get sqs logic.
         :param model: Name of the model to retrieve from spacy.
+        :param batch_size: Number of headlines spacy buffers per batch in batched extraction.
+        :param n_process: Number of processes spacy uses in batched extraction.
+        :param cache_size: Number of extraction results cached in process, 0 disables the cache.
+        :param redis_service: Redis service used to share cached results between workers (optional).
         """
-        self._nlp = spacy.load(model, disable=["ner", "parser"])
+        # ner stays enabled so entities come out of the same pass as the keywords
+        self._nlp = spacy.load(model, disable=["parser"])
+        self._batch_size = batch_size
+        self._n_process = n_process
+        self._cache = (
+            KeywordCache(self.get_model_version(), redis_service, max_size=cache_size)
+            if cache_size
+            else None
+        )
+
+    def get_model_version(self) -> str:
+        """Returns the version of the loaded model and extraction logic."""
+        meta = getattr(self._nlp, "meta", {})
+        return (
+            f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}"
+            f".{self.EXTRACTION_VERSION}"
+        )
 
     def extract_keywords(self, headline: str) -> dict:
         """
@@ -23,13 +56,78 @@ class HeadlineProcessService:
 
         :param headline: Headline to be processed.
         """
+        if self._cache:
+            cached = self._cache.get_many([headline])[0]
+            if cached:
+                return cached
 
         try:
-            keywords = self.process_headline(headline)
+            doc = self._nlp(headline)
+            keywords = self._keywords_from_doc(doc)
 
         except Exception:
             raise Exception("Failed to process headline.")
 
+        article_keyword = self._build_article_keyword(headline, keywords, doc.ents)
+        if self._cache:
+            self._cache.set_many([headline], [article_keyword])
+
+        return article_keyword
+
+    def extract_keywords_batch(self, headlines: list[str]) -> list[dict | None]:
+        """
+        Extracts the keywords of several headlines in a single batched spacy pass
+
+        :param headlines: Headlines to be processed.
+        :return: One result per headline in the same order, None where no keyword was found.
+        """
+        if not headlines:
+            return []
+
+        results = (
+            self._cache.get_many(headlines) if self._cache else [None] * len(headlines)
+        )
+        # only headlines missing from the cache go through spacy
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            return results
+
+        try:
+            docs = list(
+                self._nlp.pipe(
+                    [headlines[i] for i in misses],
+                    batch_size=self._batch_size,
+                    n_process=self._n_process,
+                )
+            )
+        except Exception:
+            raise Exception("Failed to process headlines.")
+
+        for i, doc in zip(misses, docs):
+            try:
+                results[i] = self._build_article_keyword(
+                    headlines[i], self._keywords_from_doc(doc), doc.ents
+                )
+            except ValueError:
+                results[i] = None
+
+        if self._cache:
+            self._cache.set_many(
+                [headlines[i] for i in misses], [results[i] for i in misses]
+            )
+
+        return results
+
+    def _build_article_keyword(
+        self, headline: str, keywords: list, entities: list
+    ) -> dict:
+        """
+        Builds the article keyword entry from the extracted keywords
+
+        :param headline: Headline the keywords were extracted from.
+        :param keywords: (keyword, confidence) pairs sorted by confidence.
+        :param entities: Named entities found in the headline.
+        """
         extraction_confidence = self._get_total_confidence(keywords)
 
         article_keyword = {
@@ -42,6 +140,10 @@ class HeadlineProcessService:
         if not article_keyword.get("keyword_1"):
             raise ValueError(f"Unable to extract keyword_1, from {headline}")
 
+        article_keyword["principal_keyword"] = (
+            self._select_principal_entity(entities) or article_keyword["keyword_1"]
+        )
+
         return article_keyword
 
     def _get_total_confidence(self, keywords: list) -> float:
@@ -72,7 +174,15 @@ class HeadlineProcessService:
         :param headline: The headline to extract keywords from.
         :param max_keywords: The number of keywords to extract.
         """
-        doc = self._nlp(headline)
+        return self._keywords_from_doc(self._nlp(headline), max_keywords)
+
+    def _keywords_from_doc(self, doc, max_keywords: int = 3) -> list:
+        """
+        Extracts the keywords of a processed headline based in level of confidence
+
+        :param doc: Spacy document of the headline.
+        :param max_keywords: The number of keywords to extract.
+        """
         seen = set()
         keywords = []
 
@@ -99,15 +209,28 @@ class HeadlineProcessService:
         if not preprocessed_keywords:
             raise ValueError("preprocessed_keywords required.")
 
-        keyword_string = " ".join(preprocessed_keywords).strip()
+        keyword_string = " ".join(kw for kw in preprocessed_keywords if kw).strip()
         doc = self._nlp(keyword_string)
 
         if not doc:
             raise Exception("Failed to process keywords list.")
 
+        keyword = self._select_principal_entity(doc.ents)
+
+        if not keyword and preprocessed_keywords:
+            keyword = preprocessed_keywords[0]
+
+        return keyword
+
+    def _select_principal_entity(self, entities: list) -> str | None:
+        """
+        Returns the text of the highest scoring entity, None if no entity label is weighted
+
+        :param entities: Named entities of a processed document.
+        """
         max_score = -1
-        keyword = str()
-        for idx, ent in enumerate(doc.ents, start=1):
+        keyword = None
+        for idx, ent in enumerate(entities, start=1):
             if ent.label_ in self.LABEL_WEIGHTS.keys():
                 label_score = self.LABEL_WEIGHTS[ent.label_]
                 position_score = 1 / idx  # earlier keywords get higher scores
@@ -117,7 +240,4 @@ class HeadlineProcessService:
                     max_score = score
                     keyword = ent.text
 
-        if not keyword and preprocessed_keywords:
-            keyword = preprocessed_keywords[0]
-
         return keyword
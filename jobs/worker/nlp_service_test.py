@@ -6,6 +6,18 @@ from types import SimpleNamespace
 from jobs.worker.worker import HeadlineProcessService
 
 
+def Ent(text, label):
+    return SimpleNamespace(text=text, label_=label)
+
+
+class FakeDoc(list):
+    """List of tokens carrying the entities spacy attaches to a doc."""
+
+    def __init__(self, tokens, ents=()):
+        super().__init__(tokens)
+        self.ents = list(ents)
+
+
 @pytest.fixture
 def mock_nlp():
     """
@@ -23,7 +35,7 @@ def mock_nlp():
         Token("phone", "phone", "NOUN", True),
         Token("great", "great", "ADJ", True),
     ]
-    return lambda text: doc
+    return lambda text: FakeDoc(doc)
 
 
 @pytest.fixture
@@ -62,7 +74,7 @@ def service():
 def test_extract_keywords_returns_expected_fields(processor_service):
     with patch.object(
         processor_service,
-        "process_headline",
+        "_keywords_from_doc",
         return_value=[("Test", 1.5), ("Item", 1.0)],
     ) as mock_proc:
         result = processor_service.extract_keywords("Some headline")
@@ -70,18 +82,69 @@ def test_extract_keywords_returns_expected_fields(processor_service):
         assert result["keyword_2"] == "Item"
         assert result["keyword_3"] is None
         assert isinstance(result["extraction_confidence"], float)
+        # no entity in the headline, principal keyword falls back to keyword_1
+        assert result["principal_keyword"] == "Test"
         mock_proc.assert_called_once()
 
 
 def test_extract_keywords_raises_on_fail(processor_service):
     with patch.object(
-        processor_service, "process_headline", side_effect=Exception("fail proc")
+        processor_service, "_keywords_from_doc", side_effect=Exception("fail proc")
     ):
         with pytest.raises(Exception) as e:
             processor_service.extract_keywords("headline")
         assert "Failed to process headline" in str(e.value)
 
 
+def test_extract_keywords_batch_uses_pipe(processor_service):
+    def Token(lemma_, pos_):
+        return types.SimpleNamespace(lemma_=lemma_, pos_=pos_, is_alpha=True)
+
+    processor_service._nlp = MagicMock()
+    processor_service._nlp.pipe.return_value = iter(
+        [
+            FakeDoc(
+                [Token("apple", "PROPN"), Token("phone", "NOUN")],
+                ents=[Ent("Apple Inc", "ORG")],
+            ),
+            FakeDoc([Token("the", "DET")]),
+        ]
+    )
+
+    results = processor_service.extract_keywords_batch(["Apple phone", "The"])
+
+    processor_service._nlp.pipe.assert_called_once_with(
+        ["Apple phone", "The"], batch_size=64, n_process=1
+    )
+    processor_service._nlp.assert_not_called()
+    assert results[0]["keyword_1"] == "Apple"
+    assert results[0]["keyword_2"] == "Phone"
+    assert results[0]["principal_keyword"] == "Apple Inc"
+    assert results[1] is None
+
+
+def test_extract_keywords_batch_only_processes_cache_misses(processor_service):
+    def Token(lemma_, pos_):
+        return types.SimpleNamespace(lemma_=lemma_, pos_=pos_, is_alpha=True)
+
+    processor_service._nlp = MagicMock()
+    processor_service._nlp.pipe.side_effect = lambda texts, **kwargs: iter(
+        [FakeDoc([Token(text.lower(), "PROPN")]) for text in texts]
+    )
+
+    first = processor_service.extract_keywords_batch(["Apple"])
+    second = processor_service.extract_keywords_batch(["Apple", "Banana"])
+
+    assert processor_service._nlp.pipe.call_count == 2
+    assert processor_service._nlp.pipe.call_args.args[0] == ["Banana"]
+    assert second[0] == first[0]
+    assert second[1]["keyword_1"] == "Banana"
+
+
+def test_extract_keywords_batch_empty(processor_service):
+    assert processor_service.extract_keywords_batch([]) == []
+
+
 def test__get_total_confidence(processor_service):
     keywords = [("word", 1.0), ("another", 2.0)]
     assert processor_service._get_total_confidence(keywords) == 3.0
@@ -174,8 +237,10 @@ def test_process_headline_empty_doc(service):
 # ----------
 
 
-def Ent(text, label):
-    return SimpleNamespace(text=text, label_=label)
+def test_select_principal_entity_prefers_weighted_labels(processor_service):
+    entities = [Ent("Monday", "DATE"), Ent("London", "GPE"), Ent("Sunak", "PERSON")]
+    assert processor_service._select_principal_entity(entities) == "Sunak"
+    assert processor_service._select_principal_entity([Ent("Monday", "DATE")]) is None
 
 
 def test_get_principal_keyword_picks_highest_score(service):
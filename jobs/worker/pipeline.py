@@ -0,0 +1,293 @@
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from botocore.exceptions import NoCredentialsError
+
+from jobs.worker.worker import WorkerJob
+
+"""Worker pipeline, runs the worker steps as concurrent stages"""
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream on a stage queue, one per worker of the stage
+_STOP = object()
+# Returned by a step when the batch needs no further stage
+_DONE = object()
+
+
+class WorkerPipeline:
+    """
+    Staged pipeline running the steps of a WorkerJob concurrently.
+
+    Every polled batch of messages flows through the stages below, each stage has
+    its own worker threads and a bounded queue in front of it, so a slow stage
+    (thumbnail downloads, Google Trends) no longer holds back the poll of the next
+    batch, and a full queue pauses the stages before it instead of piling up
+    messages in memory.
+
+    Stages: poll, decode, thumbnails, nlp, keywords, trends, results, cache.
+    Cache refreshes are coalesced, a write finishing while a refresh is already
+    pending does not queue another one.
+
+    With a unit of work nothing is written before the results stage: the trends
+    stage estimates popularity and the results stage persists keywords, news
+    mapping, thumbnails and trends results of the batch in one transaction.
+    """
+
+    STAGES = (
+        "poll",
+        "decode",
+        "thumbnails",
+        "nlp",
+        "keywords",
+        "trends",
+        "results",
+        "cache",
+    )
+    # spacy models are not thread safe and concurrent keyword upserts would lock
+    # the same rows, so those stages default to a single worker
+    DEFAULT_WORKERS = {
+        "poll": 1,
+        "decode": 1,
+        "thumbnails": 4,
+        "nlp": 1,
+        "keywords": 1,
+        "trends": 2,
+        "results": 1,
+        "cache": 1,
+    }
+
+    def __init__(
+        self,
+        worker: WorkerJob,
+        stage_workers: dict[str, int] | None = None,
+        queue_size: int = 4,
+        stop_event: threading.Event | None = None,
+        unit_of_work: bool = False,
+    ):
+        """
+        Initialize a Worker Pipeline
+
+        :param worker: Worker whose steps are run by the stages.
+        :param stage_workers: Number of worker threads by stage name, missing stages use the default.
+        :param queue_size: Maximum number of batches waiting in front of a stage.
+        :param stop_event: Event stopping the pipeline once set, same as calling stop (optional).
+        :param unit_of_work: Persist each batch in one transaction with WorkerJob.persist_batch.
+        """
+        stage_workers = stage_workers or {}
+        unknown = set(stage_workers) - set(self.STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {', '.join(sorted(unknown))}.")
+
+        self._workers = {**self.DEFAULT_WORKERS, **stage_workers}
+        if queue_size < 1 or any(count < 1 for count in self._workers.values()):
+            raise ValueError("queue_size and stage workers must be greater than zero.")
+
+        self._worker = worker
+        self._steps: dict[str, Callable[[dict], dict | object]] = {
+            "decode": self._decode,
+            "thumbnails": self._upload_thumbnails,
+            "nlp": self._extract_keywords,
+            "keywords": self._persist_keywords,
+            "trends": self._estimate_popularity,
+            "results": self._write_results,
+            "cache": self._refresh_cache,
+        }
+        if unit_of_work:
+            self._steps.update(
+                thumbnails=self._collect_thumbnails,
+                keywords=self._forward,
+                trends=self._estimate_batch_popularity,
+                results=self._persist_batch,
+            )
+        # the cache queue holds a single pending refresh, see _send
+        self._queues = {
+            stage: queue.Queue(maxsize=1 if stage == "cache" else queue_size)
+            for stage in self.STAGES[1:]
+        }
+
+        self._stop = stop_event or threading.Event()
+        self._finished: dict[str, int] = {stage: 0 for stage in self.STAGES}
+        self._lock = threading.Lock()
+
+    def run(self) -> None:
+        """Runs every stage until stop is called or aws credentials are missing."""
+        threads = [
+            threading.Thread(
+                target=self._poll if stage == "poll" else self._work,
+                args=() if stage == "poll" else (stage,),
+                name=f"worker-{stage}-{i}",
+                daemon=True,
+            )
+            for stage in self.STAGES
+            for i in range(self._workers[stage])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def stop(self) -> None:
+        """Stops polling, batches already polled are processed before run returns."""
+        self._stop.set()
+
+    def _next_stage(self, stage: str) -> str | None:
+        """
+        Get the stage following a stage.
+
+        :param stage: Name of the stage.
+        """
+        index = self.STAGES.index(stage) + 1
+        return self.STAGES[index] if index < len(self.STAGES) else None
+
+    def _send(self, stage: str, batch: dict) -> None:
+        """
+        Hands a batch over to the stage following a stage.
+
+        :param stage: Name of the stage the batch comes from.
+        :param batch: Batch to hand over.
+        """
+        next_stage = self._next_stage(stage)
+        if next_stage is None:
+            return
+
+        if next_stage != "cache":
+            self._queues[next_stage].put(batch)
+            return
+
+        try:
+            self._queues[next_stage].put_nowait(batch)
+        except queue.Full:
+            logger.debug("News report refresh already pending.")
+
+    def _finish(self, stage: str) -> None:
+        """
+        Marks a worker of a stage as finished, the last one stops every worker of the next stage.
+
+        :param stage: Name of the stage.
+        """
+        with self._lock:
+            self._finished[stage] += 1
+            last = self._finished[stage] == self._workers[stage]
+
+        next_stage = self._next_stage(stage)
+        if last and next_stage is not None:
+            for _ in range(self._workers[next_stage]):
+                self._queues[next_stage].put(_STOP)
+
+    def _poll(self) -> None:
+        """Polls batches of messages until stopped."""
+        try:
+            while not self._stop.is_set():
+                try:
+                    messages = self._worker.poll_messages()
+                except NoCredentialsError:
+                    logger.exception("Failed to get aws credentials.")
+                    self._stop.set()
+                    break
+                except Exception:
+                    logger.exception("Failed to poll messages.")
+                    continue
+
+                if messages:
+                    self._send("poll", {"messages": messages})
+        finally:
+            self._finish("poll")
+
+    def _work(self, stage: str) -> None:
+        """
+        Runs the step of a stage on every queued batch until the stream ends.
+
+        Steps return the batch for the next stage, or _DONE once the batch is
+        finished. A step raising drops its batch without acknowledging it, its
+        messages are released from the visibility heartbeat and retried by sqs or
+        already sit in the fallback queue.
+
+        :param stage: Name of the stage.
+        """
+        step = self._steps[stage]
+        inbox = self._queues[stage]
+        try:
+            while (batch := inbox.get()) is not _STOP:
+                try:
+                    result = step(batch)
+                except Exception:
+                    logger.exception(f"Failed to process batch at stage {stage}.")
+                    self._worker.release_messages(batch["messages"])
+                    continue
+
+                if result is not _DONE:
+                    self._send(stage, result)
+        finally:
+            self._finish(stage)
+
+    def _decode(self, batch: dict) -> dict:
+        batch["entries"] = self._worker.decode_messages(batch["messages"])
+        return batch
+
+    def _upload_thumbnails(self, batch: dict) -> dict:
+        self._worker.upload_thumbnails(batch["entries"])
+        return batch
+
+    def _collect_thumbnails(self, batch: dict) -> dict:
+        batch["thumbnails"] = self._worker.collect_thumbnails(
+            self._worker.submit_thumbnails(batch["entries"])
+        )
+        return batch
+
+    def _extract_keywords(self, batch: dict) -> dict | object:
+        article_keywords = self._worker.extract_keywords(batch["entries"])
+
+        # keep only entries with keyword 1
+        article_keywords = [ak for ak in article_keywords if ak.get("keyword_1")]
+        if not article_keywords:
+            logger.warning("No keywords extracted.")
+            if "thumbnails" in batch:
+                self._worker.write_thumbnails(batch.pop("thumbnails"))
+            self._worker.acknowledge_messages(batch["entries"])
+            self._worker.release_messages(batch["messages"])
+            return _DONE
+
+        batch["article_keywords"] = article_keywords
+        return batch
+
+    def _persist_keywords(self, batch: dict) -> dict:
+        batch["db_keywords"] = self._worker.persist_keywords(batch["article_keywords"])
+        return batch
+
+    def _estimate_popularity(self, batch: dict) -> dict:
+        batch["trends_results"] = self._worker.estimate_popularity(
+            batch.pop("db_keywords"),
+            self._worker.get_principal_keywords(batch.pop("article_keywords")),
+        )
+        return batch
+
+    def _write_results(self, batch: dict) -> dict:
+        self._worker.write_trends_results(batch.pop("trends_results"))
+        self._worker.acknowledge_messages(batch["entries"])
+        self._worker.release_messages(batch["messages"])
+        return batch
+
+    def _forward(self, batch: dict) -> dict:
+        return batch
+
+    def _estimate_batch_popularity(self, batch: dict) -> dict:
+        batch["trends_results"] = self._worker.estimate_batch_popularity(
+            batch["article_keywords"]
+        )
+        return batch
+
+    def _persist_batch(self, batch: dict) -> dict:
+        self._worker.persist_batch(
+            batch.pop("article_keywords"),
+            batch.pop("trends_results"),
+            batch.pop("thumbnails"),
+        )
+        self._worker.acknowledge_messages(batch["entries"])
+        self._worker.release_messages(batch["messages"])
+        return batch
+
+    def _refresh_cache(self, batch: dict) -> object:
+        self._worker.cache_news_report()
+        return _DONE
@@ -0,0 +1,155 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from botocore.exceptions import NoCredentialsError
+
+from jobs.worker.pipeline import WorkerPipeline
+
+
+def make_worker(batches):
+    """Worker whose poll returns the given batches, then missing credentials"""
+    worker = MagicMock()
+    worker.poll_messages.side_effect = list(batches) + [NoCredentialsError()]
+    worker.decode_messages.side_effect = lambda messages: [
+        {"message": m, "news_id": m["id"], "headline": "h", "thumbnail_url": ""}
+        for m in messages
+    ]
+    worker.extract_keywords.side_effect = lambda entries: [
+        {"news_id": e["news_id"], "keyword_1": "kw"} for e in entries
+    ]
+    worker.persist_keywords.side_effect = lambda aks: [
+        {"id": ak["news_id"]} for ak in aks
+    ]
+    worker.get_principal_keywords.return_value = {}
+    worker.estimate_popularity.side_effect = lambda db, principal: [
+        {"keyword_id": row["id"]} for row in db
+    ]
+    return worker
+
+
+def run_pipeline(pipeline):
+    thread = threading.Thread(target=pipeline.run)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_pipeline_runs_every_step_for_every_batch():
+    worker = make_worker([[{"id": 1}], [], [{"id": 2}, {"id": 3}]])
+
+    run_pipeline(WorkerPipeline(worker, {"thumbnails": 2, "trends": 3}))
+
+    assert worker.decode_messages.call_count == 2
+    assert worker.upload_thumbnails.call_count == 2
+    assert worker.persist_keywords.call_count == 2
+    written = [
+        row
+        for call in worker.write_trends_results.call_args_list
+        for row in call.args[0]
+    ]
+    assert sorted(row["keyword_id"] for row in written) == [1, 2, 3]
+    assert worker.cache_news_report.call_count >= 1
+
+
+def test_pipeline_releases_each_finished_batch_once():
+    messages = [{"id": 1}]
+    worker = make_worker([messages])
+
+    run_pipeline(WorkerPipeline(worker))
+
+    worker.cache_news_report.assert_called_once()
+    worker.release_messages.assert_called_once_with(messages)
+
+
+def test_pipeline_drops_failed_batch_and_continues():
+    worker = make_worker([[{"id": 1}], [{"id": 2}]])
+    worker.persist_keywords.side_effect = [
+        Exception("db down"),
+        [{"id": 2}],
+    ]
+
+    run_pipeline(WorkerPipeline(worker))
+
+    worker.write_trends_results.assert_called_once_with([{"keyword_id": 2}])
+    worker.release_messages.assert_any_call([{"id": 1}])
+
+
+def test_pipeline_skips_batches_without_keywords():
+    worker = make_worker([[{"id": 1}]])
+    worker.extract_keywords.side_effect = lambda entries: [{"news_id": 1}]
+
+    run_pipeline(WorkerPipeline(worker))
+
+    worker.persist_keywords.assert_not_called()
+    worker.cache_news_report.assert_not_called()
+    worker.release_messages.assert_called_once_with([{"id": 1}])
+
+
+def test_pipeline_unit_of_work_persists_each_batch_once():
+    messages = [{"id": 1}, {"id": 2}]
+    worker = make_worker([messages])
+    worker.estimate_batch_popularity.side_effect = lambda aks: [
+        {"article_keywords_id": i} for i, _ in enumerate(aks)
+    ]
+    worker.collect_thumbnails.return_value = [{"id": 1, "thumbnail": "cdn/1"}]
+
+    run_pipeline(WorkerPipeline(worker, unit_of_work=True))
+
+    worker.persist_keywords.assert_not_called()
+    worker.write_trends_results.assert_not_called()
+    worker.upload_thumbnails.assert_not_called()
+    worker.write_thumbnails.assert_not_called()
+    worker.persist_batch.assert_called_once_with(
+        [{"news_id": 1, "keyword_1": "kw"}, {"news_id": 2, "keyword_1": "kw"}],
+        [{"article_keywords_id": 0}, {"article_keywords_id": 1}],
+        [{"id": 1, "thumbnail": "cdn/1"}],
+    )
+    worker.acknowledge_messages.assert_called_once()
+    worker.release_messages.assert_called_once_with(messages)
+
+
+def test_pipeline_unit_of_work_failure_acknowledges_nothing():
+    worker = make_worker([[{"id": 1}]])
+    worker.estimate_batch_popularity.return_value = []
+    worker.persist_batch.side_effect = Exception("db down")
+
+    run_pipeline(WorkerPipeline(worker, unit_of_work=True))
+
+    worker.acknowledge_messages.assert_not_called()
+    worker.cache_news_report.assert_not_called()
+    worker.release_messages.assert_called_once_with([{"id": 1}])
+
+
+def test_pipeline_unit_of_work_writes_thumbnails_of_batches_without_keywords():
+    worker = make_worker([[{"id": 1}]])
+    worker.extract_keywords.side_effect = lambda entries: [{"news_id": 1}]
+    worker.collect_thumbnails.return_value = [{"id": 1, "thumbnail": "cdn/1"}]
+
+    run_pipeline(WorkerPipeline(worker, unit_of_work=True))
+
+    worker.persist_batch.assert_not_called()
+    worker.write_thumbnails.assert_called_once_with([{"id": 1, "thumbnail": "cdn/1"}])
+
+
+def test_pipeline_stop_ends_polling():
+    worker = MagicMock()
+    worker.poll_messages.return_value = []
+    pipeline = WorkerPipeline(worker)
+
+    thread = threading.Thread(target=pipeline.run)
+    thread.start()
+    pipeline.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    worker.decode_messages.assert_not_called()
+
+
+def test_pipeline_rejects_unknown_stage():
+    with pytest.raises(ValueError):
+        WorkerPipeline(MagicMock(), {"unknown": 1})
+
+
+def test_pipeline_rejects_zero_workers():
+    with pytest.raises(ValueError):
+        WorkerPipeline(MagicMock(), {"nlp": 0})
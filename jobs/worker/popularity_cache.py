@@ -0,0 +1,123 @@
+import hashlib
+import json
+import logging
+from datetime import datetime
+
+from cache.redis import RedisService
+
+"""Popularity cache, stores parsed Google Trends timelines per keyword"""
+
+logger = logging.getLogger(__name__)
+
+
+class PopularityCache:
+    """
+    Redis cache of Google Trends timelines.
+
+    Entries are keyed by normalized keyword, geo and day, so a keyword queried for
+    one article is reused for every other article of the same day. The stored
+    timeline is the part of the api payload the interest calculations read, so
+    peak and current interest can be recomputed from it.
+    """
+
+    CACHE_KEY = "trends_timeline"
+
+    def __init__(self, redis_service: RedisService, ttl_seconds: int = 21600):
+        """
+        Initialize a Popularity Cache
+
+        :param redis_service: Redis service storing the timelines.
+        :param ttl_seconds: Time a timeline is reused for, default 6 hours.
+        """
+        if ttl_seconds < 1:
+            raise ValueError("ttl_seconds must be greater than zero.")
+
+        self._redis_service = redis_service
+        self._ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def normalize(keyword: str) -> str:
+        """
+        Normalizes a keyword so differently cased or spaced copies share an entry.
+
+        :param keyword: Keyword to normalize.
+        """
+        return " ".join(keyword.casefold().split())
+
+    @staticmethod
+    def get_timeline(payload: dict) -> dict:
+        """
+        Keeps the part of an api payload needed to recompute the interest values.
+
+        :param payload: Parsed api payload.
+        """
+        return {
+            "search_parameters": {
+                "q": (payload.get("search_parameters") or {}).get("q", "")
+            },
+            "interest_over_time": payload.get("interest_over_time") or {},
+        }
+
+    def _get_key(self, keyword: str, geo: str) -> str:
+        """
+        Get the redis key of a keyword for today.
+
+        :param keyword: Keyword whose key is requested.
+        :param geo: Geo the keyword is queried for, empty for worldwide.
+        """
+        digest = hashlib.blake2b(
+            self.normalize(keyword).encode(), digest_size=16
+        ).hexdigest()
+        day = datetime.now().strftime("%Y-%m-%d")
+        return self._redis_service.get_prefixed_key(
+            f"{self.CACHE_KEY}:{geo or 'world'}:{day}:{digest}"
+        )
+
+    def get_many(self, keywords: list[str], geo: str = "") -> list[dict | None]:
+        """
+        Looks up today's timelines of several keywords in a single round trip.
+
+        :param keywords: Keywords to look up.
+        :param geo: Geo the keywords are queried for, empty for worldwide.
+        :return: One timeline per keyword in the same order, None on a miss.
+        """
+        if not keywords:
+            return []
+
+        try:
+            stored = self._redis_service.get_values(
+                [self._get_key(keyword, geo) for keyword in keywords]
+            )
+        except Exception as e:
+            logger.warning("Failed to read popularity cache.", extra={"error": str(e)})
+            return [None] * len(keywords)
+
+        timelines = []
+        for raw in stored:
+            try:
+                timelines.append(json.loads(raw) if raw else None)
+            except ValueError:
+                timelines.append(None)
+
+        return timelines
+
+    def set_many(self, timelines: dict[str, dict], geo: str = "") -> None:
+        """
+        Stores today's timelines of several keywords.
+
+        :param timelines: Timeline of each keyword, as returned by get_timeline.
+        :param geo: Geo the keywords were queried for, empty for worldwide.
+        """
+        if not timelines:
+            return
+
+        try:
+            self._redis_service.set_values(
+                {
+                    self._get_key(keyword, geo): json.dumps(timeline)
+                    for keyword, timeline in timelines.items()
+                },
+                expire_seconds=self._ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning("Failed to write popularity cache.", extra={"error": str(e)})
@@ -0,0 +1,83 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+
+from jobs.worker.popularity_cache import PopularityCache
+
+TIMELINE = {
+    "search_parameters": {"q": "Apple"},
+    "interest_over_time": {"timeline_data": []},
+}
+
+
+@pytest.fixture
+def redis_service():
+    store = {}
+    redis_service = MagicMock()
+    redis_service.get_prefixed_key.side_effect = lambda key: f"news_tracker:{key}"
+    redis_service.get_values.side_effect = lambda keys: [store.get(k) for k in keys]
+    redis_service.set_values.side_effect = lambda mapping, expire_seconds: store.update(
+        mapping
+    )
+    return redis_service
+
+
+def test_get_timeline_keeps_query_and_interest_only():
+    payload = {
+        "search_metadata": {"id": "x"},
+        "search_parameters": {"q": "Apple", "engine": "google_trends"},
+        "interest_over_time": {"timeline_data": [{"date": "d"}]},
+    }
+
+    assert PopularityCache.get_timeline(payload) == {
+        "search_parameters": {"q": "Apple"},
+        "interest_over_time": {"timeline_data": [{"date": "d"}]},
+    }
+
+
+def test_round_trip_normalizes_keyword(redis_service):
+    cache = PopularityCache(redis_service, ttl_seconds=60)
+
+    cache.set_many({"Apple": TIMELINE})
+
+    assert cache.get_many([" apple ", "Banana"]) == [TIMELINE, None]
+    assert redis_service.set_values.call_args.kwargs["expire_seconds"] == 60
+
+
+def test_geo_is_part_of_the_key(redis_service):
+    cache = PopularityCache(redis_service)
+
+    cache.set_many({"Apple": TIMELINE}, geo="GB")
+
+    assert cache.get_many(["Apple"]) == [None]
+    assert cache.get_many(["Apple"], geo="GB") == [TIMELINE]
+
+
+def test_key_contains_geo_and_day(redis_service):
+    cache = PopularityCache(redis_service)
+
+    key = cache._get_key("Apple", "")
+
+    assert key.startswith("news_tracker:trends_timeline:world:")
+
+
+def test_read_errors_are_a_miss(redis_service):
+    redis_service.get_values.side_effect = Exception("down")
+    cache = PopularityCache(redis_service)
+
+    assert cache.get_many(["Apple", "Banana"]) == [None, None]
+
+
+def test_malformed_entries_are_a_miss(redis_service):
+    redis_service.get_values.side_effect = lambda keys: [
+        "{not json",
+        json.dumps(TIMELINE),
+    ]
+    cache = PopularityCache(redis_service)
+
+    assert cache.get_many(["Apple", "Banana"]) == [None, TIMELINE]
+
+
+def test_invalid_ttl_raises(redis_service):
+    with pytest.raises(ValueError):
+        PopularityCache(redis_service, ttl_seconds=0)
@@ -1,16 +1,24 @@
 import os
+import threading
+from collections.abc import Callable
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 from logger.logging_config import logger
 from botocore.exceptions import NoCredentialsError
 
 from jobs.worker.worker import WorkerJob
+from jobs.worker.pipeline import WorkerPipeline
 from jobs.worker.trends_service import GoogleTrendsService
 from jobs.worker.nlp_service import HeadlineProcessService
+from jobs.worker.popularity_cache import PopularityCache
+from jobs.worker.thumbnail_index import ThumbnailIndex
+from jobs.worker.thumbnail_ingester import ThumbnailIngester
 from aws_handler.sqs import AwsHelper
+from aws_handler.heartbeat import VisibilityHeartbeat
 from database.data_base import engine
 from aws_handler.s3 import S3Handler
 from cache.redis import RedisService
+from helpers.rate_limiter import RateLimiter
 
 
 def session_factory():
@@ -18,8 +26,18 @@ def session_factory():
     return Session(engine)
 
 
-def run_worker():
+def run_worker(
+    stop_event: threading.Event | None = None,
+    on_processed: Callable[[int], None] | None = None,
+):
+    """
+    Runs the worker until stop_event is set or aws credentials are missing
+
+    :param stop_event: Event stopping the worker after its current batch (optional).
+    :param on_processed: Called with the number of headlines processed by each batch (optional).
+    """
     load_dotenv()
+    stop_event = stop_event or threading.Event()
     TRENDS_BASE_URL = os.getenv("GOOGLE_TRENDS_URL")
     API_KEY = os.getenv("SERP_API_KEY")
     QUEUE_URL = os.getenv("MAIN_QUEUE_URL")
@@ -30,14 +48,48 @@ def run_worker():
     REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
     REDIS_PASSWORD = REDIS_PASSWORD if REDIS_PASSWORD else None
 
-    google_trends = GoogleTrendsService(TRENDS_BASE_URL, API_KEY)
-    nlp_processor = HeadlineProcessService()
-    aws_helper = AwsHelper(queue_url=QUEUE_URL, fallback_queue_url=FALLBACK_QUEUE_URL)
-    s3_handler = S3Handler(BUCKET_NAME, CDN_DOMAIN_NAME)
     redis_service = RedisService(
         host=REDIS_HOST, password=REDIS_PASSWORD, logger=logger
     )
+    google_trends = GoogleTrendsService(
+        TRENDS_BASE_URL,
+        API_KEY,
+        geo=os.getenv("GOOGLE_TRENDS_GEO", ""),
+        popularity_cache=PopularityCache(
+            redis_service,
+            ttl_seconds=int(os.getenv("TRENDS_CACHE_TTL_SECONDS", "21600")),
+        ),
+        queries_per_request=int(os.getenv("TRENDS_QUERIES_PER_REQUEST", "5")),
+        max_concurrency=int(os.getenv("TRENDS_MAX_CONCURRENCY", "4")),
+        rate_limiter=RateLimiter(
+            float(os.getenv("TRENDS_MIN_REQUEST_INTERVAL", "0.2"))
+        ),
+    )
+    nlp_processor = HeadlineProcessService(
+        batch_size=int(os.getenv("NLP_BATCH_SIZE", "64")),
+        n_process=int(os.getenv("NLP_N_PROCESS", "1")),
+        cache_size=int(os.getenv("KEYWORD_CACHE_SIZE", "10000")),
+        redis_service=redis_service,
+    )
+    aws_helper = AwsHelper(queue_url=QUEUE_URL, fallback_queue_url=FALLBACK_QUEUE_URL)
+    thumbnail_workers = int(os.getenv("THUMBNAIL_WORKERS", "4"))
+    s3_handler = S3Handler(
+        BUCKET_NAME, CDN_DOMAIN_NAME, max_pool_connections=thumbnail_workers
+    )
+    thumbnail_index = None
+    if os.getenv("THUMBNAIL_DEDUPLICATION", "true").lower() == "true":
+        thumbnail_index = ThumbnailIndex(
+            redis_service,
+            ttl_seconds=int(os.getenv("THUMBNAIL_INDEX_TTL_SECONDS", "2592000")),
+        )
+    thumbnail_ingester = ThumbnailIngester(
+        s3_handler, max_workers=thumbnail_workers, thumbnail_index=thumbnail_index
+    )
+    # messages are received and extended with the same timeout
+    visibility_timeout = int(os.getenv("SQS_VISIBILITY_TIMEOUT", "30"))
+    heartbeat = VisibilityHeartbeat(aws_helper, visibility_timeout=visibility_timeout)
 
+    unit_of_work = os.getenv("WORKER_UNIT_OF_WORK", "true").lower() == "true"
     worker = WorkerJob(
         google_trends,
         nlp_processor,
@@ -45,18 +97,43 @@ def run_worker():
         session_factory,
         s3_handler,
         redis_service,
+        on_processed=on_processed,
+        heartbeat=heartbeat,
+        unit_of_work=unit_of_work,
+        thumbnail_ingester=thumbnail_ingester,
+        visibility_timeout=visibility_timeout,
     )
-
-    while True:
-        try:
-            worker.process_messages()
-        except NoCredentialsError:
-            logger.exception("Failed to get aws credentials.")
+    heartbeat.start()
+    try:
+        if os.getenv("WORKER_PIPELINE", "false").lower() == "true":
+            stage_workers = {
+                stage: int(os.getenv(f"WORKER_{stage.upper()}_WORKERS"))
+                for stage in WorkerPipeline.STAGES
+                if os.getenv(f"WORKER_{stage.upper()}_WORKERS")
+            }
+            WorkerPipeline(
+                worker,
+                stage_workers,
+                queue_size=int(os.getenv("WORKER_QUEUE_SIZE", "4")),
+                stop_event=stop_event,
+                unit_of_work=unit_of_work,
+            ).run()
             return
-        except Exception:
-            logger.exception(
-                "Failed to process message."
-            )  # If processing fails next set of messages is processed
+
+        while not stop_event.is_set():
+            try:
+                worker.process_messages()
+            except NoCredentialsError:
+                logger.exception("Failed to get aws credentials.")
+                return
+            except Exception:
+                logger.exception(
+                    "Failed to process message."
+                )  # If processing fails next set of messages is processed
+    finally:
+        heartbeat.stop()
+        worker.close()
+        thumbnail_ingester.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable
+from dotenv import load_dotenv
+
+from helpers.http_client import close_http_clients
+from jobs.worker.run_worker import run_worker
+
+"""Worker supervisor, runs one worker per core and restarts crashed ones"""
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerSupervisor:
+    """
+    Supervisor of a fixed number of forked worker processes.
+
+    Keyword extraction is bound to the GIL, so a single process only ever uses one
+    core. The supervisor forks one worker per slot, restarts a slot whose process
+    crashes while the supervisor is running, stops every worker gracefully on
+    SIGTERM or SIGINT, and logs the throughput of every process.
+
+    A worker exiting with code 0 chose to stop (missing credentials for instance)
+    and its slot is retired. Crashed slots are restarted with an exponential
+    backoff, so a persistent failure does not turn into a crash loop.
+
+    Imports happen before the fork, so the code pages of spacy and the other
+    libraries are shared copy-on-write. Everything holding sockets or threads
+    (models, clients, connection pools) is created by the target after the fork.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[threading.Event, Callable[[int], None]], None],
+        processes: int,
+        restart_delay: float = 5.0,
+        max_restart_delay: float = 300.0,
+        report_interval: float = 60.0,
+        shutdown_timeout: float = 30.0,
+    ):
+        """
+        Initialize a Worker Supervisor
+
+        :param target: Function run by every worker process, called with a stop event
+            and a function to count the processed messages.
+        :param processes: Number of worker processes.
+        :param restart_delay: Minimum number of seconds between two starts of the same slot,
+            doubled after every consecutive crash.
+        :param max_restart_delay: Maximum number of seconds between two starts of the same slot.
+        :param report_interval: Number of seconds between two throughput reports.
+        :param shutdown_timeout: Number of seconds workers get to finish their batch on stop.
+        """
+        if processes < 1:
+            raise ValueError("processes must be greater than zero.")
+
+        self._target = target
+        self._processes = processes
+        self._restart_delay = restart_delay
+        self._max_restart_delay = max_restart_delay
+        self._report_interval = report_interval
+        self._shutdown_timeout = shutdown_timeout
+
+        self._context = multiprocessing.get_context("fork")
+        self._counters = [self._context.Value("Q", 0) for _ in range(processes)]
+        self._workers: list[multiprocessing.Process | None] = [None] * processes
+        self._started_at = [0.0] * processes
+        self._crashes = [0] * processes
+        self._retired = [False] * processes
+        self._stop = threading.Event()
+
+        self._last_counts = [0] * processes
+        self._last_report = 0.0
+
+    def run(self) -> None:
+        """Starts the workers and supervises them until SIGTERM or SIGINT."""
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        logger.info(f"Starting {self._processes} worker processes.")
+        self._last_report = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                for slot in range(self._processes):
+                    self._supervise(slot)
+
+                if all(self._retired):
+                    logger.error("Every worker exited, stopping the supervisor.")
+                    break
+
+                if time.monotonic() - self._last_report >= self._report_interval:
+                    self.report_throughput()
+
+                self._stop.wait(1)
+        finally:
+            self._shutdown()
+
+    def stop(self) -> None:
+        """Stops supervising, workers are stopped once run returns."""
+        self._stop.set()
+
+    def _handle_signal(self, signum: int, frame) -> None:
+        logger.info(f"Received signal {signum}, stopping workers.")
+        self.stop()
+
+    def _supervise(self, slot: int) -> None:
+        """
+        Starts the worker of a slot if it is not running, logging how the last one exited.
+
+        :param slot: Index of the worker slot.
+        """
+        if self._retired[slot]:
+            return
+
+        worker = self._workers[slot]
+        if worker is not None and worker.is_alive():
+            return
+
+        if worker is not None:
+            pid, exitcode = worker.pid, worker.exitcode
+            worker.close()
+            self._workers[slot] = None
+
+            if exitcode == 0:
+                logger.warning(f"Worker {pid} exited, not restarting it.")
+                self._retired[slot] = True
+                return
+
+            # a worker that ran longer than the longest delay is not crash looping
+            if time.monotonic() - self._started_at[slot] > self._max_restart_delay:
+                self._crashes[slot] = 0
+            self._crashes[slot] += 1
+            logger.error(
+                f"Worker {pid} exited with code {exitcode}, restarting in "
+                f"{self._get_restart_delay(slot):.0f}s."
+            )
+
+        if time.monotonic() - self._started_at[slot] < self._get_restart_delay(slot):
+            return
+
+        worker = self._context.Process(
+            target=self._run_worker,
+            args=(self._counters[slot],),
+            name=f"worker-{slot}",
+        )
+        worker.start()
+        self._workers[slot] = worker
+        self._started_at[slot] = time.monotonic()
+
+    def _get_restart_delay(self, slot: int) -> float:
+        """
+        Get the minimum number of seconds between two starts of a slot.
+
+        :param slot: Index of the worker slot.
+        """
+        crashes = max(self._crashes[slot] - 1, 0)
+        return min(self._restart_delay * 2**crashes, self._max_restart_delay)
+
+    def _run_worker(self, counter) -> None:
+        """
+        Entry point of a worker process.
+
+        :param counter: Shared counter of the messages processed by the slot.
+        """
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        # pooled connections inherited from the supervisor must not be shared
+        close_http_clients()
+
+        def count(processed: int) -> None:
+            with counter.get_lock():
+                counter.value += processed
+
+        self._target(stop_event, count)
+
+    def report_throughput(self) -> dict[int, float]:
+        """
+        Logs the number of messages per second processed by every worker since the last report.
+
+        :return: Messages per second by process id.
+        """
+        now = time.monotonic()
+        elapsed = max(now - self._last_report, 1e-9)
+
+        throughput = {}
+        for slot, worker in enumerate(self._workers):
+            count = self._counters[slot].value
+            processed, self._last_counts[slot] = count - self._last_counts[slot], count
+            if worker is not None:
+                throughput[worker.pid] = processed / elapsed
+
+        self._last_report = now
+        logger.info(
+            "Worker throughput (messages/s): "
+            + ", ".join(f"{pid}: {rate:.2f}" for pid, rate in throughput.items()),
+            extra={"throughput": throughput, "total": sum(throughput.values())},
+        )
+        return throughput
+
+    def _shutdown(self) -> None:
+        """Stops every worker, killing those that do not finish their batch in time."""
+        workers = [worker for worker in self._workers if worker is not None]
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+        deadline = time.monotonic() + self._shutdown_timeout
+        for worker in workers:
+            worker.join(max(deadline - time.monotonic(), 0))
+            if worker.is_alive():
+                logger.warning(f"Worker {worker.pid} did not stop in time, killing it.")
+                worker.kill()
+                worker.join()
+
+        logger.info("Every worker stopped.")
+
+
+def run_supervisor():
+    load_dotenv()
+    supervisor = WorkerSupervisor(
+        run_worker,
+        processes=int(os.getenv("WORKER_PROCESSES", str(os.cpu_count() or 1))),
+        restart_delay=float(os.getenv("WORKER_RESTART_DELAY", "5")),
+        max_restart_delay=float(os.getenv("WORKER_MAX_RESTART_DELAY", "300")),
+        report_interval=float(os.getenv("WORKER_REPORT_INTERVAL", "60")),
+    )
+    supervisor.run()
+
+
+if __name__ == "__main__":
+    run_supervisor()
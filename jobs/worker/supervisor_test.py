@@ -0,0 +1,97 @@
+import os
+import signal
+import threading
+import time
+import pytest
+
+from jobs.worker.supervisor import WorkerSupervisor
+
+
+def counting_target(stop_event, on_processed):
+    while not stop_event.is_set():
+        on_processed(1)
+        time.sleep(0.01)
+
+
+def crashing_target(stop_event, on_processed):
+    on_processed(1)
+    os._exit(1)
+
+
+def exiting_target(stop_event, on_processed):
+    on_processed(1)
+
+
+@pytest.fixture(autouse=True)
+def restore_signal_handlers():
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGTERM, signal.SIGINT)}
+    yield
+    for sig, handler in handlers.items():
+        signal.signal(sig, handler)
+
+
+def run_for(supervisor, seconds):
+    timer = threading.Timer(seconds, supervisor.stop)
+    timer.start()
+    supervisor.run()
+    timer.join()
+
+
+def test_supervisor_runs_and_stops_workers():
+    supervisor = WorkerSupervisor(counting_target, processes=2, shutdown_timeout=5)
+
+    run_for(supervisor, 0.5)
+
+    assert all(counter.value > 0 for counter in supervisor._counters)
+    assert all(not worker.is_alive() for worker in supervisor._workers if worker)
+
+
+def test_supervisor_restarts_crashed_workers():
+    supervisor = WorkerSupervisor(crashing_target, processes=1, restart_delay=0)
+
+    run_for(supervisor, 2.5)
+
+    assert supervisor._counters[0].value >= 2
+
+
+def test_supervisor_does_not_restart_workers_exiting_cleanly():
+    supervisor = WorkerSupervisor(exiting_target, processes=1, restart_delay=0)
+    timer = threading.Timer(10, supervisor.stop)
+    timer.start()
+
+    supervisor.run()
+    timer.cancel()
+
+    assert supervisor._counters[0].value == 1
+    assert supervisor._retired == [True]
+
+
+def test_restart_delay_backs_off_on_consecutive_crashes():
+    supervisor = WorkerSupervisor(
+        counting_target, processes=1, restart_delay=5, max_restart_delay=30
+    )
+
+    delays = []
+    for crashes in range(5):
+        supervisor._crashes[0] = crashes
+        delays.append(supervisor._get_restart_delay(0))
+
+    assert delays == [5, 5, 10, 20, 30]
+
+
+def test_report_throughput_by_process():
+    supervisor = WorkerSupervisor(counting_target, processes=1, shutdown_timeout=5)
+    supervisor._supervise(0)
+    supervisor._last_report = time.monotonic()
+    time.sleep(0.3)
+
+    throughput = supervisor.report_throughput()
+    supervisor._shutdown()
+
+    assert list(throughput) == [supervisor._workers[0].pid]
+    assert throughput[supervisor._workers[0].pid] > 0
+
+
+def test_supervisor_rejects_zero_processes():
+    with pytest.raises(ValueError):
+        WorkerSupervisor(counting_target, processes=0)
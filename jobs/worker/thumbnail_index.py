@@ -0,0 +1,73 @@
+import hashlib
+import logging
+
+from cache.redis import RedisService
+
+"""Thumbnail index, maps image urls to the CDN url of their stored thumbnail"""
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailIndex:
+    """
+    Redis index of the thumbnails already stored in S3.
+
+    Entries are keyed by a hash of the source url, so an image reused across
+    articles and feeds resolves to its existing CDN url without a download, an
+    upload or an S3 lookup. A miss or a redis failure falls back to S3.
+    """
+
+    CACHE_KEY = "thumbnail_url"
+
+    def __init__(self, redis_service: RedisService, ttl_seconds: int = 2592000):
+        """
+        Initialize a Thumbnail Index
+
+        :param redis_service: Redis service storing the index.
+        :param ttl_seconds: Time an entry is kept for, default 30 days.
+        """
+        if ttl_seconds < 1:
+            raise ValueError("ttl_seconds must be greater than zero.")
+
+        self._redis_service = redis_service
+        self._ttl_seconds = ttl_seconds
+
+    def _get_key(self, image_url: str) -> str:
+        """
+        Get the redis key of an image url.
+
+        :param image_url: URL of the image.
+        """
+        digest = hashlib.blake2b(image_url.strip().encode(), digest_size=16).hexdigest()
+        return self._redis_service.get_prefixed_key(f"{self.CACHE_KEY}:{digest}")
+
+    def get(self, image_url: str) -> str | None:
+        """
+        Looks up the CDN url of an image.
+
+        :param image_url: URL of the image.
+        :return: CDN url of the stored thumbnail, None on a miss.
+        """
+        try:
+            cdn_url = self._redis_service.get_value(self._get_key(image_url))
+        except Exception as e:
+            logger.warning("Failed to read thumbnail index.", extra={"error": str(e)})
+            return None
+
+        if isinstance(cdn_url, bytes):
+            cdn_url = cdn_url.decode()
+        return cdn_url or None
+
+    def set(self, image_url: str, cdn_url: str) -> None:
+        """
+        Records the CDN url of a stored thumbnail.
+
+        :param image_url: URL of the image.
+        :param cdn_url: CDN url of its thumbnail.
+        """
+        try:
+            self._redis_service.set_value(
+                self._get_key(image_url), cdn_url, expire_seconds=self._ttl_seconds
+            )
+        except Exception as e:
+            logger.warning("Failed to write thumbnail index.", extra={"error": str(e)})
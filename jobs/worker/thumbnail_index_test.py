@@ -0,0 +1,42 @@
+import pytest
+from unittest.mock import MagicMock
+
+from jobs.worker.thumbnail_index import ThumbnailIndex
+
+
+@pytest.fixture
+def redis_service():
+    store = {}
+    redis_service = MagicMock()
+    redis_service.get_prefixed_key.side_effect = lambda key: f"news_tracker:{key}"
+    redis_service.get_value.side_effect = lambda key: store.get(key)
+    redis_service.set_value.side_effect = lambda key, value, expire_seconds: (
+        store.update({key: value.encode()})
+    )
+    return redis_service
+
+
+def test_round_trip_by_image_url(redis_service):
+    index = ThumbnailIndex(redis_service, ttl_seconds=60)
+
+    index.set("http://img/a.jpg", "https://cdn/a.jpg")
+
+    assert index.get(" http://img/a.jpg ") == "https://cdn/a.jpg"
+    assert index.get("http://img/b.jpg") is None
+    assert redis_service.set_value.call_args.kwargs["expire_seconds"] == 60
+
+
+def test_redis_errors_are_misses():
+    redis_service = MagicMock()
+    redis_service.get_value.side_effect = ConnectionError("redis down")
+    redis_service.set_value.side_effect = ConnectionError("redis down")
+    index = ThumbnailIndex(redis_service)
+
+    index.set("http://img/a.jpg", "https://cdn/a.jpg")
+
+    assert index.get("http://img/a.jpg") is None
+
+
+def test_rejects_invalid_ttl():
+    with pytest.raises(ValueError):
+        ThumbnailIndex(MagicMock(), ttl_seconds=0)
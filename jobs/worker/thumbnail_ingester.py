@@ -0,0 +1,139 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from aws_handler.s3 import S3Handler
+from jobs.worker.thumbnail_index import ThumbnailIndex
+
+"""Thumbnail ingester, uploads thumbnails concurrently with headline processing"""
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailIngester:
+    """
+    Bounded pool of threads streaming thumbnails to S3.
+
+    Uploads run in the background while keywords are extracted, so image I/O no
+    longer blocks the nlp pass. At most max_pending uploads are queued or running,
+    further submissions wait for a free slot. Every upload shares the S3 handler's
+    client and connection pool.
+
+    With a thumbnail index, thumbnails are stored once per source url: indexed
+    images resolve to their CDN url without any transfer, and concurrent
+    submissions of the same url share a single upload.
+    """
+
+    def __init__(
+        self,
+        s3_handler: S3Handler,
+        max_workers: int = 4,
+        max_pending: int | None = None,
+        thumbnail_index: ThumbnailIndex | None = None,
+    ):
+        """
+        Initialize a Thumbnail Ingester
+
+        :param s3_handler: Handler uploading the thumbnails.
+        :param max_workers: Number of concurrent uploads.
+        :param max_pending: Maximum number of queued or running uploads, default 4 per worker.
+        :param thumbnail_index: Index of the stored thumbnails, None to upload one
+            thumbnail per news.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than zero.")
+
+        self._s3_handler = s3_handler
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="thumbnails"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending or max_workers * 4)
+        self._thumbnail_index = thumbnail_index
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, image_url: str, news_id: int) -> Future:
+        """
+        Schedules the upload of a thumbnail.
+
+        :param image_url: URL of the image to upload.
+        :param news_id: ID of the news associated with the image.
+        :return: Future resolving to the CDN url of the uploaded thumbnail.
+        """
+        if self._thumbnail_index is None:
+            return self._schedule(self._s3_handler.upload_thumbnail, image_url, news_id)
+
+        # the url is claimed under the lock and scheduled outside of it, so a
+        # submission of an url already in flight never waits for a free slot
+        with self._lock:
+            future = self._in_flight.get(image_url)
+            if future is not None:
+                return future
+
+            future = Future()
+            future.set_running_or_notify_cancel()
+            self._in_flight[image_url] = future
+
+        future.add_done_callback(lambda _: self._forget(image_url))
+        try:
+            upload = self._schedule(self._ingest_shared, image_url)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+
+        upload.add_done_callback(lambda done: self._resolve(future, done))
+        return future
+
+    def _schedule(self, fn, *args) -> Future:
+        """
+        Runs a function on the pool once a slot is free.
+
+        :param fn: Function to run.
+        :param args: Arguments of the function.
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    @staticmethod
+    def _resolve(future: Future, upload: Future) -> None:
+        """
+        Completes a claimed future with the outcome of its upload.
+
+        :param future: Future returned to the submitters of the url.
+        :param upload: Finished upload of the url.
+        """
+        error = upload.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(upload.result())
+
+    def _forget(self, image_url: str) -> None:
+        with self._lock:
+            self._in_flight.pop(image_url, None)
+
+    def _ingest_shared(self, image_url: str) -> str:
+        """
+        Resolves the thumbnail of an image, uploading it only if it is not stored yet.
+
+        :param image_url: URL of the image.
+        :return: CDN url of the thumbnail.
+        """
+        cdn_url = self._thumbnail_index.get(image_url)
+        if cdn_url:
+            return cdn_url
+
+        cdn_url = self._s3_handler.upload_shared_thumbnail(image_url)
+        self._thumbnail_index.set(image_url, cdn_url)
+        return cdn_url
+
+    def close(self) -> None:
+        """Waits for the scheduled uploads and stops the threads."""
+        self._executor.shutdown(wait=True)
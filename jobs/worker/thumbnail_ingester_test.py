@@ -0,0 +1,135 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+
+from jobs.worker.thumbnail_ingester import ThumbnailIngester
+
+
+def test_submit_returns_upload_result():
+    s3_handler = MagicMock()
+    s3_handler.upload_thumbnail.side_effect = lambda url, news_id: f"cdn/{news_id}"
+    ingester = ThumbnailIngester(s3_handler, max_workers=2)
+
+    futures = [ingester.submit(f"http://img/{i}", i) for i in range(5)]
+    ingester.close()
+
+    assert [future.result() for future in futures] == [f"cdn/{i}" for i in range(5)]
+
+
+def test_submit_surfaces_upload_errors():
+    s3_handler = MagicMock()
+    s3_handler.upload_thumbnail.side_effect = RuntimeError("s3 down")
+    ingester = ThumbnailIngester(s3_handler)
+
+    future = ingester.submit("http://img", 1)
+
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    ingester.close()
+
+
+def test_uploads_run_concurrently():
+    started = threading.Barrier(3, timeout=5)
+    s3_handler = MagicMock()
+    s3_handler.upload_thumbnail.side_effect = lambda url, news_id: started.wait()
+    ingester = ThumbnailIngester(s3_handler, max_workers=3)
+
+    futures = [ingester.submit("http://img", i) for i in range(3)]
+
+    # the barrier only opens if the three uploads run at the same time
+    assert all(future.result(timeout=5) is not None for future in futures)
+    ingester.close()
+
+
+def test_pending_uploads_are_bounded():
+    release = threading.Event()
+    s3_handler = MagicMock()
+    s3_handler.upload_thumbnail.side_effect = lambda url, news_id: release.wait(5)
+    ingester = ThumbnailIngester(s3_handler, max_workers=1, max_pending=1)
+    ingester.submit("http://img", 1)
+
+    submitted = threading.Event()
+    thread = threading.Thread(
+        target=lambda: (ingester.submit("http://img", 2), submitted.set())
+    )
+    thread.start()
+
+    assert not submitted.wait(0.2)
+    release.set()
+    assert submitted.wait(5)
+    thread.join()
+    ingester.close()
+
+
+def test_rejects_zero_workers():
+    with pytest.raises(ValueError):
+        ThumbnailIngester(MagicMock(), max_workers=0)
+
+
+def test_indexed_images_are_not_uploaded():
+    s3_handler = MagicMock()
+    thumbnail_index = MagicMock()
+    thumbnail_index.get.return_value = "cdn/shared"
+    ingester = ThumbnailIngester(s3_handler, thumbnail_index=thumbnail_index)
+
+    assert ingester.submit("http://img", 1).result(timeout=5) == "cdn/shared"
+    ingester.close()
+
+    s3_handler.upload_shared_thumbnail.assert_not_called()
+    s3_handler.upload_thumbnail.assert_not_called()
+
+
+def test_unindexed_images_are_uploaded_once_and_indexed():
+    release = threading.Event()
+    s3_handler = MagicMock()
+    s3_handler.upload_shared_thumbnail.side_effect = lambda url: (
+        release.wait(5),
+        "cdn/shared",
+    )[1]
+    thumbnail_index = MagicMock()
+    thumbnail_index.get.return_value = None
+    ingester = ThumbnailIngester(
+        s3_handler, max_workers=2, thumbnail_index=thumbnail_index
+    )
+
+    futures = [ingester.submit("http://img", i) for i in range(3)]
+    release.set()
+
+    assert [future.result(timeout=5) for future in futures] == ["cdn/shared"] * 3
+    ingester.close()
+    s3_handler.upload_shared_thumbnail.assert_called_once_with("http://img")
+    thumbnail_index.set.assert_called_once_with("http://img", "cdn/shared")
+
+
+def test_submissions_in_flight_do_not_wait_for_a_free_slot():
+    release = threading.Event()
+    s3_handler = MagicMock()
+    s3_handler.upload_shared_thumbnail.side_effect = lambda url: (
+        release.wait(5),
+        f"cdn/{url}",
+    )[1]
+    thumbnail_index = MagicMock()
+    thumbnail_index.get.return_value = None
+    ingester = ThumbnailIngester(
+        s3_handler, max_workers=1, max_pending=1, thumbnail_index=thumbnail_index
+    )
+    first = ingester.submit("http://img/1", 1)
+
+    # waits for the only slot, held by the first upload
+    waiting = threading.Thread(target=ingester.submit, args=("http://img/2", 2))
+    waiting.start()
+    waiting.join(timeout=0.2)
+    assert waiting.is_alive()
+
+    shared = []
+    thread = threading.Thread(
+        target=lambda: shared.append(ingester.submit("http://img/1", 3))
+    )
+    thread.start()
+    thread.join(timeout=1)
+
+    assert shared == [first]
+    release.set()
+    waiting.join()
+    assert first.result(timeout=5) == "cdn/http://img/1"
+    ingester.close()
@@ -1,9 +1,13 @@
 import json
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
 from requests import HTTPError
 from logging import getLogger
 
+from helpers.http_client import HttpClient, get_http_client
+from helpers.rate_limiter import RateLimiter
+from jobs.worker.popularity_cache import PopularityCache
+
 """Google Trend handler module, class and methods to estimate popularity"""
 
 logger = getLogger(__name__)
@@ -12,15 +16,50 @@ logger = getLogger(__name__)
 class GoogleTrendsService:
     """API service, handles bussiness logic for google trends API"""
 
-    def __init__(self, base_url: str, api_key: str):
+    # SerpApi's google_trends engine compares at most 5 comma separated queries
+    MAX_QUERIES_PER_REQUEST = 5
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        client: HttpClient | None = None,
+        geo: str = "",
+        popularity_cache: PopularityCache | None = None,
+        queries_per_request: int = MAX_QUERIES_PER_REQUEST,
+        max_concurrency: int = 1,
+        rate_limiter: RateLimiter | None = None,
+    ):
         """
         Initialize a Google Trends Client
 
         :params base_url: The base url for the Google Trends Rating Endpoint
         :api_key: Api key to access SerpApi's service
+        :param client: Http client to send requests with, defaults to the shared "serpapi" client.
+        :param geo: Google Trends geo code of the queries, empty for worldwide.
+        :param popularity_cache: Cache of keyword timelines shared across articles (optional).
+        :param queries_per_request: Keywords packed per request in batched estimation, from 1
+            to 5. Every keyword's values are rescaled to its own peak, as in a single query
+            request.
+        :param max_concurrency: Maximum number of requests in flight in batched estimation.
+        :param rate_limiter: Limiter shared by every request made with the api key (optional).
         """
+        if not 1 <= queries_per_request <= self.MAX_QUERIES_PER_REQUEST:
+            raise ValueError(
+                f"queries_per_request must be between 1 and {self.MAX_QUERIES_PER_REQUEST}."
+            )
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than zero.")
+
         self._base_url = base_url
         self._api_key = api_key
+        # a timed out search may already be billed, serpapi requests are never retried
+        self._client = client or get_http_client("serpapi", max_retries=0)
+        self._geo = geo
+        self._popularity_cache = popularity_cache
+        self._queries_per_request = queries_per_request
+        self._max_concurrency = max_concurrency
+        self._rate_limiter = rate_limiter
 
     def estimate_popularity(self, keyword: str) -> dict | None:
         """
@@ -28,15 +67,167 @@ class GoogleTrendsService:
 
         :param keyword: keyword string whom will have its popularity estimated.
         """
+        payload = None
+        if self._popularity_cache:
+            payload = self._popularity_cache.get_many([keyword], self._geo)[0]
+
+        if payload is None:
+            try:
+                payload = self.get_api_payload(keyword)
+            except HTTPError:
+                logger.exception(f"Failed to make request to {self._base_url}")
+                return
+            except Exception as e:
+                logger.exception(f"Unexpected error ocurred: {e}")
+                return
+
+            if self._popularity_cache:
+                self._popularity_cache.set_many(
+                    {keyword: PopularityCache.get_timeline(payload)}, self._geo
+                )
+
+        return self._build_trends_result(payload)
+
+    def estimate_popularity_batch(self, keywords: list[str]) -> list[dict | None]:
+        """
+        Estimates the popularity of several keywords, packing several keywords per request.
+
+        :param keywords: Keywords whom will have their popularity estimated.
+        :return: One result per keyword in the same order, None where estimation failed.
+        """
+        # commas separate the queries of a request
+        queries = [keyword.replace(",", " ").strip() for keyword in keywords]
+        unique = [query for query in dict.fromkeys(queries) if query]
+
+        timelines: dict[str, dict] = {}
+        if self._popularity_cache:
+            cached = self._popularity_cache.get_many(unique, self._geo)
+            timelines = {
+                query: timeline
+                for query, timeline in zip(unique, cached)
+                if timeline is not None
+            }
+
+        missing = [query for query in unique if query not in timelines]
+        chunks = [
+            missing[start : start + self._queries_per_request]
+            for start in range(0, len(missing), self._queries_per_request)
+        ]
+
+        fetched: dict[str, dict] = {}
+        workers = min(self._max_concurrency, len(chunks))
+        if workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="trends"
+            ) as executor:
+                for chunk_timelines in executor.map(self._fetch_timelines, chunks):
+                    fetched.update(chunk_timelines)
+        else:
+            for chunk in chunks:
+                fetched.update(self._fetch_timelines(chunk))
+
+        if self._popularity_cache:
+            self._popularity_cache.set_many(fetched, self._geo)
+        timelines.update(fetched)
+
+        return [
+            self._build_trends_result(timelines[query]) if query in timelines else None
+            for query in queries
+        ]
+
+    def _fetch_timelines(self, queries: list[str]) -> dict[str, dict]:
+        """
+        Requests several queries at once and splits the response per query.
+
+        :param queries: Queries packed in the request.
+        :return: Timeline of each query, empty if the request failed.
+        """
         try:
-            payload = self.get_api_payload(keyword)
+            payload = self.get_api_payload(",".join(queries))
         except HTTPError:
             logger.exception(f"Failed to make request to {self._base_url}")
-            return
+            return {}
         except Exception as e:
             logger.exception(f"Unexpected error ocurred: {e}")
-            return
+            return {}
+
+        return {
+            query: self.normalize_timeline(self.split_timeline(payload, query))
+            for query in queries
+        }
 
+    @staticmethod
+    def normalize_timeline(timeline: dict) -> dict:
+        """
+        Rescales a single query timeline so its peak is 100.
+
+        Google Trends scales every value of a request to the most popular query of
+        that request. Rescaling each query to its own peak gives the values a single
+        query request would return, so they do not depend on the packed queries.
+
+        :param timeline: Timeline as returned by split_timeline.
+        """
+        entries = (timeline.get("interest_over_time") or {}).get("timeline_data", [])
+        peak = max(
+            (
+                value_entry.get("extracted_value") or 0
+                for entry in entries
+                for value_entry in entry.get("values") or []
+            ),
+            default=0,
+        )
+        if peak <= 0:
+            return timeline
+
+        timeline_data = [
+            {
+                **entry,
+                "values": [
+                    {
+                        **value_entry,
+                        "extracted_value": round(
+                            (value_entry.get("extracted_value") or 0) * 100 / peak
+                        ),
+                    }
+                    for value_entry in entry.get("values") or []
+                ],
+            }
+            for entry in entries
+        ]
+
+        return {**timeline, "interest_over_time": {"timeline_data": timeline_data}}
+
+    def split_timeline(self, payload: dict, query: str) -> dict:
+        """
+        Extracts the timeline of a single query from a multi query payload.
+
+        :param payload: Api payload of a request with comma separated queries.
+        :param query: Query whose values are kept.
+        """
+        interest_over_time = payload.get("interest_over_time") or {}
+
+        timeline_data = []
+        for entry in interest_over_time.get("timeline_data", []):
+            values = [
+                value_entry
+                for value_entry in entry.get("values") or []
+                if (value_entry.get("query") or "").casefold() == query.casefold()
+            ]
+            timeline_data.append({**entry, "values": values})
+
+        return {
+            "search_parameters": {"q": query},
+            "interest_over_time": (
+                {"timeline_data": timeline_data} if timeline_data else {}
+            ),
+        }
+
+    def _build_trends_result(self, payload: dict) -> dict | None:
+        """
+        Computes the trends result of a keyword from its timeline.
+
+        :param payload: Api payload, or cached timeline, of the keyword.
+        """
         current_interest = self.get_current_interest(payload)
         peak_interest = self.get_peak_interest(payload)
 
@@ -75,14 +266,21 @@ class GoogleTrendsService:
         if not keyword or not keyword.strip():
             raise ValueError("keyword required")
 
+        params = {
+            "api_key": self._api_key,
+            "q": keyword,
+            "engine": "google_trends",
+        }
+        if self._geo:
+            params["geo"] = self._geo
+
+        if self._rate_limiter:
+            self._rate_limiter.acquire()
+
         try:
-            r = requests.get(
+            r = self._client.get(
                 self._base_url,
-                params={
-                    "api_key": self._api_key,
-                    "q": keyword,
-                    "engine": "google_trends",
-                },
+                params=params,
                 timeout=(3, 40),
             )
             r.raise_for_status()
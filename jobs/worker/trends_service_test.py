@@ -1,5 +1,6 @@
+import json
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from datetime import date, timedelta
 from requests import HTTPError
 
@@ -44,6 +45,229 @@ def test_estimate_popularity_success(service):
         assert results["has_data"] is True
 
 
+def test_estimate_popularity_reuses_cached_timeline():
+    cache = MagicMock()
+    timeline = {"search_parameters": {"q": "Apple"}, "interest_over_time": {}}
+    cache.get_many.return_value = [timeline]
+    service = GoogleTrendsService(
+        "http://fake", "key", geo="GB", popularity_cache=cache
+    )
+
+    with (
+        patch.object(service, "get_api_payload") as mock_payload,
+        patch.object(service, "_build_trends_result", return_value={"ok": 1}) as build,
+    ):
+        assert service.estimate_popularity("Apple") == {"ok": 1}
+
+    mock_payload.assert_not_called()
+    cache.get_many.assert_called_once_with(["Apple"], "GB")
+    build.assert_called_once_with(timeline)
+
+
+def test_estimate_popularity_caches_fetched_timeline():
+    cache = MagicMock()
+    cache.get_many.return_value = [None]
+    service = GoogleTrendsService("http://fake", "key", popularity_cache=cache)
+    payload = {
+        "search_metadata": {"id": "x"},
+        "search_parameters": {"q": "Apple"},
+        "interest_over_time": {"timeline_data": []},
+    }
+
+    with (
+        patch.object(service, "get_api_payload", return_value=payload),
+        patch.object(service, "_build_trends_result", return_value={"ok": 1}),
+    ):
+        service.estimate_popularity("Apple")
+
+    cache.set_many.assert_called_once_with(
+        {
+            "Apple": {
+                "search_parameters": {"q": "Apple"},
+                "interest_over_time": {"timeline_data": []},
+            }
+        },
+        "",
+    )
+
+
+def test_get_api_payload_sends_geo():
+    client = MagicMock()
+    client.get.return_value.text = "{}"
+    service = GoogleTrendsService("http://fake", "key", client=client, geo="GB")
+
+    service.get_api_payload("Apple")
+
+    assert client.get.call_args.kwargs["params"]["geo"] == "GB"
+
+
+def multi_query_payload(queries):
+    return {
+        "search_parameters": {"q": ",".join(queries)},
+        "interest_over_time": {
+            "timeline_data": [
+                {
+                    "date": "Feb 1 – Feb 7, 2025",
+                    "values": [
+                        {"query": q, "extracted_value": 10 * (i + 1)}
+                        for i, q in enumerate(queries)
+                    ],
+                }
+            ]
+        },
+    }
+
+
+def test_split_timeline_keeps_single_query_values(service):
+    timeline = service.split_timeline(
+        multi_query_payload(["Apple", "Banana"]), "banana"
+    )
+
+    assert timeline["search_parameters"] == {"q": "banana"}
+    entry = timeline["interest_over_time"]["timeline_data"][0]
+    assert entry["values"] == [{"query": "Banana", "extracted_value": 20}]
+
+
+def test_estimate_popularity_batch_packs_five_queries_per_request():
+    keywords = ["K0", "K1", "K2", "K3", "K4", "K5", "K0"]
+    service = GoogleTrendsService("http://fake", "key")
+
+    def fake_payload(query):
+        return multi_query_payload(query.split(","))
+
+    with (
+        patch.object(service, "get_api_payload", side_effect=fake_payload) as api,
+        patch.object(
+            service,
+            "_build_trends_result",
+            side_effect=lambda t: {"q": t["search_parameters"]["q"]},
+        ),
+    ):
+        results = service.estimate_popularity_batch(keywords)
+
+    assert [call.args[0] for call in api.call_args_list] == ["K0,K1,K2,K3,K4", "K5"]
+    assert [r["q"] for r in results] == keywords
+
+
+def test_packed_values_match_single_query_values():
+    def payload(timeline):
+        return {
+            "interest_over_time": {
+                "timeline_data": [
+                    {
+                        "date": f"Feb {day} – Feb {day + 6}, 2025",
+                        "values": [
+                            {"query": q, "extracted_value": v}
+                            for q, v in values.items()
+                        ],
+                    }
+                    for day, values in timeline
+                ]
+            },
+        }
+
+    service = GoogleTrendsService("http://fake", "key")
+    packed = payload([(1, {"A": 100, "B": 10}), (8, {"A": 50, "B": 5})])
+
+    with patch.object(service, "get_api_payload", return_value=packed):
+        timelines = service._fetch_timelines(["A", "B"])
+
+    values = [
+        [entry["values"][0]["extracted_value"] for entry in timeline_data]
+        for timeline_data in (
+            timelines[q]["interest_over_time"]["timeline_data"] for q in ("A", "B")
+        )
+    ]
+    # a single query request scales each keyword to its own peak
+    assert values == [[100, 50], [100, 50]]
+
+
+def test_normalize_timeline_keeps_timelines_without_interest():
+    timeline = {
+        "search_parameters": {"q": "A"},
+        "interest_over_time": {
+            "timeline_data": [{"values": [{"query": "A", "extracted_value": 0}]}]
+        },
+    }
+
+    assert GoogleTrendsService.normalize_timeline(timeline) == timeline
+
+
+def test_estimate_popularity_batch_failed_request_only_fails_its_chunk():
+    service = GoogleTrendsService("http://fake", "key", queries_per_request=1)
+
+    with (
+        patch.object(
+            service,
+            "get_api_payload",
+            side_effect=[HTTPError(), multi_query_payload(["B"])],
+        ),
+        patch.object(service, "_build_trends_result", return_value={"ok": 1}),
+    ):
+        results = service.estimate_popularity_batch(["A", "B"])
+
+    assert results == [None, {"ok": 1}]
+
+
+def test_estimate_popularity_batch_uses_cache_and_strips_commas():
+    cache = MagicMock()
+    cache.get_many.return_value = [{"cached": True}, None]
+    service = GoogleTrendsService("http://fake", "key", popularity_cache=cache)
+
+    with (
+        patch.object(
+            service, "get_api_payload", return_value=multi_query_payload(["Paris  TX"])
+        ) as api,
+        patch.object(service, "_build_trends_result", side_effect=lambda t: t),
+    ):
+        results = service.estimate_popularity_batch(["Cached", "Paris, TX"])
+
+    cache.get_many.assert_called_once_with(["Cached", "Paris  TX"], "")
+    api.assert_called_once_with("Paris  TX")
+    assert results[0] == {"cached": True}
+    assert list(cache.set_many.call_args.args[0]) == ["Paris  TX"]
+
+
+def test_estimate_popularity_batch_concurrent_requests_keep_order():
+    keywords = [f"K{i}" for i in range(6)]
+    limiter = MagicMock()
+    client = MagicMock()
+
+    def fake_get(url, params, timeout):
+        response = MagicMock()
+        response.text = json.dumps(multi_query_payload(params["q"].split(",")))
+        return response
+
+    client.get.side_effect = fake_get
+    service = GoogleTrendsService(
+        "http://fake",
+        "key",
+        client=client,
+        queries_per_request=1,
+        max_concurrency=3,
+        rate_limiter=limiter,
+    )
+
+    with patch.object(
+        service,
+        "_build_trends_result",
+        side_effect=lambda t: {"q": t["search_parameters"]["q"]},
+    ):
+        results = service.estimate_popularity_batch(keywords)
+
+    assert [r["q"] for r in results] == keywords
+    assert client.get.call_count == 6
+    # every request waits for its slot of the shared api key limiter
+    assert limiter.acquire.call_count == 6
+
+
+def test_invalid_queries_per_request_raises():
+    with pytest.raises(ValueError):
+        GoogleTrendsService("http://fake", "key", queries_per_request=6)
+    with pytest.raises(ValueError):
+        GoogleTrendsService("http://fake", "key", max_concurrency=0)
+
+
 def test_estimate_popularity_http_error_logs_and_returns_none(service, caplog):
     with patch.object(service, "get_api_payload", side_effect=HTTPError()):
         with caplog.at_level("ERROR"):
@@ -1,17 +1,20 @@
 import logging
 import json
 from collections.abc import Callable
+from concurrent.futures import Future
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
 from sqlalchemy import and_
 
 from aws_handler.sqs import AwsHelper
+from aws_handler.heartbeat import VisibilityHeartbeat
 from database.models import ArticleKeywords, TrendsResults, News
 from helpers.database_helper import DataBaseHelper
 from jobs.worker.trends_service import GoogleTrendsService
 from jobs.worker.nlp_service import HeadlineProcessService
 from aws_handler.s3 import S3Handler
+from jobs.worker.thumbnail_ingester import ThumbnailIngester
 from exceptions.s3 import S3BucketServiceError
 from exceptions.image import ImageDownloadError
 from cache.redis import RedisService
@@ -34,6 +37,11 @@ class WorkerJob:
         session_factory: Callable,
         s3_handler: S3Handler = None,
         redis_service: RedisService = None,
+        on_processed: Callable[[int], None] | None = None,
+        heartbeat: VisibilityHeartbeat | None = None,
+        unit_of_work: bool = False,
+        thumbnail_ingester: ThumbnailIngester | None = None,
+        visibility_timeout: int = 30,
     ):
         """
         Initialize the Worker Instance
@@ -44,6 +52,14 @@ class WorkerJob:
         :param session_factory: Function to create a db session.
         :param s3_handler: Instance of S3Handler to upload thumbnails.
         :param redis_service: Instance of RedisService for caching (optional).
+        :param on_processed: Called with the number of headlines processed by each nlp pass (optional).
+        :param heartbeat: Heartbeat keeping polled messages invisible until processed (optional).
+        :param unit_of_work: Persist keywords, news mapping, thumbnails and trends results of a batch in one transaction.
+        :param thumbnail_ingester: Pool uploading thumbnails in the background, closed by its
+            owner. Default a single thread pool on the s3 handler, closed by close.
+            Without either, thumbnails are not uploaded.
+        :param visibility_timeout: Visibility timeout of polled messages in seconds, should match
+            the heartbeat's so messages are extended before they become visible again.
         """
         self._api = api
         self._processor_service = processor_service
@@ -51,24 +67,153 @@ class WorkerJob:
         self._session_factory = session_factory
         self._s3_handler = s3_handler
         self._redis_service = redis_service
+        self._on_processed = on_processed
+        self._heartbeat = heartbeat
+        self._unit_of_work = unit_of_work
+        self._visibility_timeout = visibility_timeout
+        self._thumbnail_ingester = thumbnail_ingester
+        self._owns_thumbnail_ingester = (
+            thumbnail_ingester is None and s3_handler is not None
+        )
+        if self._owns_thumbnail_ingester:
+            self._thumbnail_ingester = ThumbnailIngester(s3_handler, max_workers=1)
+
+    def close(self) -> None:
+        """Stops the thumbnail ingester created by the worker, once its uploads complete."""
+        if self._owns_thumbnail_ingester:
+            self._thumbnail_ingester.close()
 
     def process_messages(self) -> None:
         """Extracts keywords and saves to ArticleKeywords table"""
 
+        messages = self.poll_messages()
+
+        try:
+            entries = self.decode_messages(messages)
+            # thumbnails upload in the background while keywords are extracted
+            thumbnails = self.submit_thumbnails(entries)
+            article_keywords = self.extract_keywords(entries)
+            thumbnail_urls = self.collect_thumbnails(thumbnails)
+
+            # keep only entries with keyword 1
+            article_keywords = [ak for ak in article_keywords if ak.get("keyword_1")]
+            if not article_keywords:
+                logger.warning("No keywords extracted.")
+                self.write_thumbnails(thumbnail_urls)
+                self.acknowledge_messages(entries)
+                return
+
+            if self._unit_of_work:
+                self.persist_batch(article_keywords, thumbnails=thumbnail_urls)
+            else:
+                self.write_thumbnails(thumbnail_urls)
+                db_keywords = self.persist_keywords(article_keywords)
+
+                # Gtrends estimate popularity
+                trends_results = self.estimate_popularity(
+                    db_keywords, self.get_principal_keywords(article_keywords)
+                )
+
+                self.write_trends_results(trends_results)
+
+            # messages are deleted only once everything they produced is committed
+            self.acknowledge_messages(entries)
+
+            # Cache the aggregated news report after trends estimation
+            self.cache_news_report()
+        finally:
+            self.release_messages(messages)
+
+    def poll_messages(self) -> list:
+        """Polls a batch of messages from the main queue"""
         try:
-            messages = self._aws_handler.poll_messages()
+            messages = self._aws_handler.poll_messages(
+                visibility_timeout=self._visibility_timeout
+            )
         except Exception as e:
             logger.warning("Unable to poll for sqs messages.", extra={"error": str(e)})
             raise
 
-        article_keywords = self.process_list_of_messages(messages)
+        if self._heartbeat:
+            self._heartbeat.track(messages)
+        return messages
+
+    def acknowledge_messages(self, entries: list[dict]) -> None:
+        """
+        Deletes the messages whose keywords were extracted from the main queue, in batches
+
+        Messages that still fail after the retries are redelivered by sqs, every
+        write of the worker is an upsert so processing them again is safe.
 
-        # keep only entries with keyword 1
-        article_keywords = [ak for ak in article_keywords if ak.get("keyword_1")]
-        if not article_keywords:
-            logger.warning("No keywords extracted.")
+        :param entries: Entries returned by decode_messages, after extract_keywords.
+        """
+        messages = [entry["message"] for entry in entries if entry.get("extracted")]
+        if not messages:
             return
 
+        failed = self._aws_handler.delete_messages_batch(
+            messages, self._aws_handler.queue_url
+        )
+        if failed:
+            logger.warning(f"Failed to acknowledge {len(failed)} messages.")
+
+        # redelivered messages still need their offloaded body
+        failed_handles = {message.get("ReceiptHandle") for message in failed}
+        self.delete_payloads(
+            [
+                entry
+                for entry in entries
+                if entry.get("extracted")
+                and entry["message"].get("ReceiptHandle") not in failed_handles
+            ]
+        )
+
+    def delete_payloads(self, entries: list[dict]) -> None:
+        """
+        Deletes the S3 bodies of acknowledged messages offloaded by the publisher
+
+        :param entries: Entries of acknowledged messages.
+        """
+        keys_by_bucket: dict[str | None, list[str]] = {}
+        for entry in entries:
+            pointer = entry.get("s3_payload")
+            if pointer:
+                keys_by_bucket.setdefault(pointer.get("bucket"), []).append(
+                    pointer["key"]
+                )
+
+        for bucket, keys in keys_by_bucket.items():
+            try:
+                failed = self._s3_handler.delete_payloads(keys, bucket)
+            except S3BucketServiceError as e:
+                logger.warning(
+                    f"Failed to delete offloaded message payloads: {e}",
+                    extra={"keys": keys},
+                )
+                continue
+
+            if failed:
+                logger.warning(
+                    f"Failed to delete {len(failed)} offloaded message payloads.",
+                    extra={"keys": failed},
+                )
+
+    def release_messages(self, messages: list) -> None:
+        """
+        Stops extending the visibility of messages whose processing is over
+
+        :param messages: Polled messages.
+        """
+        if self._heartbeat:
+            self._heartbeat.release(messages)
+
+    def persist_keywords(self, article_keywords: list[dict]) -> list[dict]:
+        """
+        Upserts the extracted keywords and maps every news to its keywords row
+
+        :param article_keywords: Extracted keywords, including the news id.
+        :return: Written ArticleKeywords rows.
+        """
         insert_payload = self._deduplicate_article_keywords(article_keywords)
 
         try:
@@ -91,47 +236,178 @@ class WorkerJob:
             raise
 
         # map News.keywords_id to respective row in table ArticleKeywords
-        session = self._session_factory()
         news_keywords_mapping = self._deduplicate_keywords_news(
             article_keywords, db_keywords
         )
-        try:
-            for keyword_id, news_id in news_keywords_mapping:
-                session.query(News).filter(News.id == news_id).update(
-                    {"keywords_id": keyword_id}
+        DataBaseHelper.bulk_update_by_primary_key(
+            News,
+            [
+                {"id": news_id, "keywords_id": keyword_id}
+                for keyword_id, news_id in news_keywords_mapping
+            ],
+            self._session_factory,
+            logger,
+        )
+
+        return db_keywords
+
+    def estimate_batch_popularity(self, article_keywords: list[dict]) -> list[dict]:
+        """
+        Estimates the popularity of a batch before it is persisted by persist_batch
+
+        :param article_keywords: Extracted keywords, including the news id.
+        :return: Trends results, keyed by the position of their keywords in the batch.
+        """
+        # rows are not written yet, their position stands in for the id
+        return self.estimate_popularity(
+            [
+                {**row, "id": i}
+                for i, row in enumerate(
+                    self._deduplicate_article_keywords(article_keywords)
                 )
-            session.commit()
-        except:
-            session.rollback()
-            raise
-        finally:
-            session.close()
+            ],
+            self.get_principal_keywords(article_keywords),
+        )
+
+    def persist_batch(
+        self,
+        article_keywords: list[dict],
+        estimates: list[dict] | None = None,
+        thumbnails: list[dict] | None = None,
+    ) -> list[dict]:
+        """
+        Persists the keywords, news mapping, thumbnails and trends results of a batch in one transaction
 
-        # Gtrends estimate popularity
-        trends_results = self.estimate_popularity(db_keywords)
+        Popularity is estimated before the transaction opens, so no lock is held
+        while the trends api is called, and a failure leaves nothing half written.
 
+        :param article_keywords: Extracted keywords, including the news id.
+        :param estimates: Trends results returned by estimate_batch_popularity, estimated
+            here when missing.
+        :param thumbnails: Thumbnail urls returned by collect_thumbnails (optional).
+        :return: Written trends results.
+        """
+        insert_payload = self._deduplicate_article_keywords(article_keywords)
+        if estimates is None:
+            estimates = self.estimate_batch_popularity(article_keywords)
+
+        with DataBaseHelper.unit_of_work(self._session_factory, logger) as session:
+            db_keywords = [
+                dict(row._mapping)
+                for row in session.execute(
+                    DataBaseHelper.build_insert_statement(
+                        ArticleKeywords,
+                        insert_payload,
+                        return_columns=[
+                            ArticleKeywords.id,
+                            ArticleKeywords.composed_query,
+                            ArticleKeywords.keyword_1,
+                            ArticleKeywords.keyword_2,
+                            ArticleKeywords.keyword_3,
+                        ],
+                        conflict_index=["composed_query"],
+                    )
+                )
+            ]
+
+            news_keywords_mapping = self._deduplicate_keywords_news(
+                article_keywords, db_keywords
+            )
+            if news_keywords_mapping:
+                session.execute(
+                    DataBaseHelper.build_bulk_update_statement(
+                        News,
+                        "id",
+                        [
+                            {"id": news_id, "keywords_id": keyword_id}
+                            for keyword_id, news_id in news_keywords_mapping
+                        ],
+                    )
+                )
+
+            if thumbnails:
+                session.execute(
+                    DataBaseHelper.build_bulk_update_statement(News, "id", thumbnails)
+                )
+
+            keywords_to_id = {
+                (row["keyword_1"], row["keyword_2"], row["keyword_3"]): row["id"]
+                for row in db_keywords
+            }
+            trends_results = []
+            for estimate in estimates:
+                row = insert_payload[estimate["article_keywords_id"]]
+                keywords_id = keywords_to_id.get(
+                    (row["keyword_1"], row["keyword_2"], row["keyword_3"])
+                )
+                if keywords_id:
+                    trends_results.append(
+                        {**estimate, "article_keywords_id": keywords_id}
+                    )
+
+            if trends_results:
+                session.execute(
+                    DataBaseHelper.build_insert_statement(
+                        TrendsResults, trends_results, ignore_conflicts=True
+                    )
+                )
+            else:
+                logger.warning(
+                    "No trends results extracted at WorkerJob.persist_batch."
+                )
+
+        logger.info(
+            f"Batch persisted, keywords: {len(db_keywords)}, trends results: {len(trends_results)}"
+        )
+        return trends_results
+
+    def get_principal_keywords(self, article_keywords: list[dict]) -> dict:
+        """
+        Returns the principal keywords selected at extraction time, by keywords
+
+        :param article_keywords: Extracted keywords.
+        """
+        return {
+            (ak["keyword_1"], ak.get("keyword_2"), ak.get("keyword_3")): ak[
+                "principal_keyword"
+            ]
+            for ak in article_keywords
+            if ak.get("principal_keyword")
+        }
+
+    def write_trends_results(self, trends_results: list[dict]) -> None:
+        """
+        Writes the estimated popularity of the keywords
+
+        :param trends_results: Trends results to write.
+        """
         if not trends_results:
             logger.warning("No trends results extracted at WorkerJob.process_messages.")
-        else:
-            try:
-                DataBaseHelper.write_batch_of_objects(
-                    TrendsResults, self._session_factory, trends_results, logger
-                )
-            except Exception:
-                logger.exception("Failed to write trends results.")
-                raise
+            return
 
-        # Cache the aggregated news report after trends estimation
-        self._cache_news_report()
+        try:
+            DataBaseHelper.write_batch_of_objects(
+                TrendsResults, self._session_factory, trends_results, logger
+            )
+        except Exception:
+            logger.exception("Failed to write trends results.")
+            raise
 
-    def estimate_popularity(self, result: list[dict]) -> list[dict]:
+    def estimate_popularity(
+        self, result: list[dict], principal_keywords: dict | None = None
+    ) -> list[dict]:
         """
         Estimates the popularity of the extracted headlines
 
         :param result: Result of inserted rows in ArticleKeywords
+        :param principal_keywords: Principal keyword selected at extraction time, by
+            (keyword_1, keyword_2, keyword_3). Rows missing from it are processed again.
         """
+        principal_keywords = principal_keywords or {}
 
         trends_results = []
+        # (article_keywords_id, principal_keyword) of the rows to estimate
+        pending = []
         for row in result:
             id = row.get("id")
             keywords = [
@@ -140,19 +416,21 @@ class WorkerJob:
                 row.get("keyword_3", ""),
             ]
 
-            if not keywords:
+            if not any(keywords):
                 logger.warning("Empty keyword list. (worker.estimate_popularity)")
                 continue
 
-            try:
-                principal_keyword = self._processor_service.get_principal_keyword(
-                    keywords
-                )
-            except Exception as e:
-                logger.exception(
-                    "Failed to extract principal keywords.", extra={"error": str(e)}
-                )
-                continue
+            principal_keyword = principal_keywords.get(tuple(keywords))
+            if not principal_keyword:
+                try:
+                    principal_keyword = self._processor_service.get_principal_keyword(
+                        [kw for kw in keywords if kw]
+                    )
+                except Exception as e:
+                    logger.exception(
+                        "Failed to extract principal keywords.", extra={"error": str(e)}
+                    )
+                    continue
 
             if not principal_keyword:
                 logger.warning(
@@ -160,8 +438,17 @@ class WorkerJob:
                 )
                 continue
 
-            result_trends = self._api.estimate_popularity(principal_keyword)
+            pending.append((id, principal_keyword))
 
+        if not pending:
+            return trends_results
+
+        # several keywords are packed per api request
+        estimates = self._api.estimate_popularity_batch(
+            [principal_keyword for _, principal_keyword in pending]
+        )
+
+        for (id, _), result_trends in zip(pending, estimates):
             if not result_trends:
                 logger.error(
                     f"Failed to estimate popularity for keywords with id {id}",
@@ -176,72 +463,197 @@ class WorkerJob:
 
     def process_list_of_messages(self, messages: list) -> list:
         """
-        Iterates over a list of messages and processes headlines
+        Iterates over a list of messages and processes headlines, messages are not acknowledged
 
         :param messages: List of messages to process.
         """
-        article_keywords = []
+        entries = self.decode_messages(messages)
+        thumbnails = self.submit_thumbnails(entries)
+        article_keywords = self.extract_keywords(entries)
+        self.store_thumbnails(thumbnails)
+        return article_keywords
+
+    def decode_messages(self, messages: list) -> list[dict]:
+        """
+        Decodes the body of every message, invalid messages are sent to the fallback queue
+
+        :param messages: List of messages to decode.
+        :return: Entries with the message, news id, headline and thumbnail url.
+        """
+        entries = []
         for message in messages:
             try:
-                payload = json.loads(message.get("Body", {}))
+                payload, pointer = self._load_payload(message)
             except json.JSONDecodeError:
                 logger.warning("Invalid message format, sending to fallback queue.")
                 self._aws_handler.send_message_to_fallback_queue(message=message)
                 continue
+            except S3BucketServiceError as e:
+                logger.error(f"Failed to read offloaded message payload: {e}")
+                self._aws_handler.send_message_to_fallback_queue(message=message)
+                continue
 
-            news_id = payload.get("id", "")
-            headline = payload.get("headline", "").strip()
-            thumbnail_url = payload.get("thumbnail", "").strip()
+            entries.append(
+                {
+                    "message": message,
+                    "news_id": payload.get("id", ""),
+                    "headline": payload.get("headline", "").strip(),
+                    "thumbnail_url": payload.get("thumbnail", "").strip(),
+                    "s3_payload": pointer,
+                }
+            )
 
-            if thumbnail_url and news_id:
-                try:
-                    s3_url = self._s3_handler.upload_thumbnail(thumbnail_url, news_id)
-                    object_to_update = {"thumbnail": s3_url, "id": news_id}
+        return entries
 
-                    DataBaseHelper.update_from_dict(
-                        News, "id", object_to_update, self._session_factory, logger
-                    )
-                except SQLAlchemyError as e:
-                    # TODO add delete job for s3 object if db update fails
-                    logger.error(f"Failed to update DB for news id {news_id}: {e}")
-                except ImageDownloadError as e:
-                    logger.error(f"Failed to download image for news id {news_id}: {e}")
-                except (Exception, S3BucketServiceError) as e:
-                    logger.error(
-                        f"Failed to upload thumbnail for news id {news_id}: {e}"
-                    )
-                    self._aws_handler.send_message_to_fallback_queue(message=message)
+    def _load_payload(self, message: dict) -> tuple[dict, dict | None]:
+        """
+        Parses the body of a message, reading it from S3 when the publisher offloaded it
+
+        :param message: Polled message.
+        :return: The payload, and the S3 location of the body when it was offloaded.
+        """
+        payload = json.loads(message.get("Body", {}))
+
+        pointer = payload.get("s3_payload") if isinstance(payload, dict) else None
+        if pointer:
+            if not self._s3_handler:
+                raise S3BucketServiceError("No S3 handler to read offloaded payloads.")
+            payload = json.loads(
+                self._s3_handler.get_payload(pointer["key"], pointer.get("bucket"))
+            )
+
+        return payload, pointer
+
+    def upload_thumbnails(self, entries: list[dict]) -> None:
+        """
+        Uploads the thumbnail of every decoded message and stores the urls in a single update
+
+        :param entries: Entries returned by decode_messages.
+        """
+        self.store_thumbnails(self.submit_thumbnails(entries))
+
+    def submit_thumbnails(self, entries: list[dict]) -> list[tuple[dict, Future]]:
+        """
+        Schedules the upload of the thumbnail of every decoded message
+
+        :param entries: Entries returned by decode_messages.
+        :return: (entry, upload future) pairs, to pass to store_thumbnails.
+        """
+        if self._thumbnail_ingester is None:
+            return []
+
+        return [
+            (
+                entry,
+                self._thumbnail_ingester.submit(
+                    entry["thumbnail_url"], entry["news_id"]
+                ),
+            )
+            for entry in entries
+            if entry["thumbnail_url"] and entry["news_id"]
+        ]
+
+    def store_thumbnails(self, thumbnails: list[tuple[dict, Future]]) -> None:
+        """
+        Waits for the scheduled uploads and stores the urls in a single update
+
+        :param thumbnails: Pairs returned by submit_thumbnails.
+        """
+        self.write_thumbnails(self.collect_thumbnails(thumbnails))
+
+    def collect_thumbnails(self, thumbnails: list[tuple[dict, Future]]) -> list[dict]:
+        """
+        Waits for the scheduled uploads, messages whose upload failed are sent to the fallback queue
+
+        :param thumbnails: Pairs returned by submit_thumbnails.
+        :return: Thumbnail urls by news id, to pass to write_thumbnails or persist_batch.
+        """
+        uploaded = []
+        for entry, upload in thumbnails:
+            news_id = entry["news_id"]
+            try:
+                uploaded.append({"id": news_id, "thumbnail": upload.result()})
+            except ImageDownloadError as e:
+                logger.error(f"Failed to download image for news id {news_id}: {e}")
+            except (Exception, S3BucketServiceError) as e:
+                logger.error(f"Failed to upload thumbnail for news id {news_id}: {e}")
+                self._aws_handler.send_message_to_fallback_queue(
+                    message=entry["message"]
+                )
+
+        return uploaded
 
-            if not news_id or not headline:
+    def write_thumbnails(self, uploaded: list[dict]) -> None:
+        """
+        Stores the thumbnail urls in a single update
+
+        :param uploaded: Thumbnail urls returned by collect_thumbnails.
+        """
+        try:
+            DataBaseHelper.bulk_update_from_dicts(
+                News, "id", uploaded, self._session_factory, logger
+            )
+        except SQLAlchemyError as e:
+            # TODO add delete job for s3 object if db update fails
+            news_ids = [thumbnail["id"] for thumbnail in uploaded]
+            logger.error(f"Failed to update DB for news ids {news_ids}: {e}")
+
+    def extract_keywords(self, entries: list[dict]) -> list[dict]:
+        """
+        Extracts the keywords of every decoded message in a single batched nlp pass
+
+        :param entries: Entries returned by decode_messages.
+        :return: Extracted keywords, including the news id.
+        """
+        article_keywords = []
+        # entries of the messages whose keywords are extracted
+        pending = []
+        for entry in entries:
+            message = entry["message"]
+            if not entry["news_id"] or not entry["headline"]:
                 logger.warning("Failed to process headline, sent to fallback queue.")
                 self._aws_handler.send_message_to_fallback_queue(message=message)
                 continue
 
-            try:
-                keywords = self._processor_service.extract_keywords(headline)
-            except Exception:
+            pending.append(entry)
+
+        if not pending:
+            return article_keywords
+
+        # a single batched nlp pass for every headline of the polled batch
+        try:
+            extracted = self._processor_service.extract_keywords_batch(
+                [entry["headline"] for entry in pending]
+            )
+        except Exception:
+            logger.exception("Failed to process batch of headlines.")
+            extracted = [None] * len(pending)
+
+        if self._on_processed:
+            self._on_processed(len(pending))
+
+        for entry, keywords in zip(pending, extracted):
+            if not keywords:
                 logger.error("Failed to process headline, sending to fallback queue.")
-                self._aws_handler.send_message_to_fallback_queue(message=message)
+                self._aws_handler.send_message_to_fallback_queue(
+                    message=entry["message"]
+                )
                 continue
 
+            # acknowledged by acknowledge_messages once the batch is written
+            entry["extracted"] = True
+
             article_keywords.append(
                 {
-                    "news_id": news_id,
+                    "news_id": entry["news_id"],
                     "keyword_1": keywords.get("keyword_1"),
                     "keyword_2": keywords.get("keyword_2"),
                     "keyword_3": keywords.get("keyword_3"),
                     "extraction_confidence": keywords.get("extraction_confidence"),
+                    "principal_keyword": keywords.get("principal_keyword"),
                 }
             )
 
-            try:
-                self._aws_handler.delete_message_main_queue(
-                    message.get("ReceiptHandle", ""), message.get("MessageId", "")
-                )
-            except ValueError as e:
-                self._aws_handler.send_message_to_fallback_queue(message=message)
-                logger.exception(e)
-
         return article_keywords
 
     def _deduplicate_article_keywords(self, article_keywords: list) -> list[dict]:
@@ -313,7 +725,7 @@ class WorkerJob:
 
         return seen
 
-    def _cache_news_report(self) -> None:
+    def cache_news_report(self) -> None:
         """
         Fetches all news with trends data and caches the aggregated report.
         Uses retry logic with graceful fallback: logs and continues if caching fails.
@@ -1,4 +1,5 @@
 import pytest
+import threading
 import json
 from unittest.mock import patch, MagicMock
 import types
@@ -91,8 +92,8 @@ def test_process_messages_happy_path(
     mock_aws_handler.poll_messages.return_value = msgs
     mock_aws_handler.delete_message_main_queue.return_value = None
 
-    mock_processor_service.extract_keywords = MagicMock(
-        return_value={"keyword_1": "Apple"}
+    mock_processor_service.extract_keywords_batch = MagicMock(
+        return_value=[{"keyword_1": "Apple"}]
     )
 
     write_batch_returning_value = [
@@ -140,7 +141,9 @@ def test_process_messages_happy_path(
         # write_batch_of_objects may or may not be called depending on trends results,
         # but we must ensure the insert/returning path was invoked
         mock_write_returning.assert_called_once()
-        mock_processor_service.extract_keywords.assert_called_once()
+        mock_processor_service.extract_keywords_batch.assert_called_once_with(
+            ["Breaking news"]
+        )
 
 
 def test_process_messages_no_messages(
@@ -195,10 +198,12 @@ def test_process_list_of_messages_with_extraction_failure(
     mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
 ):
     mock_aws_handler.send_message_to_fallback_queue = MagicMock()
-    mock_processor_service.extract_keywords = MagicMock(
+    mock_processor_service.extract_keywords_batch = MagicMock(
         side_effect=Exception("fail extraction")
     )
-    messages = [{"Body": "valid", "ReceiptHandle": "abc"}]
+    messages = [
+        {"Body": json.dumps({"id": 1, "headline": "valid"}), "ReceiptHandle": "abc"}
+    ]
     job = WorkerJob(
         MagicMock(),
         mock_processor_service,
@@ -211,18 +216,15 @@ def test_process_list_of_messages_with_extraction_failure(
     mock_aws_handler.send_message_to_fallback_queue.assert_called_once()
 
 
-def test_process_list_of_messages_success_delete_error(
+def test_process_list_of_messages_extracts_in_one_batch(
     mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
 ):
-    mock_processor_service.extract_keywords = MagicMock(
-        return_value={"keyword_1": "Apple"}
-    )
-    mock_aws_handler.delete_message_main_queue = MagicMock(
-        side_effect=ValueError("bad receipt")
+    mock_processor_service.extract_keywords_batch = MagicMock(
+        return_value=[{"keyword_1": "Apple"}, None]
     )
-    mock_aws_handler.send_message_to_fallback_queue = MagicMock()
     messages = [
-        {"Body": json.dumps({"id": 1, "headline": "valid"}), "ReceiptHandle": "abc"}
+        {"Body": json.dumps({"id": 1, "headline": "First"}), "ReceiptHandle": "a"},
+        {"Body": json.dumps({"id": 2, "headline": "Second"}), "ReceiptHandle": "b"},
     ]
     job = WorkerJob(
         MagicMock(),
@@ -232,15 +234,85 @@ def test_process_list_of_messages_success_delete_error(
         s3_handler,
     )
     results = job.process_list_of_messages(messages)
-    assert len(results) == 1
-    mock_aws_handler.send_message_to_fallback_queue.assert_called_once()
+
+    mock_processor_service.extract_keywords_batch.assert_called_once_with(
+        ["First", "Second"]
+    )
+    assert [r["news_id"] for r in results] == [1]
+    # acknowledged only once the batch is written
+    mock_aws_handler.delete_message_main_queue.assert_not_called()
+    mock_aws_handler.delete_messages_batch.assert_not_called()
+    mock_aws_handler.send_message_to_fallback_queue.assert_called_once_with(
+        message=messages[1]
+    )
+
+
+def test_process_messages_acknowledges_after_writes(
+    mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
+):
+    messages = [
+        {"Body": json.dumps({"id": 1, "headline": "valid"}), "ReceiptHandle": "a"},
+        {"Body": json.dumps({"id": 2, "headline": "failed"}), "ReceiptHandle": "b"},
+    ]
+    mock_aws_handler.poll_messages.return_value = messages
+    mock_aws_handler.delete_messages_batch.return_value = []
+    mock_processor_service.extract_keywords_batch = MagicMock(
+        return_value=[{"keyword_1": "Apple"}, None]
+    )
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        mock_session_factory,
+        s3_handler,
+    )
+    job.persist_keywords = MagicMock(return_value=[{"id": 1}])
+    job.estimate_popularity = MagicMock(return_value=[{"article_keywords_id": 1}])
+    # nothing is acknowledged before the trends results are written
+    job.write_trends_results = MagicMock(
+        side_effect=lambda results: (
+            mock_aws_handler.delete_messages_batch.assert_not_called()
+        )
+    )
+
+    job.process_messages()
+
+    job.write_trends_results.assert_called_once()
+    mock_aws_handler.delete_messages_batch.assert_called_once_with(
+        [messages[0]], mock_aws_handler.queue_url
+    )
+    mock_aws_handler.delete_message_main_queue.assert_not_called()
+
+
+def test_process_messages_write_failure_does_not_acknowledge(
+    mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
+):
+    mock_aws_handler.poll_messages.return_value = [
+        {"Body": json.dumps({"id": 1, "headline": "valid"}), "ReceiptHandle": "a"}
+    ]
+    mock_processor_service.extract_keywords_batch = MagicMock(
+        return_value=[{"keyword_1": "Apple"}]
+    )
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        mock_session_factory,
+        s3_handler,
+    )
+    job.persist_keywords = MagicMock(side_effect=Exception("db fail"))
+
+    with pytest.raises(Exception):
+        job.process_messages()
+
+    mock_aws_handler.delete_messages_batch.assert_not_called()
 
 
 def test_estimate_popularity_happy_path(worker_with_mocks):
     worker, processor_service, api = worker_with_mocks
     # Mocks
     processor_service.get_principal_keyword = MagicMock(return_value="Apple")
-    api.estimate_popularity.return_value = {"has_data": True}
+    api.estimate_popularity_batch.return_value = [{"has_data": True}]
 
     result_input = [
         {"id": 1, "keyword_1": "Apple", "keyword_2": None, "keyword_3": None}
@@ -248,19 +320,35 @@ def test_estimate_popularity_happy_path(worker_with_mocks):
 
     output = worker.estimate_popularity(result_input)
 
-    processor_service.get_principal_keyword.assert_called_once_with(
-        ["Apple", None, None]
-    )
-    api.estimate_popularity.assert_called_once_with("Apple")
+    processor_service.get_principal_keyword.assert_called_once_with(["Apple"])
+    api.estimate_popularity_batch.assert_called_once_with(["Apple"])
 
     # The id is used as a key in the returned dict per current implementation
     assert output == [{"has_data": True, "article_keywords_id": 1}]
 
 
+def test_estimate_popularity_reuses_extracted_principal_keyword(worker_with_mocks):
+    worker, processor_service, api = worker_with_mocks
+    processor_service.get_principal_keyword = MagicMock()
+    api.estimate_popularity_batch.return_value = [{"has_data": True}]
+
+    result_input = [
+        {"id": 1, "keyword_1": "Trump", "keyword_2": "Tariff", "keyword_3": None}
+    ]
+
+    output = worker.estimate_popularity(
+        result_input, {("Trump", "Tariff", None): "Donald Trump"}
+    )
+
+    processor_service.get_principal_keyword.assert_not_called()
+    api.estimate_popularity_batch.assert_called_once_with(["Donald Trump"])
+    assert output == [{"has_data": True, "article_keywords_id": 1}]
+
+
 def test_estimate_popularity_skips_when_api_returns_falsy(worker_with_mocks, caplog):
     worker, processor_service, api = worker_with_mocks
     processor_service.get_principal_keyword = MagicMock(return_value="Apple")
-    api.estimate_popularity.return_value = {}  # falsy
+    api.estimate_popularity_batch.return_value = [{}]  # falsy
 
     result_input = [
         {"id": 5, "keyword_1": "Apple", "keyword_2": None, "keyword_3": None}
@@ -276,7 +364,10 @@ def test_estimate_popularity_skips_when_api_returns_falsy(worker_with_mocks, cap
 def test_estimate_popularity_multiple_rows(worker_with_mocks):
     worker, processor_service, api = worker_with_mocks
     processor_service.get_principal_keyword = MagicMock(side_effect=["Apple", "Banana"])
-    api.estimate_popularity.side_effect = [{"has_data": True}, {"has_data": True}]
+    api.estimate_popularity_batch.return_value = [
+        {"has_data": True},
+        {"has_data": True},
+    ]
 
     result_input = [
         {"id": 1, "keyword_1": "Apple", "keyword_2": None, "keyword_3": None},
@@ -286,10 +377,11 @@ def test_estimate_popularity_multiple_rows(worker_with_mocks):
     output = worker.estimate_popularity(result_input)
 
     assert len(output) == 2
-    # Check that ids got added as keys into the returned dicts (current logic)
-    assert all(entry["article_keywords_id"] in [1, 2] for entry in output)
+    # results are matched back to their rows in order
+    assert [entry["article_keywords_id"] for entry in output] == [1, 2]
     assert processor_service.get_principal_keyword.call_count == 2
-    assert api.estimate_popularity.call_count == 2
+    # both keywords share a single batched estimation
+    api.estimate_popularity_batch.assert_called_once_with(["Apple", "Banana"])
 
 
 def test_process_messages_with_thumbnail_upload_success(
@@ -307,13 +399,15 @@ def test_process_messages_with_thumbnail_upload_success(
     mock_aws_handler.poll_messages.return_value = msgs
 
     # processor returns a single keyword
-    mock_processor_service.extract_keywords = MagicMock(
-        return_value={
-            "keyword_1": "Apple",
-            "keyword_2": None,
-            "keyword_3": None,
-            "extraction_confidence": 0.9,
-        }
+    mock_processor_service.extract_keywords_batch = MagicMock(
+        return_value=[
+            {
+                "keyword_1": "Apple",
+                "keyword_2": None,
+                "keyword_3": None,
+                "extraction_confidence": 0.9,
+            }
+        ]
     )
 
     # Prepare a session context manager that yields a session mock
@@ -328,9 +422,14 @@ def test_process_messages_with_thumbnail_upload_success(
         {"id": 99, "keyword_1": "Apple", "keyword_2": None, "keyword_3": None}
     ]
 
-    with patch(
-        "jobs.worker.worker.DataBaseHelper.write_batch_of_objects_and_return",
-        return_value=write_batch_returning_value,
+    with (
+        patch(
+            "jobs.worker.worker.DataBaseHelper.write_batch_of_objects_and_return",
+            return_value=write_batch_returning_value,
+        ),
+        patch(
+            "jobs.worker.worker.DataBaseHelper.bulk_update_by_primary_key"
+        ) as mock_bulk_update,
     ):
         # create worker with our session factory and s3 handler
         job = WorkerJob(
@@ -348,8 +447,45 @@ def test_process_messages_with_thumbnail_upload_success(
 
         # assertions
         s3_handler.upload_thumbnail.assert_called_once_with("https://img", 42)
-        session_mock.query.assert_called()
-        session_mock.commit.assert_called()
+        # every news is mapped to its keywords in a single update
+        mock_bulk_update.assert_called_once()
+        assert mock_bulk_update.call_args.args[1] == [{"id": 42, "keywords_id": 99}]
+
+
+def test_process_messages_unit_of_work_persists_thumbnails_with_the_batch(
+    mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
+):
+    mock_aws_handler.poll_messages.return_value = [
+        {
+            "Body": json.dumps(
+                {"id": 42, "headline": "Title", "thumbnail": "https://img"}
+            ),
+            "ReceiptHandle": "rh",
+        }
+    ]
+    mock_processor_service.extract_keywords_batch = MagicMock(
+        return_value=[{"keyword_1": "Apple"}]
+    )
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        mock_session_factory,
+        s3_handler,
+        unit_of_work=True,
+    )
+    job.persist_batch = MagicMock(return_value=[])
+    job.cache_news_report = MagicMock()
+
+    with patch(
+        "jobs.worker.worker.DataBaseHelper.bulk_update_from_dicts"
+    ) as mock_bulk_update:
+        job.process_messages()
+
+    mock_bulk_update.assert_not_called()
+    assert job.persist_batch.call_args.kwargs["thumbnails"] == [
+        {"id": 42, "thumbnail": "s3://bucket/thumb.jpg"}
+    ]
 
 
 def test_process_list_of_messages_missing_headline_with_thumbnail_sends_to_fallback(
@@ -387,8 +523,8 @@ def test_process_messages_db_write_raises_rethrows(
         }
     ]
 
-    mock_processor_service.extract_keywords = MagicMock(
-        return_value={"keyword_1": "Apple"}
+    mock_processor_service.extract_keywords_batch = MagicMock(
+        return_value=[{"keyword_1": "Apple"}]
     )
 
     with (
@@ -411,3 +547,374 @@ def test_process_messages_db_write_raises_rethrows(
         job._processor_service.get_principal_keyword = MagicMock(return_value="Apple")
         with pytest.raises(Exception):
             job.process_messages()
+
+
+def test_process_messages_heartbeat_tracks_and_releases_on_failure(
+    mock_processor_service, mock_aws_handler, mock_session_factory
+):
+    messages = [
+        {
+            "Body": json.dumps({"id": 1, "headline": "Breaking news"}),
+            "ReceiptHandle": "rh",
+        }
+    ]
+    mock_aws_handler.poll_messages.return_value = messages
+    mock_processor_service.extract_keywords_batch = MagicMock(
+        return_value=[{"keyword_1": "Apple"}]
+    )
+    heartbeat = MagicMock()
+
+    with patch(
+        "jobs.worker.worker.DataBaseHelper.write_batch_of_objects_and_return",
+        side_effect=Exception("db fail"),
+    ):
+        job = WorkerJob(
+            MagicMock(),
+            mock_processor_service,
+            mock_aws_handler,
+            mock_session_factory,
+            MagicMock(),
+            heartbeat=heartbeat,
+        )
+        with pytest.raises(Exception):
+            job.process_messages()
+
+    heartbeat.track.assert_called_once_with(messages)
+    heartbeat.release.assert_called_once_with(messages)
+
+
+def test_poll_messages_uses_the_configured_visibility_timeout(
+    mock_processor_service, mock_aws_handler, mock_session_factory
+):
+    mock_aws_handler.poll_messages.return_value = []
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        mock_session_factory,
+        MagicMock(),
+        visibility_timeout=120,
+    )
+
+    job.poll_messages()
+
+    mock_aws_handler.poll_messages.assert_called_once_with(visibility_timeout=120)
+
+
+def test_decode_messages_reads_offloaded_payload(
+    mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
+):
+    s3_handler.get_payload.return_value = json.dumps(
+        {"id": 1, "headline": "Large", "thumbnail": "http://img"}
+    )
+    messages = [
+        {
+            "Body": json.dumps({"s3_payload": {"bucket": "b", "key": "k"}}),
+            "ReceiptHandle": "a",
+        }
+    ]
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        mock_session_factory,
+        s3_handler,
+    )
+
+    entries = job.decode_messages(messages)
+
+    s3_handler.get_payload.assert_called_once_with("k", "b")
+    assert entries[0]["s3_payload"] == {"bucket": "b", "key": "k"}
+    assert entries[0]["headline"] == "Large"
+    assert entries[0]["thumbnail_url"] == "http://img"
+
+
+def test_acknowledge_messages_deletes_offloaded_payloads_of_deleted_messages(
+    mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
+):
+    deleted = {"ReceiptHandle": "a"}
+    redelivered = {"ReceiptHandle": "b"}
+    mock_aws_handler.delete_messages_batch.return_value = [redelivered]
+    s3_handler.delete_payloads.return_value = []
+    entries = [
+        {
+            "message": deleted,
+            "extracted": True,
+            "s3_payload": {"bucket": "b", "key": "k1"},
+        },
+        {
+            "message": redelivered,
+            "extracted": True,
+            "s3_payload": {"bucket": "b", "key": "k2"},
+        },
+        {"message": {"ReceiptHandle": "c"}, "extracted": True, "s3_payload": None},
+    ]
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        mock_session_factory,
+        s3_handler,
+    )
+
+    job.acknowledge_messages(entries)
+
+    s3_handler.delete_payloads.assert_called_once_with(["k1"], "b")
+
+
+def test_persist_batch_writes_everything_in_one_transaction(
+    mock_processor_service, mock_aws_handler, s3_handler
+):
+    session = MagicMock()
+    keyword_row = MagicMock()
+    keyword_row._mapping = {
+        "id": 7,
+        "composed_query": "apple",
+        "keyword_1": "Apple",
+        "keyword_2": None,
+        "keyword_3": None,
+    }
+    session.execute.side_effect = [[keyword_row], MagicMock(), MagicMock()]
+    session_factory = MagicMock()
+    session_factory.return_value.__enter__.return_value = session
+
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        session_factory,
+        s3_handler,
+        unit_of_work=True,
+    )
+    job._api.estimate_popularity_batch.return_value = [{"has_data": True}]
+    article_keywords = [
+        {
+            "news_id": 1,
+            "keyword_1": "Apple",
+            "keyword_2": None,
+            "keyword_3": None,
+            "extraction_confidence": 0.9,
+            "principal_keyword": "Apple",
+        }
+    ]
+
+    results = job.persist_batch(article_keywords)
+
+    # trends are estimated before the transaction opens
+    job._api.estimate_popularity_batch.assert_called_once_with(["Apple"])
+    assert results == [{"has_data": True, "article_keywords_id": 7}]
+    # keywords upsert, news mapping and trends insert, committed once
+    assert session.execute.call_count == 3
+    session.commit.assert_called_once()
+    session_factory.assert_called_once()
+
+
+def test_persist_batch_uses_given_estimates(
+    mock_processor_service, mock_aws_handler, s3_handler
+):
+    session = MagicMock()
+    keyword_row = MagicMock()
+    keyword_row._mapping = {
+        "id": 7,
+        "composed_query": "apple",
+        "keyword_1": "Apple",
+        "keyword_2": None,
+        "keyword_3": None,
+    }
+    session.execute.side_effect = [[keyword_row], MagicMock(), MagicMock()]
+    session_factory = MagicMock()
+    session_factory.return_value.__enter__.return_value = session
+
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        session_factory,
+        s3_handler,
+        unit_of_work=True,
+    )
+    article_keywords = [
+        {
+            "news_id": 1,
+            "keyword_1": "Apple",
+            "keyword_2": None,
+            "keyword_3": None,
+            "extraction_confidence": 0.9,
+        }
+    ]
+
+    results = job.persist_batch(
+        article_keywords, [{"has_data": True, "article_keywords_id": 0}]
+    )
+
+    job._api.estimate_popularity_batch.assert_not_called()
+    assert results == [{"has_data": True, "article_keywords_id": 7}]
+
+
+def test_persist_batch_updates_thumbnails_in_the_transaction(
+    mock_processor_service, mock_aws_handler, s3_handler
+):
+    session = MagicMock()
+    keyword_row = MagicMock()
+    keyword_row._mapping = {
+        "id": 7,
+        "composed_query": "apple",
+        "keyword_1": "Apple",
+        "keyword_2": None,
+        "keyword_3": None,
+    }
+    session.execute.side_effect = [[keyword_row], MagicMock(), MagicMock(), MagicMock()]
+    session_factory = MagicMock()
+    session_factory.return_value.__enter__.return_value = session
+
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        session_factory,
+        s3_handler,
+        unit_of_work=True,
+    )
+    article_keywords = [
+        {
+            "news_id": 1,
+            "keyword_1": "Apple",
+            "keyword_2": None,
+            "keyword_3": None,
+            "extraction_confidence": 0.9,
+        }
+    ]
+
+    with patch(
+        "jobs.worker.worker.DataBaseHelper.bulk_update_from_dicts"
+    ) as mock_bulk_update:
+        job.persist_batch(
+            article_keywords,
+            [{"has_data": True, "article_keywords_id": 0}],
+            [{"id": 1, "thumbnail": "cdn/1"}],
+        )
+
+    mock_bulk_update.assert_not_called()
+    # keywords upsert, news mapping, thumbnails and trends insert, committed once
+    assert session.execute.call_count == 4
+    session.commit.assert_called_once()
+    session_factory.assert_called_once()
+
+
+def test_worker_without_s3_handler_creates_no_thumbnail_ingester(
+    mock_processor_service, mock_aws_handler, mock_session_factory
+):
+    with patch("jobs.worker.worker.ThumbnailIngester") as mock_ingester:
+        job = WorkerJob(
+            MagicMock(), mock_processor_service, mock_aws_handler, mock_session_factory
+        )
+        thumbnails = job.submit_thumbnails(
+            [
+                {
+                    "message": {},
+                    "news_id": 1,
+                    "headline": "a",
+                    "thumbnail_url": "http://1",
+                }
+            ]
+        )
+        job.close()
+
+    mock_ingester.assert_not_called()
+    assert thumbnails == []
+
+
+def test_worker_closes_only_the_thumbnail_ingester_it_created(
+    mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
+):
+    given = MagicMock()
+    with patch("jobs.worker.worker.ThumbnailIngester") as mock_ingester:
+        owned = WorkerJob(
+            MagicMock(),
+            mock_processor_service,
+            mock_aws_handler,
+            mock_session_factory,
+            s3_handler,
+        )
+        shared = WorkerJob(
+            MagicMock(),
+            mock_processor_service,
+            mock_aws_handler,
+            mock_session_factory,
+            s3_handler,
+            thumbnail_ingester=given,
+        )
+        owned.close()
+        shared.close()
+
+    mock_ingester.return_value.close.assert_called_once()
+    given.close.assert_not_called()
+
+
+def test_upload_thumbnails_flushes_once_per_batch(
+    mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
+):
+    s3_handler.upload_thumbnail.side_effect = lambda url, news_id: f"cdn/{news_id}"
+    entries = [
+        {"message": {}, "news_id": 1, "headline": "a", "thumbnail_url": "http://1"},
+        {"message": {}, "news_id": 2, "headline": "b", "thumbnail_url": ""},
+        {"message": {}, "news_id": 3, "headline": "c", "thumbnail_url": "http://3"},
+    ]
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        mock_session_factory,
+        s3_handler,
+    )
+
+    with patch(
+        "jobs.worker.worker.DataBaseHelper.bulk_update_from_dicts"
+    ) as mock_bulk_update:
+        job.upload_thumbnails(entries)
+
+    mock_bulk_update.assert_called_once()
+    assert mock_bulk_update.call_args.args[2] == [
+        {"id": 1, "thumbnail": "cdn/1"},
+        {"id": 3, "thumbnail": "cdn/3"},
+    ]
+
+
+def test_process_list_of_messages_extracts_while_thumbnails_upload(
+    mock_processor_service, mock_aws_handler, mock_session_factory, s3_handler
+):
+    extracted = threading.Event()
+
+    def upload(url, news_id):
+        # only completes if keywords are extracted while the upload runs
+        assert extracted.wait(5)
+        return "cdn/1"
+
+    def extract(headlines):
+        extracted.set()
+        return [{"keyword_1": "Apple"}]
+
+    s3_handler.upload_thumbnail.side_effect = upload
+    mock_processor_service.extract_keywords_batch = MagicMock(side_effect=extract)
+    messages = [
+        {
+            "Body": json.dumps({"id": 1, "headline": "First", "thumbnail": "http://1"}),
+            "ReceiptHandle": "a",
+        }
+    ]
+    job = WorkerJob(
+        MagicMock(),
+        mock_processor_service,
+        mock_aws_handler,
+        mock_session_factory,
+        s3_handler,
+    )
+
+    with patch(
+        "jobs.worker.worker.DataBaseHelper.bulk_update_from_dicts"
+    ) as mock_bulk_update:
+        results = job.process_list_of_messages(messages)
+
+    assert [r["news_id"] for r in results] == [1]
+    assert mock_bulk_update.call_args.args[2] == [{"id": 1, "thumbnail": "cdn/1"}]
+    mock_aws_handler.send_message_to_fallback_queue.assert_not_called()